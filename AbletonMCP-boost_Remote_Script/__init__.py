@@ -3,22 +3,334 @@ from __future__ import absolute_import, print_function, unicode_literals
 
 from _Framework.ControlSurface import ControlSurface
 import socket
+import selectors
+import struct
+import collections
+import functools
+import itertools
+import operator
 import json
 import threading
 import time
 import traceback
 import random
+import base64
+import enum
+import re
 
-# Change queue import for Python 2
+# Prefer orjson on the request/response path when it is installed
 try:
-    import Queue as queue  # Python 2
+    import orjson
+    _loads = orjson.loads
+    
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
 except ImportError:
-    import queue  # Python 3
+    _loads = json.loads
+    
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
 
 # Constants for socket communication
 DEFAULT_PORT = 9877
 HOST = "localhost"
 
+# Each message is a 4-byte little-endian payload length followed by the JSON payload
+_HEADER = struct.Struct('<I')
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# Automation points sent packed: base64 of little-endian float64 (time, value) pairs
+_ENVELOPE_POINT = struct.Struct('<2d')
+
+# Older clients send bare JSON objects with no length prefix. Read as a header,
+# the opening "{" plus the next three printable bytes is far above MAX_FRAME_SIZE,
+# which is how those connections are told apart.
+_LEGACY_FIRST_BYTE = ord("{")
+_DECODE = json.JSONDecoder().raw_decode
+RECV_CHUNK_SIZE = 64 * 1024
+
+# SO_RCVLOWAT keeps the selector from waking on every few bytes of a slow frame.
+# It is raised to the bytes still missing from the current frame, with a cap,
+# and is not available on every platform.
+_SO_RCVLOWAT = getattr(socket, "SO_RCVLOWAT", None)
+MAX_RCVLOWAT = 16 * 1024
+
+# Scatter-gather writes let header and payload go out without being joined first.
+# socket.sendmsg is not available on Windows.
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+SENDMSG_MAX_BUFFERS = 64
+
+# The browser's main categories, looked up by the first part of a browser path
+_CATEGORY_ATTRS = ('instruments', 'sounds', 'drums', 'audio_effects', 'midi_effects')
+_CATEGORY_GETTERS = {name: operator.attrgetter(name) for name in _CATEGORY_ATTRS}
+
+# Arrangement helpers assume 4/4 when converting bars to beats
+_BEATS_PER_BAR = 4
+
+# Time and velocity of each sixteenth in the repeating four-note fill pattern
+_FILL_STEPS = ((0.0, 100), (0.125, 80), (0.25, 80), (0.375, 80))
+
+# Pitch offsets drawn by _vary_notes: nudges, fine nudges and added-note intervals
+_PITCH_NUDGES = (-2, -1, 1, 2)
+_FINE_NUDGES = (-1, 1)
+_ADDED_INTERVALS = (-12, -7, -5, 0, 5, 7, 12)
+
+# Automatable parameter names: volume, panning, send_<n> or device<n>_param<n>
+_PARAMETER_NAME = re.compile(r"^(?:(volume)|(panning)|send_(\d+)|device(\d+)_param(\d+))$", re.IGNORECASE)
+
+class FollowAction(enum.IntEnum):
+    """Live's clip follow action values"""
+    NONE = 0
+    NEXT = 1
+    PREV = 2
+    FIRST = 3
+    LAST = 4
+    ANY = 5
+    OTHER = 6
+
+# Follow action values by the names commands use for them
+_FOLLOW_ACTIONS = {action.name.lower(): action for action in FollowAction}
+
+# Transition into a section whose energy drops, stays level or rises
+_ENERGY_TRANSITIONS = ("downlifter", "fill", "riser")
+
+# Section types with their own clip selection strategy, anything else is "generic"
+_SECTION_KINDS = frozenset(("intro", "verse", "chorus", "bridge", "outro"))
+
+# What Live's object model raises when a track, clip or parameter refuses an operation
+_LOM_EXC = (AttributeError, RuntimeError, IndexError, ValueError)
+
+# Live is driven by one user; refuse extra connections instead of serving them all
+MAX_CLIENTS = 4
+_BUSY_PAYLOAD = _dumps({"status": "error", "message": "busy: too many clients connected"})
+_BUSY_FRAME = _HEADER.pack(len(_BUSY_PAYLOAD)) + _BUSY_PAYLOAD
+
+class _Miss(object):
+    """Returned by a handler for an expected miss, answered as an error without raising"""
+    __slots__ = ("message",)
+    
+    def __init__(self, message):
+        self.message = message
+
+_NO_CLIP = _Miss("No clip in slot")
+
+def _response(result):
+    """Wrap a handler's return value in a response"""
+    if type(result) is _Miss:
+        return {"status": "error", "message": result.message}
+    return {"status": "success", "result": result}
+
+def _logged(action):
+    """Decorate a handler to log "Error <action>: <error>" and re-raise on failure"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except Exception as e:
+                self._flush_log()
+                self.log_message("Error {0}: {1}".format(action, e))
+                self._log_traceback()
+                raise
+        return wrapper
+    return decorator
+
+def _undo_step(method):
+    """Decorate a handler so all the Live changes it makes are undone as one step"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        song = self._song
+        song.begin_undo_step()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            song.end_undo_step()
+    return wrapper
+
+_NOTE_KEYS = ("pitch", "start_time", "duration", "velocity", "mute")
+_NOTE_FIELDS = operator.itemgetter(*_NOTE_KEYS)
+_NOTE_POSITIONS = operator.itemgetter(0, 1, 2, 3, 4)
+# Sort key putting note tuples in start time order, then pitch
+_NOTE_ORDER = operator.itemgetter(1, 0)
+
+def _to_note_tuples(notes):
+    """Convert note dicts to Live's (pitch, start_time, duration, velocity, mute) tuples
+    
+    Notes that already arrive positionally, as 5-item lists or tuples, are passed through.
+    """
+    try:
+        # Complete notes of a single form are unpacked by itemgetter alone
+        if notes and isinstance(notes[0], dict):
+            return tuple(map(_NOTE_FIELDS, notes))
+        return tuple(map(_NOTE_POSITIONS, notes))
+    except (KeyError, IndexError, TypeError):
+        # Some dicts leave fields to their defaults, or the forms are mixed
+        return tuple(
+            (note.get("pitch", 60), note.get("start_time", 0.0), note.get("duration", 0.25),
+             note.get("velocity", 100), note.get("mute", False))
+            if isinstance(note, dict) else tuple(note)
+            for note in notes
+        )
+
+def _to_note_specs(notes):
+    """Convert notes, dicts or positional lists, to the note dicts add_new_notes takes in one pass"""
+    return [
+        {"pitch": note.get("pitch", 60), "start_time": note.get("start_time", 0.0),
+         "duration": note.get("duration", 0.25), "velocity": note.get("velocity", 100),
+         "mute": note.get("mute", False)}
+        if isinstance(note, dict) else dict(zip(_NOTE_KEYS, note))
+        for note in notes
+    ]
+
+# The per-band functions below are kept free of Live objects so their per-note
+# loops only touch local names. Every uniform draw is a scaled rand() call,
+# uniform(a, b) is a + (b - a) * rand(), offsets are picked by indexing a
+# constant tuple with a scaled rand() as well, and bounds are clamped with
+# comparisons rather than max(low, min(high, x)) calls
+
+def _vary_high(notes, clip_length):
+    """High variation: significantly change the pattern"""
+    rand = random.random
+    new_notes = []
+    append = new_notes.append
+    
+    for pitch, start, duration, velocity, mute in notes:
+        # Keep some notes, modify others, add new ones
+        if rand() > 0.3:  # Keep 70% of original notes
+            # Possibly modify pitch
+            new_pitch = pitch
+            if rand() < 0.4:  # 40% chance to change pitch
+                new_pitch = pitch + _PITCH_NUDGES[int(rand() * 4)]
+                new_pitch = 0 if new_pitch < 0 else 127 if new_pitch > 127 else new_pitch
+            
+            # Possibly modify timing
+            new_start = start
+            if rand() < 0.3:  # 30% chance to shift timing
+                new_start = start + (-0.125 + 0.25 * rand())
+                new_start = 0 if new_start < 0 else clip_length if new_start > clip_length else new_start
+            
+            append((new_pitch, new_start, duration, velocity, mute))
+        
+        # 20% chance to add a new note
+        if rand() < 0.2:
+            # Create a new note based on this one
+            new_pitch = pitch + _ADDED_INTERVALS[int(rand() * 7)]
+            new_pitch = 0 if new_pitch < 0 else 127 if new_pitch > 127 else new_pitch
+            new_start = start + (-0.25 + 0.5 * rand())
+            new_start = 0 if new_start < 0 else clip_length if new_start > clip_length else new_start
+            append((new_pitch, new_start, duration, velocity, False))
+    
+    return tuple(new_notes)
+
+def _vary_medium(notes, clip_length):
+    """Medium variation: modify some notes, keep structure"""
+    rand = random.random
+    new_notes = []
+    append = new_notes.append
+    
+    for note in notes:
+        # 80% chance to keep note, 20% to modify
+        if rand() < 0.8:
+            append(note)
+        else:
+            pitch, start, duration, velocity, mute = note
+            
+            # Modify pitch
+            pitch += _FINE_NUDGES[int(rand() * 2)]
+            pitch = 0 if pitch < 0 else 127 if pitch > 127 else pitch
+            
+            # Modify timing slightly
+            start += -0.05 + 0.1 * rand()
+            start = 0 if start < 0 else clip_length if start > clip_length else start
+            
+            append((pitch, start, duration, velocity, mute))
+    
+    return tuple(new_notes)
+
+def _vary_low(notes, clip_length):
+    """Low variation: subtle velocity changes"""
+    rand = random.random
+    new_notes = []
+    append = new_notes.append
+    
+    for note in notes:
+        # 90% chance to keep the same, 10% to modify velocity
+        if rand() < 0.9:
+            append(note)
+        else:
+            pitch, start, duration, velocity, mute = note
+            
+            # Modify velocity slightly
+            velocity = int(velocity + (-10 + 20 * rand()))
+            velocity = 1 if velocity < 1 else 127 if velocity > 127 else velocity
+            
+            append((pitch, start, duration, velocity, mute))
+    
+    return tuple(new_notes)
+
+def _vary_notes(notes, variation_level, clip_length):
+    """Return a varied copy of notes for variation_level, or None below the lowest band"""
+    if variation_level > 0.8:
+        return _vary_high(notes, clip_length)
+    if variation_level > 0.5:
+        return _vary_medium(notes, clip_length)
+    if variation_level > 0.2:
+        return _vary_low(notes, clip_length)
+    return None
+
+def _set_follow_action(clip, action_value, probability, follow_time=None):
+    """Make action_value the clip's follow action A with probability, leaving the rest to a B of none
+    
+    Given a follow_time, the follow action time is set to it and linked as well. Properties
+    that already hold the value are not written, so they add nothing to Live's undo history.
+    """
+    if clip.follow_action_a != action_value:
+        clip.follow_action_a = action_value
+    if clip.follow_action_a_probability != probability:
+        clip.follow_action_a_probability = probability
+    if clip.follow_action_b != FollowAction.NONE:
+        clip.follow_action_b = FollowAction.NONE
+    if clip.follow_action_b_probability != 1.0 - probability:
+        clip.follow_action_b_probability = 1.0 - probability
+    if follow_time is not None:
+        if clip.follow_action_time != follow_time:
+            clip.follow_action_time = follow_time
+        if not clip.follow_action_follow_time_linked:
+            clip.follow_action_follow_time_linked = True
+    if not clip.follow_action_enabled:
+        clip.follow_action_enabled = True
+
+def _clip_summary(clip):
+    """Return the clip fields reported by get_track_info"""
+    return {
+        "name": clip.name,
+        "length": clip.length,
+        "is_playing": clip.is_playing,
+        "is_recording": clip.is_recording
+    }
+
+_ARRANGEMENT_CLIP_FIELDS = operator.attrgetter("name", "length", "is_audio_clip")
+
+def _arrangement_clip_summary(clip):
+    """Return the clip fields reported by get_track_arrangement_clips"""
+    name, length, is_audio_clip = _ARRANGEMENT_CLIP_FIELDS(clip)
+    clip_info = {
+        "name": name,
+        "start_time": clip.start_marker.time,
+        "end_time": clip.end_marker.time,
+        "length": length,
+        "is_audio_clip": is_audio_clip
+    }
+    
+    # For MIDI clips, include note count
+    if not is_audio_clip:
+        clip_info["note_count"] = len(clip.get_notes(0, 0, length, 127))
+    return clip_info
+
+def _liveobj_valid(obj):
+    """Return whether a Live object still exists; deleted ones compare equal to None"""
+    return obj != None
+
 def create_instance(c_instance):
     """Create and return the AbletonMCP script instance"""
     return AbletonMCPboost(c_instance)
@@ -33,12 +345,86 @@ class AbletonMCPboost(ControlSurface):
         
         # Socket server for communication
         self.server = None
-        self.client_threads = []
+        self.selector = None
         self.server_thread = None
         self.running = False
         
-        # Cache the song reference for easier access
+        # Socket pair the main thread writes to once a write command's response is
+        # in _completed, waking the selector to send it
+        self._wake_recv = None
+        self._wake_send = None
+        self._completed = collections.deque()
+        
+        # Browser items indexed by URI, filled in lazily by _find_browser_item_by_uri
+        self._uri_cache = None
+        self._uri_frontier = None
+        self._uri_max_depth = 0
+        self._uri_cache_lock = threading.Lock()
+        # Set from the main thread when the browser changes; the index is rebuilt
+        # on the next lookup rather than waiting for the lock there
+        self._uri_index_stale = False
+        
+        # Public attribute names of the browser, listed with dir() on first use
+        self._browser_attrs = None
+        
+        # get_browser_tree results by category_type, dropped when the browser changes
+        self._browser_tree_cache = {}
+        
+        # Children of browser folders by lowercase name, keyed by the folder's URI
+        self._child_index_cache = {}
+        
+        # Device types by device class_name, see _get_device_type
+        self._device_type_cache = {}
+        
+        # Whether the Song or its view has an attribute, see _song_has; the
+        # API Live exposes does not change while the script is loaded
+        self._song_features = {}
+        
+        # Main view names by the lowercase fragment that identifies them, see _main_view_name
+        self._main_view_names = {}
+        
+        # Full tracebacks and per-request detail are only logged when verbose logging is on
+        self._verbose = False
+        
+        # Log lines from per-clip and per-section loops, see _log_buffered
+        self._log_buffer = []
+        
+        # Scratch buffer reused by every recv_into on the server thread
+        self._recv_scratch = bytearray(RECV_CHUNK_SIZE)
+        self._recv_view = memoryview(self._recv_scratch)
+        self._rcvlowat_supported = _SO_RCVLOWAT is not None
+        
+        # Cache the song, its view and browser references for easier access
         self._song = self.song()
+        self._song_view = self._song.view
+        self._browser = None
+        
+        # Song tracks, fetched again after the track list changes
+        self._tracks = None
+        
+        # Tasks for the main thread, appended by the server thread and run from
+        # update_display; a deque needs no lock for one producer and one consumer.
+        # _completed carries their responses back the same way.
+        self._main_thread_tasks = collections.deque()
+        
+        # Clips fired by duplicate_clip_to_arrangement that are still recording, as
+        # (clip slot, song time to stop at); main thread only
+        self._pending_records = []
+        
+        # (was playing, was recording) as the first of the pending recordings found
+        # the transport, restored once they have all stopped
+        self._record_restore = None
+        
+        # Song time when the pending recordings were last checked, to notice the
+        # playhead jumping back
+        self._record_time = 0.0
+        
+        # Info caches, invalidated by Live's change notifications
+        self._listeners = []
+        self._info_cache = {}
+        self._watched_tracks = set()
+        self._watch_song()
+        self._watch_browser()
         
         # Start the socket server
         self.start_server()
@@ -48,6 +434,15 @@ class AbletonMCPboost(ControlSurface):
         # Show a message in Ableton
         self.show_message("AbletonMCPboost: Listening for commands on port " + str(DEFAULT_PORT))
     
+    def update_display(self):
+        """Run the tasks queued for the main thread, then let Live update the display"""
+        tasks = self._main_thread_tasks
+        while tasks:
+            tasks.popleft()()
+        if self._pending_records:
+            self._finish_recordings()
+        ControlSurface.update_display(self)
+    
     def disconnect(self):
         """Called when Ableton closes or the control surface is removed"""
         self.log_message("AbletonMCPboost disconnecting...")
@@ -60,19 +455,63 @@ class AbletonMCPboost(ControlSurface):
             except:
                 pass
         
-        # Wait for the server thread to exit
+        # Wait for the server thread to exit; it closes any remaining clients
         if self.server_thread and self.server_thread.is_alive():
             self.server_thread.join(1.0)
-            
-        # Clean up any client threads
-        for client_thread in self.client_threads[:]:
-            if client_thread.is_alive():
-                # We don't join them as they might be stuck
-                self.log_message("Client thread still alive during disconnect")
+        
+        for sock in (self._wake_recv, self._wake_send):
+            if sock:
+                sock.close()
+        
+        self._remove_listeners()
         
         ControlSurface.disconnect(self)
         self.log_message("AbletonMCPboost disconnected")
     
+    def _finish_recordings(self):
+        """Stop the clips duplicate_clip_to_arrangement is recording once they have played through
+        
+        Called from update_display. When the last one stops, the transport goes back to
+        how the first recording found it.
+        """
+        song = self._song
+        try:
+            now = song.current_song_time
+            playing = song.is_playing
+        except Exception as e:
+            self.log_message("Error checking recordings: " + str(e))
+            return
+        
+        # Playback stopped by the user ends every recording, and so does the playhead
+        # jumping back, e.g. the arrangement loop wrapping before a clip's end is reached
+        keep_recording = playing and now >= self._record_time
+        self._record_time = now
+        
+        pending = []
+        for record in self._pending_records:
+            if keep_recording and now < record[1]:
+                pending.append(record)
+            else:
+                self._stop_recorded_clip(record[0])
+        self._pending_records = pending
+        
+        if not pending:
+            was_playing, was_recording = self._record_restore
+            self._record_restore = None
+            try:
+                song.record_mode = was_recording
+                if not was_playing and song.is_playing:
+                    song.stop_playing()
+            except Exception as e:
+                self.log_message("Error restoring transport after recording: " + str(e))
+    
+    def _stop_recorded_clip(self, clip_slot):
+        """Stop a clip fired by duplicate_clip_to_arrangement"""
+        try:
+            clip_slot.stop()
+        except Exception as e:
+            self.log_message("Error stopping recorded clip: " + str(e))
+    
     def start_server(self):
         """Start the socket server in a separate thread"""
         try:
@@ -80,6 +519,15 @@ class AbletonMCPboost(ControlSurface):
             self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.server.bind((HOST, DEFAULT_PORT))
             self.server.listen(5)  # Allow up to 5 pending connections
+            self.server.setblocking(False)
+            
+            # A single selector multiplexes the listening socket, the wakeup socket and all clients
+            self._wake_recv, self._wake_send = socket.socketpair()
+            self._wake_recv.setblocking(False)
+            self._wake_send.setblocking(False)
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.server, selectors.EVENT_READ)
+            self.selector.register(self._wake_recv, selectors.EVENT_READ)
             
             self.running = True
             self.server_thread = threading.Thread(target=self._server_thread)
@@ -92,1296 +540,1668 @@ class AbletonMCPboost(ControlSurface):
             self.show_message("AbletonMCPboost: Error starting server - " + str(e))
     
     def _server_thread(self):
-        """Server thread implementation - handles client connections"""
+        """Server thread implementation - runs the selector loop for all connections"""
         try:
             self.log_message("Server thread started")
-            # Set a timeout to allow regular checking of running flag
-            self.server.settimeout(1.0)
             
             while self.running:
                 try:
-                    # Accept connections with timeout
-                    client, address = self.server.accept()
-                    self.log_message("Connection accepted from " + str(address))
-                    self.show_message("AbletonMCPboost: Client connected")
-                    
-                    # Handle client in a separate thread
-                    client_thread = threading.Thread(
-                        target=self._handle_client,
-                        args=(client,)
-                    )
-                    client_thread.daemon = True
-                    client_thread.start()
-                    
-                    # Keep track of client threads
-                    self.client_threads.append(client_thread)
-                    
-                    # Clean up finished client threads
-                    self.client_threads = [t for t in self.client_threads if t.is_alive()]
-                    
-                except socket.timeout:
-                    # No connection yet, just continue
-                    continue
+                    # Use a timeout to allow regular checking of running flag
+                    events = self.selector.select(timeout=1.0)
                 except Exception as e:
                     if self.running:  # Only log if still running
-                        self.log_message("Server accept error: " + str(e))
+                        self.log_message("Server select error: " + str(e))
                     time.sleep(0.5)
+                    continue
+                
+                for key, mask in events:
+                    if key.fileobj is self.server:
+                        self._accept_client()
+                    elif key.fileobj is self._wake_recv:
+                        self._send_completed()
+                    else:
+                        self._service_client(key, mask)
             
             self.log_message("Server thread stopped")
         except Exception as e:
             self.log_message("Server thread error: " + str(e))
+        finally:
+            self._close_all_clients()
     
-    def _handle_client(self, client):
-        """Handle communication with a connected client"""
-        self.log_message("Client handler started")
-        client.settimeout(None)  # No timeout for client socket
-        buffer = ''  # Changed from b'' to '' for Python 2
-        
+    def _accept_client(self):
+        """Accept a pending connection and register it with the selector"""
         try:
-            while self.running:
-                try:
-                    # Receive data
-                    data = client.recv(8192)
-                    
-                    if not data:
-                        # Client disconnected
-                        self.log_message("Client disconnected")
-                        break
-                    
-                    # Accumulate data in buffer with explicit encoding/decoding
-                    try:
-                        # Python 3: data is bytes, decode to string
-                        buffer += data.decode('utf-8')
-                    except AttributeError:
-                        # Python 2: data is already string
-                        buffer += data
-                    
-                    try:
-                        # Try to parse command from buffer
-                        command = json.loads(buffer)  # Removed decode('utf-8')
-                        buffer = ''  # Clear buffer after successful parse
-                        
-                        self.log_message("Received command: " + str(command.get("type", "unknown")))
-                        
-                        # Process the command and get response
-                        response = self._process_command(command)
-                        
-                        # Send the response with explicit encoding
-                        try:
-                            # Python 3: encode string to bytes
-                            client.sendall(json.dumps(response).encode('utf-8'))
-                        except AttributeError:
-                            # Python 2: string is already bytes
-                            client.sendall(json.dumps(response))
-                    except ValueError:
-                        # Incomplete data, wait for more
-                        continue
-                        
-                except Exception as e:
-                    self.log_message("Error handling client data: " + str(e))
-                    self.log_message(traceback.format_exc())
-                    
-                    # Send error response if possible
-                    error_response = {
-                        "status": "error",
-                        "message": str(e)
-                    }
-                    try:
-                        # Python 3: encode string to bytes
-                        client.sendall(json.dumps(error_response).encode('utf-8'))
-                    except AttributeError:
-                        # Python 2: string is already bytes
-                        client.sendall(json.dumps(error_response))
-                    except:
-                        # If we can't send the error, the connection is probably dead
-                        break
-                    
-                    # For serious errors, break the loop
-                    if not isinstance(e, ValueError):
-                        break
+            client, address = self.server.accept()
+        except (BlockingIOError, InterruptedError):
+            # Another wakeup already took the connection
+            return
         except Exception as e:
-            self.log_message("Error in client handler: " + str(e))
-        finally:
+            if self.running:  # Only log if still running
+                self.log_message("Server accept error: " + str(e))
+            return
+        
+        # The server and wakeup sockets are registered too, so they are not counted as clients
+        if len(self.selector.get_map()) - 2 >= MAX_CLIENTS:
+            self.log_message("Rejecting connection from " + str(address) + ": too many clients")
             try:
-                client.close()
-            except:
+                client.send(_BUSY_FRAME)
+            except OSError:
                 pass
-            self.log_message("Client handler stopped")
-    
-    def _process_command(self, command):
-        """Process a command from the client and return a response"""
-        command_type = command.get("type", "")
-        params = command.get("params", {})
+            client.close()
+            return
+        
+        self.log_message("Connection accepted from " + str(address))
+        self.show_message("AbletonMCPboost: Client connected")
         
-        # Initialize response
-        response = {
-            "status": "success",
-            "result": {}
+        client.setblocking(False)
+        # Responses are written as one message, so send them without waiting on Nagle
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        state = {
+            "buffer": bytearray(),
+            "out_queue": collections.deque(),
+            "framed": False,
+            "legacy": False,
+            "rcvlowat": 1,
+            # A write command from this client is waiting on the main thread
+            "busy": False,
+            "closed": False
         }
+        self.selector.register(client, selectors.EVENT_READ, state)
+        self._set_rcvlowat(client, state, _HEADER.size)
+    
+    def _service_client(self, key, mask):
+        """Handle a readiness event for a connected client"""
+        client = key.fileobj
+        state = key.data
         
         try:
-            # Route the command to the appropriate handler
-            if command_type == "get_session_info":
-                response["result"] = self._get_session_info()
-            elif command_type == "get_track_info":
-                track_index = params.get("track_index", 0)
-                response["result"] = self._get_track_info(track_index)
-            elif command_type == "get_browser_item":
-                uri = params.get("uri", None)
-                path = params.get("path", None)
-                response["result"] = self._get_browser_item(uri, path)
-            elif command_type == "get_browser_categories":
-                category_type = params.get("category_type", "all")
-                response["result"] = self._get_browser_categories(category_type)
-            elif command_type == "get_browser_items":
-                path = params.get("path", "")
-                item_type = params.get("item_type", "all")
-                response["result"] = self._get_browser_items(path, item_type)
-            # Add the new browser commands
-            elif command_type == "get_browser_tree":
-                category_type = params.get("category_type", "all")
-                response["result"] = self.get_browser_tree(category_type)
-            elif command_type == "get_browser_items_at_path":
-                path = params.get("path", "")
-                response["result"] = self.get_browser_items_at_path(path)
-            # Add the new arrangement info commands
-            elif command_type == "get_arrangement_info":
-                response["result"] = self._get_arrangement_info()
-            elif command_type == "get_track_arrangement_clips":
-                track_index = params.get("track_index", 0)
-                response["result"] = self._get_track_arrangement_clips(track_index)
-            elif command_type == "get_current_view":
-                response["result"] = self._get_current_view()
-            elif command_type == "get_time_signatures":
-                response["result"] = self._get_time_signatures()
-            elif command_type == "get_arrangement_markers":
-                response["result"] = self._get_arrangement_markers()
-            # New Live 11 compatible view switching commands
-            elif command_type == "show_arrangement_view":
-                response["result"] = self._show_arrangement_view()
-            elif command_type == "show_session_view":
-                response["result"] = self._show_session_view()
-            # Commands that modify Live's state should be scheduled on the main thread
-            elif command_type in ["create_midi_track", "set_track_name", 
-                                 "create_clip", "add_notes_to_clip", "set_clip_name", 
-                                 "set_tempo", "fire_clip", "stop_clip",
-                                 "start_playback", "stop_playback", "load_browser_item",
-                                 "create_arrangement_section", "duplicate_section", 
-                                 "create_transition", "convert_session_to_arrangement",
-                                 "set_clip_follow_action_time", "set_clip_follow_action",
-                                 "set_clip_follow_action_linked", "setup_clip_sequence",
-                                 "setup_project_follow_actions",
-                                 # Add new arrangement-specific commands
-                                 "add_automation_to_clip", "create_audio_track",
-                                 "insert_arrangement_clip", "duplicate_clip_to_arrangement",
-                                 "set_locators", "set_arrangement_loop", "set_clip_loop_end",
-                                 "set_time_signature", "set_playhead_position",
-                                 "create_arrangement_marker", "create_complex_arrangement",
-                                 "quantize_arrangement_clips", "consolidate_arrangement_selection",
-                                 # Live 11 compatible arrangement commands
-                                 "set_arrangement_record", "arrangement_to_session",
-                                 "start_arrangement_recording"]:
-                # Use a thread-safe approach with a response queue
-                response_queue = queue.Queue()
-                
-                # Define a function to execute on the main thread
-                def main_thread_task():
-                    try:
-                        result = None
-                        if command_type == "create_midi_track":
-                            index = params.get("index", -1)
-                            result = self._create_midi_track(index)
-                        elif command_type == "set_track_name":
-                            track_index = params.get("track_index", 0)
-                            name = params.get("name", "")
-                            result = self._set_track_name(track_index, name)
-                        elif command_type == "create_clip":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            length = params.get("length", 4.0)
-                            result = self._create_clip(track_index, clip_index, length)
-                        elif command_type == "add_notes_to_clip":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            notes = params.get("notes", [])
-                            result = self._add_notes_to_clip(track_index, clip_index, notes)
-                        elif command_type == "set_clip_name":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            name = params.get("name", "")
-                            result = self._set_clip_name(track_index, clip_index, name)
-                        elif command_type == "set_tempo":
-                            tempo = params.get("tempo", 120.0)
-                            result = self._set_tempo(tempo)
-                        elif command_type == "fire_clip":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            result = self._fire_clip(track_index, clip_index)
-                        elif command_type == "stop_clip":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            result = self._stop_clip(track_index, clip_index)
-                        elif command_type == "start_playback":
-                            result = self._start_playback()
-                        elif command_type == "stop_playback":
-                            result = self._stop_playback()
-                        elif command_type == "load_instrument_or_effect":
-                            track_index = params.get("track_index", 0)
-                            uri = params.get("uri", "")
-                            result = self._load_instrument_or_effect(track_index, uri)
-                        elif command_type == "load_browser_item":
-                            track_index = params.get("track_index", 0)
-                            item_uri = params.get("item_uri", "")
-                            result = self._load_browser_item(track_index, item_uri)
-                        elif command_type == "create_arrangement_section":
-                            section_type = params.get("section_type", "")
-                            length_bars = params.get("length_bars", 4)
-                            start_bar = params.get("start_bar", -1)
-                            result = self._create_arrangement_section(section_type, length_bars, start_bar)
-                        elif command_type == "duplicate_section":
-                            source_start_bar = params.get("source_start_bar", 0)
-                            source_end_bar = params.get("source_end_bar", 4)
-                            destination_bar = params.get("destination_bar", 4)
-                            variation_level = params.get("variation_level", 0.0)
-                            result = self._duplicate_section(source_start_bar, source_end_bar, destination_bar, variation_level)
-                        elif command_type == "create_transition":
-                            from_bar = params.get("from_bar", 0)
-                            to_bar = params.get("to_bar", 0)
-                            transition_type = params.get("transition_type", "fill")
-                            length_beats = params.get("length_beats", 4)
-                            result = self._create_transition(from_bar, to_bar, transition_type, length_beats)
-                        elif command_type == "convert_session_to_arrangement":
-                            structure = params.get("structure", [])
-                            result = self._convert_session_to_arrangement(structure)
-                        elif command_type == "set_clip_follow_action_time":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            time_beats = params.get("time_beats", 4.0)
-                            result = self._set_clip_follow_action_time(track_index, clip_index, time_beats)
-                        elif command_type == "set_clip_follow_action":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            action_type = params.get("action_type", "next")
-                            probability = params.get("probability", 1.0)
-                            result = self._set_clip_follow_action(track_index, clip_index, action_type, probability)
-                        elif command_type == "set_clip_follow_action_linked":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            linked = params.get("linked", True)
-                            result = self._set_clip_follow_action_linked(track_index, clip_index, linked)
-                        elif command_type == "setup_clip_sequence":
-                            track_index = params.get("track_index", 0)
-                            start_clip_index = params.get("start_clip_index", 0)
-                            end_clip_index = params.get("end_clip_index", 0)
-                            loop_back = params.get("loop_back", True)
-                            result = self._setup_clip_sequence(track_index, start_clip_index, end_clip_index, loop_back)
-                        elif command_type == "setup_project_follow_actions":
-                            loop_back = params.get("loop_back", True)
-                            result = self._setup_project_follow_actions(loop_back)
-                        # New arrangement commands
-                        elif command_type == "add_automation_to_clip":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            parameter_name = params.get("parameter_name", "")
-                            points = params.get("points", [])
-                            result = self._add_automation_to_clip(track_index, clip_index, parameter_name, points)
-                        elif command_type == "create_audio_track":
-                            index = params.get("index", -1)
-                            result = self._create_audio_track(index)
-                        elif command_type == "insert_arrangement_clip":
-                            track_index = params.get("track_index", 0)
-                            start_time = params.get("start_time", 0.0)
-                            length = params.get("length", 4.0)
-                            is_audio = params.get("is_audio", False)
-                            result = self._insert_arrangement_clip(track_index, start_time, length, is_audio)
-                        elif command_type == "duplicate_clip_to_arrangement":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            arrangement_time = params.get("arrangement_time", 0.0)
-                            result = self._duplicate_clip_to_arrangement(track_index, clip_index, arrangement_time)
-                        elif command_type == "set_locators":
-                            start_time = params.get("start_time", 0.0)
-                            end_time = params.get("end_time", 4.0)
-                            name = params.get("name", "")
-                            result = self._set_locators(start_time, end_time, name)
-                        elif command_type == "set_arrangement_loop":
-                            start_time = params.get("start_time", 0.0)
-                            end_time = params.get("end_time", 4.0)
-                            enabled = params.get("enabled", True)
-                            result = self._set_arrangement_loop(start_time, end_time, enabled)
-                        elif command_type == "set_clip_loop_end":
-                            track_index = params.get("track_index", 0)
-                            clip_start_time = params.get("clip_start_time", 0.0)
-                            loop_end = params.get("loop_end", 4.0)
-                            result = self._set_clip_loop_end(track_index, clip_start_time, loop_end)
-                        elif command_type == "set_time_signature":
-                            numerator = params.get("numerator", 4)
-                            denominator = params.get("denominator", 4)
-                            bar_position = params.get("bar_position", 1)
-                            result = self._set_time_signature(numerator, denominator, bar_position)
-                        elif command_type == "set_playhead_position":
-                            time = params.get("time", 0.0)
-                            result = self._set_playhead_position(time)
-                        elif command_type == "create_arrangement_marker":
-                            name = params.get("name", "Marker")
-                            time = params.get("time", 0.0)
-                            result = self._create_arrangement_marker(name, time)
-                        elif command_type == "create_complex_arrangement":
-                            structure = params.get("structure", [])
-                            transitions = params.get("transitions", True)
-                            arrange_automation = params.get("arrange_automation", True)
-                            result = self._create_complex_arrangement(structure, transitions, arrange_automation)
-                        elif command_type == "quantize_arrangement_clips":
-                            track_index = params.get("track_index", -1)
-                            quantize_amount = params.get("quantize_amount", 1.0)
-                            result = self._quantize_arrangement_clips(track_index, quantize_amount)
-                        elif command_type == "consolidate_arrangement_selection":
-                            start_time = params.get("start_time", 0.0)
-                            end_time = params.get("end_time", 4.0)
-                            track_index = params.get("track_index", 0)
-                            result = self._consolidate_arrangement_selection(start_time, end_time, track_index)
-                        # Live 11 compatible arrangement commands
-                        elif command_type == "set_arrangement_record":
-                            enabled = params.get("enabled", True)
-                            result = self._set_arrangement_record(enabled)
-                        elif command_type == "arrangement_to_session":
-                            track_index = params.get("track_index", 0)
-                            start_time = params.get("start_time", 0.0)
-                            end_time = params.get("end_time", 4.0)
-                            target_clip_slot = params.get("target_clip_slot", 0)
-                            result = self._arrangement_to_session(track_index, start_time, end_time, target_clip_slot)
-                        elif command_type == "start_arrangement_recording":
-                            result = self._start_arrangement_recording()
-                        
-                        # Put the result in the queue
-                        response_queue.put({"status": "success", "result": result})
-                    except Exception as e:
-                        self.log_message("Error in main thread task: " + str(e))
-                        self.log_message(traceback.format_exc())
-                        response_queue.put({"status": "error", "message": str(e)})
-                
-                # Schedule the task to run on the main thread
-                try:
-                    self.schedule_message(0, main_thread_task)
-                except AssertionError:
-                    # If we're already on the main thread, execute directly
-                    main_thread_task()
-                
-                # Wait for the response with a timeout
-                try:
-                    task_response = response_queue.get(timeout=10.0)
-                    if task_response.get("status") == "error":
-                        response["status"] = "error"
-                        response["message"] = task_response.get("message", "Unknown error")
-                    else:
-                        response["result"] = task_response.get("result", {})
-                except queue.Empty:
-                    response["status"] = "error"
-                    response["message"] = "Timeout waiting for operation to complete"
-            else:
-                response["status"] = "error"
-                response["message"] = "Unknown command: " + command_type
+            if mask & selectors.EVENT_WRITE:
+                self._flush_client(client, state)
+            if mask & selectors.EVENT_READ:
+                self._read_client(client, state)
         except Exception as e:
-            self.log_message("Error processing command: " + str(e))
-            self.log_message(traceback.format_exc())
-            response["status"] = "error"
-            response["message"] = str(e)
-        
-        return response
-    
-    # Command implementations
+            self.log_message("Error in client handler: " + str(e))
+            self._close_client(client)
     
-    def _get_session_info(self):
-        """Get information about the current session"""
+    def _read_client(self, client, state):
+        """Read available data from a client and process any complete command"""
         try:
-            result = {
-                "tempo": self._song.tempo,
-                "signature_numerator": self._song.signature_numerator,
-                "signature_denominator": self._song.signature_denominator,
-                "track_count": len(self._song.tracks),
-                "return_track_count": len(self._song.return_tracks),
-                "master_track": {
-                    "name": "Master",
-                    "volume": self._song.master_track.mixer_device.volume.value,
-                    "panning": self._song.master_track.mixer_device.panning.value
-                }
-            }
-            return result
-        except Exception as e:
-            self.log_message("Error getting session info: " + str(e))
-            raise
+            count = client.recv_into(self._recv_scratch)
+        except (BlockingIOError, InterruptedError):
+            # Spurious wakeup, wait for more
+            return
+        
+        if not count:
+            # Client disconnected
+            self.log_message("Client disconnected")
+            self._close_client(client)
+            return
+        
+        state["buffer"] += self._recv_view[:count]
+        
+        # Commands behind a pending write wait for its response, keeping responses in order
+        if not state["busy"]:
+            self._process_buffer(client, state)
     
-    def _get_track_info(self, track_index):
-        """Get information about a track"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
+    def _process_buffer(self, client, state):
+        """Process every complete command in a client's buffer, stopping at a write command"""
+        buffer = state["buffer"]
+        
+        if state["legacy"]:
+            self._read_legacy(client, state)
+            return
+        
+        # Process every complete frame in the buffer
+        while len(buffer) >= _HEADER.size:
+            length = _HEADER.unpack_from(buffer)[0]
+            if length > MAX_FRAME_SIZE:
+                if not state["framed"] and buffer[0] == _LEGACY_FIRST_BYTE:
+                    self.log_message("Client sent unframed JSON, using legacy mode")
+                    state["legacy"] = True
+                    self._set_rcvlowat(client, state, 1)
+                    self._read_legacy(client, state)
+                    return
+                self.log_message("Frame of " + str(length) + " bytes exceeds limit, dropping client")
+                self._close_client(client)
+                return
+            state["framed"] = True
             
-            # Get clip slots
-            clip_slots = []
-            for slot_index, slot in enumerate(track.clip_slots):
-                clip_info = None
-                if slot.has_clip:
-                    clip = slot.clip
-                    clip_info = {
-                        "name": clip.name,
-                        "length": clip.length,
-                        "is_playing": clip.is_playing,
-                        "is_recording": clip.is_recording
-                    }
-                
-                clip_slots.append({
-                    "index": slot_index,
-                    "has_clip": slot.has_clip,
-                    "clip": clip_info
-                })
+            end = _HEADER.size + length
+            if len(buffer) < end:
+                # Incomplete frame, wait for more
+                break
             
-            # Get devices
-            devices = []
-            for device_index, device in enumerate(track.devices):
-                devices.append({
-                    "index": device_index,
-                    "name": device.name,
-                    "class_name": device.class_name,
-                    "type": self._get_device_type(device)
-                })
+            # json/orjson both decode bytes-like input, so no UTF-8 decode step is needed
+            payload = buffer[_HEADER.size:end]
+            del buffer[:end]
             
-            result = {
-                "index": track_index,
-                "name": track.name,
-                "is_audio_track": track.has_audio_input,
-                "is_midi_track": track.has_midi_input,
-                "mute": track.mute,
-                "solo": track.solo,
-                "arm": track.arm,
-                "volume": track.mixer_device.volume.value,
-                "panning": track.mixer_device.panning.value,
-                "clip_slots": clip_slots,
-                "devices": devices
-            }
-            return result
-        except Exception as e:
-            self.log_message("Error getting track info: " + str(e))
-            raise
+            if not self._handle_payload(client, state, payload):
+                return
+            if state["busy"]:
+                break
+        
+        # Don't wake up again until the rest of the header or frame is readable
+        if len(buffer) < _HEADER.size:
+            needed = _HEADER.size - len(buffer)
+        else:
+            needed = _HEADER.size + _HEADER.unpack_from(buffer)[0] - len(buffer)
+        self._set_rcvlowat(client, state, min(needed, MAX_RCVLOWAT))
     
-    def _create_midi_track(self, index):
-        """Create a new MIDI track at the specified index"""
+    def _set_rcvlowat(self, client, state, lowat):
+        """Ask the kernel not to report a client readable until lowat bytes are queued"""
+        if not self._rcvlowat_supported or state["rcvlowat"] == lowat:
+            return
         try:
-            # Create the track
-            self._song.create_midi_track(index)
+            client.setsockopt(socket.SOL_SOCKET, _SO_RCVLOWAT, lowat)
+            state["rcvlowat"] = lowat
+        except OSError as e:
+            # e.g. Windows, which defines the option but rejects it
+            self.log_message("SO_RCVLOWAT not supported: " + str(e))
+            self._rcvlowat_supported = False
+    
+    def _read_legacy(self, client, state):
+        """Process every complete JSON object at the front of an unframed client's buffer"""
+        buffer = state["buffer"]
+        while buffer:
+            # surrogateescape keeps char offsets mappable back to byte offsets,
+            # even with a multi-byte character cut off at the end of the buffer
+            text = buffer.decode("utf-8", "surrogateescape")
+            start = len(text) - len(text.lstrip())
+            if start == len(text):
+                del buffer[:]
+                return
+            try:
+                command, end = _DECODE(text, start)
+            except ValueError:
+                if len(buffer) > MAX_FRAME_SIZE:
+                    self.log_message("Unframed message exceeds limit, dropping client")
+                    self._close_client(client)
+                # Otherwise the object is incomplete, wait for more
+                return
             
-            # Get the new track
-            new_track_index = len(self._song.tracks) - 1 if index == -1 else index
-            new_track = self._song.tracks[new_track_index]
+            if len(text) == len(buffer):
+                del buffer[:end]
+            else:
+                del buffer[:len(text[:end].encode("utf-8", "surrogateescape"))]
             
-            result = {
-                "index": new_track_index,
-                "name": new_track.name
-            }
-            return result
-        except Exception as e:
-            self.log_message("Error creating MIDI track: " + str(e))
-            raise
-    
+            if not self._handle_payload(client, state, None, command):
+                return
+            if state["busy"]:
+                return
     
-    def _set_track_name(self, track_index, name):
-        """Set the name of a track"""
+    def _handle_payload(self, client, state, payload, command=None):
+        """Decode one framed command, process it and queue the response
+        
+        Legacy clients pass an already decoded command instead of a payload.
+        Returns False if the client connection was closed.
+        """
         try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            # Set the name
-            track = self._song.tracks[track_index]
-            track.name = name
+            if command is None:
+                command = _loads(payload)
+            if not isinstance(command, dict):
+                # Well-formed JSON that isn't a command; like a malformed frame this leaves the stream in sync
+                raise ValueError("Command must be a JSON object")
+            
+            self._log_verbose("Received command: {0}", command.get("type", "unknown"))
+            
+            # Process the command and queue the response, unless the main thread sends it later
+            response = self._process_command(command, client, state)
+            if response is not None:
+                self._send_response(client, state, response)
+            return True
+        except Exception as e:
+            self.log_message("Error handling client data: " + str(e))
+            self._log_traceback()
             
-            result = {
-                "name": track.name
+            # Send error response if possible
+            error_response = {
+                "status": "error",
+                "message": str(e)
             }
-            return result
+            try:
+                self._send_response(client, state, error_response)
+            except Exception:
+                self._close_client(client)
+                return False
+            
+            # A malformed frame leaves the stream in sync; anything else drops the client
+            if not isinstance(e, ValueError):
+                self._close_client(client)
+                return False
+            return True
+    
+    def _send_response(self, client, state, response):
+        """Queue a response for a client and write as much as the socket accepts"""
+        payload = _dumps(response)
+        out_queue = state["out_queue"]
+        if state["legacy"]:
+            out_queue.append(payload)
+        elif _HAS_SENDMSG:
+            out_queue.append(_HEADER.pack(len(payload)))
+            out_queue.append(payload)
+        else:
+            # Keep the frame in one buffer so Nagle does not hold back the body
+            out_queue.append(_HEADER.pack(len(payload)) + payload)
+        self._flush_client(client, state)
+    
+    def _flush_client(self, client, state):
+        """Write queued output, watching for writability only while data is pending"""
+        out_queue = state["out_queue"]
+        while out_queue:
+            if _HAS_SENDMSG:
+                buffers = list(itertools.islice(out_queue, SENDMSG_MAX_BUFFERS))
+            else:
+                buffers = [out_queue[0]]
+            try:
+                sent = client.sendmsg(buffers) if _HAS_SENDMSG else client.send(buffers[0])
+            except (BlockingIOError, InterruptedError):
+                break
+            
+            # Drop every buffer that went out completely and trim a partial one
+            partial = sent < sum(len(data) for data in buffers)
+            while sent:
+                data = out_queue[0]
+                if sent < len(data):
+                    out_queue[0] = memoryview(data)[sent:]
+                    break
+                sent -= len(data)
+                out_queue.popleft()
+            if partial:
+                # The socket buffer is full, wait for EVENT_WRITE
+                break
+        
+        events = selectors.EVENT_READ
+        if out_queue:
+            events |= selectors.EVENT_WRITE
+        if self.selector.get_key(client).events != events:
+            self.selector.modify(client, events, state)
+    
+    def _send_completed(self):
+        """Send the responses of write commands the main thread has finished"""
+        try:
+            self._wake_recv.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            pass
+        
+        completed = self._completed
+        while completed:
+            client, state, response = completed.popleft()
+            if state["closed"]:
+                continue
+            state["busy"] = False
+            try:
+                self._send_response(client, state, response)
+                # Carry on with the commands that arrived while the write ran
+                self._process_buffer(client, state)
+            except Exception as e:
+                self.log_message("Error in client handler: " + str(e))
+                self._close_client(client)
+    
+    def _close_client(self, client):
+        """Unregister and close a client connection"""
+        try:
+            key = self.selector.unregister(client)
+            key.data["closed"] = True
+        except (KeyError, ValueError):
+            pass
+        try:
+            client.close()
+        except:
+            pass
+        self.log_message("Client handler stopped")
+    
+    def _close_all_clients(self):
+        """Close every registered client and the selector itself"""
+        try:
+            for key in list(self.selector.get_map().values()):
+                if key.data is not None:
+                    self._close_client(key.fileobj)
+            self.selector.close()
         except Exception as e:
-            self.log_message("Error setting track name: " + str(e))
-            raise
+            self.log_message("Error closing clients: " + str(e))
     
-    def _create_clip(self, track_index, clip_index, length):
-        """Create a new MIDI clip in the specified track and clip slot"""
+    # Each command maps to the method that handles it and its (param, default) pairs,
+    # which are passed to the method positionally in this order.
+    
+    # Commands that only read Live's state. They are answered synchronously on the
+    # socket thread, with no scheduling or waiting.
+    _READ_HANDLERS = {
+        "get_session_info": ("_get_session_info", ()),
+        "get_track_info": ("_get_track_info", (("track_index", 0), ("format", "full"))),
+        "get_browser_item": ("_get_browser_item", (("uri", None), ("path", None))),
+        "get_browser_categories": ("_get_browser_categories", (("category_type", "all"),)),
+        "get_browser_items": ("_get_browser_items", (("path", ""), ("item_type", "all"))),
+        "get_browser_tree": ("get_browser_tree", (("category_type", "all"), ("include_children", False))),
+        "get_browser_items_at_path": ("get_browser_items_at_path", (("path", ""),)),
+        "get_arrangement_info": ("_get_arrangement_info", ()),
+        "get_track_arrangement_clips": ("_get_track_arrangement_clips", (("track_index", 0),)),
+        "get_current_view": ("_get_current_view", ()),
+        "get_time_signatures": ("_get_time_signatures", ()),
+        "get_arrangement_markers": ("_get_arrangement_markers", ()),
+        # Script settings, these do not touch Live's state
+        "set_verbose_logging": ("_set_verbose_logging", (("enabled", True),)),
+    }
+    
+    # Commands that modify Live's state and must be scheduled on the main thread
+    _WRITE_HANDLERS = {
+        "create_midi_track": ("_create_midi_track", (("index", -1),)),
+        "set_track_name": ("_set_track_name", (("track_index", 0), ("name", ""))),
+        "create_clip": ("_create_clip", (("track_index", 0), ("clip_index", 0), ("length", 4.0))),
+        "add_notes_to_clip": ("_add_notes_to_clip", (
+            ("track_index", 0), ("clip_index", 0), ("notes", ()))),
+        "set_clip_name": ("_set_clip_name", (("track_index", 0), ("clip_index", 0), ("name", ""))),
+        "set_tempo": ("_set_tempo", (("tempo", 120.0),)),
+        "fire_clip": ("_fire_clip", (("track_index", 0), ("clip_index", 0))),
+        "stop_clip": ("_stop_clip", (("track_index", 0), ("clip_index", 0))),
+        "start_playback": ("_start_playback", ()),
+        "stop_playback": ("_stop_playback", ()),
+        "load_browser_item": ("_load_browser_item", (("track_index", 0), ("item_uri", ""))),
+        "create_arrangement_section": ("_create_arrangement_section", (
+            ("section_type", ""), ("length_bars", 4), ("start_bar", -1))),
+        "duplicate_section": ("_duplicate_section", (
+            ("source_start_bar", 0), ("source_end_bar", 4), ("destination_bar", 4), ("variation_level", 0.0))),
+        "create_transition": ("_create_transition", (
+            ("from_bar", 0), ("to_bar", 0), ("transition_type", "fill"), ("length_beats", 4))),
+        "convert_session_to_arrangement": ("_convert_session_to_arrangement", (
+            ("structure", ()),)),
+        "set_clip_follow_action_time": ("_set_clip_follow_action_time", (
+            ("track_index", 0), ("clip_index", 0), ("time_beats", 4.0))),
+        "set_clip_follow_action": ("_set_clip_follow_action", (
+            ("track_index", 0), ("clip_index", 0), ("action_type", "next"), ("probability", 1.0))),
+        "set_clip_follow_action_linked": ("_set_clip_follow_action_linked", (
+            ("track_index", 0), ("clip_index", 0), ("linked", True))),
+        "setup_clip_sequence": ("_setup_clip_sequence", (
+            ("track_index", 0), ("start_clip_index", 0), ("end_clip_index", 0), ("loop_back", True))),
+        "setup_project_follow_actions": ("_setup_project_follow_actions", (("loop_back", True),)),
+        # Arrangement commands
+        "add_automation_to_clip": ("_add_automation_to_clip", (
+            ("track_index", 0), ("clip_index", 0), ("parameter_name", ""), ("points", ()))),
+        "create_audio_track": ("_create_audio_track", (("index", -1),)),
+        "insert_arrangement_clip": ("_insert_arrangement_clip", (
+            ("track_index", 0), ("start_time", 0.0), ("length", 4.0), ("is_audio", False))),
+        "duplicate_clip_to_arrangement": ("_duplicate_clip_to_arrangement", (
+            ("track_index", 0), ("clip_index", 0), ("arrangement_time", 0.0))),
+        "set_locators": ("_set_locators", (("start_time", 0.0), ("end_time", 4.0), ("name", ""))),
+        "set_arrangement_loop": ("_set_arrangement_loop", (
+            ("start_time", 0.0), ("end_time", 4.0), ("enabled", True))),
+        "set_clip_loop_end": ("_set_clip_loop_end", (
+            ("track_index", 0), ("clip_start_time", 0.0), ("loop_end", 4.0))),
+        "set_time_signature": ("_set_time_signature", (
+            ("numerator", 4), ("denominator", 4), ("bar_position", 1))),
+        "set_playhead_position": ("_set_playhead_position", (("time", 0.0),)),
+        "create_arrangement_marker": ("_create_arrangement_marker", (
+            ("name", "Marker"), ("time", 0.0))),
+        "create_complex_arrangement": ("_create_complex_arrangement", (
+            ("structure", ()), ("transitions", True), ("arrange_automation", True))),
+        "quantize_arrangement_clips": ("_quantize_arrangement_clips", (
+            ("track_index", -1), ("quantize_amount", 1.0))),
+        "consolidate_arrangement_selection": ("_consolidate_arrangement_selection", (
+            ("start_time", 0.0), ("end_time", 4.0), ("track_index", 0))),
+        # Live 11 compatible view switching commands
+        "show_arrangement_view": ("_show_arrangement_view", ()),
+        "show_session_view": ("_show_session_view", ()),
+        # Live 11 compatible arrangement commands
+        "set_arrangement_record": ("_set_arrangement_record", (("enabled", True),)),
+        "arrangement_to_session": ("_arrangement_to_session", (
+            ("track_index", 0), ("start_time", 0.0), ("end_time", 4.0), ("target_clip_slot", 0))),
+        "start_arrangement_recording": ("_start_arrangement_recording", ()),
+        # Several commands in one round trip and one main thread task
+        "apply_batch": ("_apply_batch", (("commands", ()),)),
+    }
+    
+    def _process_command(self, command, client, state):
+        """Process a command from the client and return a response
+        
+        Write commands are queued for the main thread and return None; their response
+        comes back through _completed and is sent by the server thread.
+        """
+        command_type = command.get("type", "")
+        params = command.get("params", {})
+        
         try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
-            
-            if clip_index < 0 or clip_index >= len(track.clip_slots):
-                raise IndexError("Clip index out of range")
+            # Route the command to the appropriate handler
+            spec = self._READ_HANDLERS.get(command_type)
+            if spec is not None:
+                method_name, argspec = spec
+                args = [params.get(name, default) for name, default in argspec]
+                return _response(getattr(self, method_name)(*args))
             
-            clip_slot = track.clip_slots[clip_index]
+            spec = self._WRITE_HANDLERS.get(command_type)
+            if spec is None:
+                return {"status": "error", "message": "Unknown command: " + command_type}
             
-            # Check if the clip slot already has a clip
-            if clip_slot.has_clip:
-                raise Exception("Clip slot already has a clip")
+            method_name, argspec = spec
+            args = [params.get(name, default) for name, default in argspec]
             
-            # Create the clip
-            clip_slot.create_clip(length)
+            task = functools.partial(self._main_thread_task, getattr(self, method_name), args, client, state)
             
-            result = {
-                "name": clip_slot.clip.name,
-                "length": clip_slot.clip.length
+            # Queue the task for the main thread's next update_display. The server
+            # thread carries on serving every other client meanwhile.
+            state["busy"] = True
+            self._main_thread_tasks.append(task)
+            return None
+        except Exception as e:
+            self.log_message("Error processing command: " + str(e))
+            self._log_traceback()
+            return {"status": "error", "message": str(e)}
+    
+    def _main_thread_task(self, method, args, client, state):
+        """Run a write handler on the main thread and hand its response to the server thread"""
+        try:
+            response = _response(method(*args))
+        except Exception as e:
+            self.log_message("Error in main thread task: " + str(e))
+            self._log_traceback()
+            response = {"status": "error", "message": str(e)}
+        finally:
+            self._flush_log()
+            # Our own writes may not all be covered by listeners
+            self._invalidate_info_caches()
+            self._tracks = None
+        
+        self._completed.append((client, state, response))
+        try:
+            self._wake_send.send(b"\0")
+        except (BlockingIOError, InterruptedError):
+            # The wakeup socket is full, so the server thread is already due to wake
+            pass
+        except OSError as e:
+            self.log_message("Error waking server thread: " + str(e))
+    
+    def _apply_batch(self, commands):
+        """Run commands in order on the main thread and return one response per command"""
+        responses = []
+        for command in commands:
+            # A malformed entry gets its own error response, the rest still run
+            if not isinstance(command, dict):
+                responses.append({"status": "error", "message": "Batch entry is not a command object"})
+                continue
+            command_type = command.get("type", "")
+            params = command.get("params", {})
+            if not isinstance(command_type, str) or not isinstance(params, dict):
+                responses.append({"status": "error", "message": "Batch entry has an invalid type or params"})
+                continue
+            
+            is_write = command_type in self._WRITE_HANDLERS
+            spec = self._WRITE_HANDLERS.get(command_type) or self._READ_HANDLERS.get(command_type)
+            if spec is None or command_type == "apply_batch":
+                responses.append({"status": "error", "message": "Unknown command: " + command_type})
+                continue
+            
+            method_name, argspec = spec
+            args = [params.get(name, default) for name, default in argspec]
+            try:
+                responses.append(_response(getattr(self, method_name)(*args)))
+            except Exception as e:
+                responses.append({"status": "error", "message": str(e)})
+            finally:
+                if is_write:
+                    # Later commands in the batch must not read info cached before this write
+                    self._invalidate_info_caches()
+                    self._tracks = None
+        return responses
+    
+    def _log_traceback(self):
+        """Log the traceback of the exception being handled if verbose logging is on"""
+        if self._verbose:
+            self.log_message(traceback.format_exc())
+    
+    def _log_buffered(self, message):
+        """Queue a log line from a loop, writing the queue 64 lines at a time
+        
+        Whatever is left is written when the main-thread task ends or a handler fails.
+        """
+        buffer = self._log_buffer
+        buffer.append(message)
+        if len(buffer) >= 64:
+            self._flush_log()
+    
+    def _flush_log(self):
+        """Write the lines queued by _log_buffered as one log message"""
+        if self._log_buffer:
+            self.log_message("\n".join(self._log_buffer))
+            self._log_buffer = []
+    
+    def _log_verbose(self, message, *args):
+        """Format and log message only if verbose logging is on"""
+        if self._verbose:
+            self.log_message(message.format(*args) if args else message)
+    
+    def _add_listener(self, subject, name, callback):
+        """Register callback as a listener for name on subject unless already registered
+        
+        Returns whether callback is now listening.
+        """
+        try:
+            if getattr(subject, name + "_has_listener")(callback):
+                return True
+            getattr(subject, "add_" + name + "_listener")(callback)
+            self._listeners.append((subject, name, callback))
+            return True
+        except (AttributeError, RuntimeError):
+            # Property is not observable on this object or Live version
+            return False
+    
+    def _remove_listeners(self):
+        """Remove every listener registered through _add_listener"""
+        for subject, name, callback in self._listeners:
+            try:
+                if getattr(subject, name + "_has_listener")(callback):
+                    getattr(subject, "remove_" + name + "_listener")(callback)
+            except Exception:
+                # The object may already have been deleted
+                pass
+        self._listeners = []
+    
+    def _watch_song(self):
+        """Watch the song properties that make up the session info"""
+        song = self._song
+        for name in ("tempo", "signature_numerator", "signature_denominator", "return_tracks"):
+            self._add_listener(song, name, self._invalidate_info_caches)
+        self._add_listener(song, "tracks", self._invalidate_track_structure)
+        mixer = song.master_track.mixer_device
+        self._add_listener(mixer.volume, "value", self._invalidate_info_caches)
+        self._add_listener(mixer.panning, "value", self._invalidate_info_caches)
+    
+    def _watch_track(self, track_index):
+        """Watch everything _get_track_info reports for a track (main thread only)
+        
+        The track only counts as watched, letting its info be cached, if every
+        listener could be added; otherwise a change could go unnoticed.
+        """
+        try:
+            tracks = self._get_tracks()
+            if track_index < 0 or track_index >= len(tracks):
+                return
+            track = tracks[track_index]
+            add = self._add_listener
+            watched = True
+            for name in ("name", "mute", "solo", "arm"):
+                watched &= add(track, name, self._invalidate_info_caches)
+            watched &= add(track, "devices", self._invalidate_track_structure)
+            watched &= add(track.mixer_device.volume, "value", self._invalidate_info_caches)
+            watched &= add(track.mixer_device.panning, "value", self._invalidate_info_caches)
+            for slot in track.clip_slots:
+                watched &= add(slot, "has_clip", self._invalidate_track_structure)
+                if slot.has_clip:
+                    for name in ("name", "playing_status", "is_recording", "loop_start", "loop_end"):
+                        watched &= add(slot.clip, name, self._invalidate_info_caches)
+            for device in track.devices:
+                watched &= add(device, "name", self._invalidate_info_caches)
+            if watched:
+                self._watched_tracks.add(track_index)
+        except Exception as e:
+            self.log_message("Error watching track: " + str(e))
+    
+    def _watch_browser(self):
+        """Watch the browser categories that make up the browser tree"""
+        try:
+            browser = self._get_browser()
+        except RuntimeError:
+            return
+        for name in _CATEGORY_ATTRS:
+            self._add_listener(browser, name, self._invalidate_browser_caches)
+    
+    def _invalidate_browser_caches(self):
+        """Drop the browser tree, URI index and attribute caches after a library change"""
+        self._browser_tree_cache = {}
+        self._child_index_cache = {}
+        self._browser_attrs = None
+        self._uri_index_stale = True
+    
+    def _invalidate_info_caches(self):
+        """Drop cached info; readers still holding the old dict only write into the orphan"""
+        self._info_cache = {}
+    
+    def _invalidate_track_structure(self):
+        """Tracks, clips or devices were added or removed, so rewatch on the next query"""
+        self._info_cache = {}
+        self._watched_tracks = set()
+        self._tracks = None
+        
+        # Forget listeners on objects Live has deleted since, they went with them
+        self._listeners = [entry for entry in self._listeners if _liveobj_valid(entry[0])]
+    
+    def _get_tracks(self):
+        """Return the song's tracks, reusing the list until the track structure changes"""
+        tracks = self._tracks
+        if tracks is None:
+            tracks = self._tracks = self._song.tracks
+        return tracks
+    
+    def _track_names_lower(self):
+        """Return the lowercased track names, computed once until the info caches are dropped
+        
+        Every write task drops the info caches when it ends, so arrangement helpers
+        called many times within one task share a single pass over the track names.
+        """
+        cache = self._info_cache
+        names = cache.get("track_names_lower")
+        if names is None:
+            names = cache["track_names_lower"] = [track.name.lower() for track in self._get_tracks()]
+        return names
+    
+    def _filled_slot_indices(self):
+        """Return the indices of the clip slots holding a clip, per track, cached like _track_names_lower"""
+        cache = self._info_cache
+        filled_slots = cache.get("filled_slots")
+        if filled_slots is None:
+            filled_slots = cache["filled_slots"] = [
+                [j for j, slot in enumerate(track.clip_slots) if slot.has_clip]
+                for track in self._get_tracks()
+            ]
+        return filled_slots
+    
+    def _filter_parameters(self, track_index):
+        """Return the first filter-like parameter of each device on a track, cached like _track_names_lower"""
+        cache = self._info_cache
+        key = ("filter_parameters", track_index)
+        parameters = cache.get(key)
+        if parameters is None:
+            parameters = []
+            for device in self._get_tracks()[track_index].devices:
+                for parameter in device.parameters:
+                    name = parameter.name.lower()
+                    if "cutoff" in name or "freq" in name or "filter" in name:
+                        parameters.append(parameter)
+                        break
+            cache[key] = parameters
+        return parameters
+    
+    def _cue_index(self):
+        """Return the cue points by time rounded to 3 decimals, cached like _track_names_lower
+        
+        Handlers that add, delete or move a cue point drop the index from the info cache.
+        """
+        cache = self._info_cache
+        index = cache.get("cue_index")
+        if index is None:
+            # Build from the end so the first cue point at a time wins, as a scan would
+            index = cache["cue_index"] = {
+                round(cue_point.time, 3): cue_point for cue_point in reversed(tuple(self._song.cue_points))
+            }
+        return index
+    
+    def _energy_parameters(self):
+        """Return what energy automation drives on each track, cached like _track_names_lower
+        
+        Each entry is (frequency parameters, volume, volume min, volume range), where
+        the frequency parameters are the first freq/cutoff parameter of every device with
+        "eq" or "filter" in its name, as (parameter, min, range).
+        """
+        cache = self._info_cache
+        targets = cache.get("energy_parameters")
+        if targets is None:
+            targets = []
+            for track in self._get_tracks():
+                frequency_params = []
+                for device in track.devices:
+                    # Try to find a filter or EQ type device
+                    device_name = device.name.lower()
+                    if "eq" not in device_name and "filter" not in device_name:
+                        continue
+                    # Find a frequency parameter to automate
+                    for param in device.parameters:
+                        param_name = param.name.lower()
+                        if "freq" in param_name or "cutoff" in param_name:
+                            param_min = param.min
+                            frequency_params.append((param, param_min, param.max - param_min))
+                            break
+                vol_param = track.mixer_device.volume
+                vol_min = vol_param.min
+                targets.append((frequency_params, vol_param, vol_min, vol_param.max - vol_min))
+            cache["energy_parameters"] = targets
+        return targets
+    
+    def _song_has(self, name):
+        """Return whether the Song has an attribute, probed once per name
+        
+        Names starting with "view." are looked up on the Song's view.
+        """
+        has = self._song_features.get(name)
+        if has is None:
+            if name.startswith("view."):
+                has = hasattr(self._song_view, name[5:])
+            else:
+                has = hasattr(self._song, name)
+            self._song_features[name] = has
+        return has
+    
+    def _main_view_name(self, fragment):
+        """Return the name of the main view containing fragment, or "" if none does, scanned once"""
+        name = self._main_view_names.get(fragment)
+        if name is None:
+            name = self._main_view_names[fragment] = next(
+                (view_name for view_name in self._song_view.available_main_views()
+                 if fragment in view_name.lower()), "")
+        return name
+    
+    def _get_browser(self):
+        """Return Live's browser, looked up on first use"""
+        browser = self._browser
+        if browser is None:
+            # Access the application's browser instance instead of creating a new one
+            app = self.application()
+            if not app:
+                raise RuntimeError("Could not access Live application")
+            browser = getattr(app, 'browser', None)
+            if browser is None:
+                raise RuntimeError("Browser is not available in the Live application")
+            self._browser = browser
+        return browser
+    
+    def _get_track(self, track_index):
+        """Return the track at track_index, raising IndexError if there is none"""
+        tracks = self._get_tracks()
+        if not 0 <= track_index < len(tracks):
+            raise IndexError("Track index out of range")
+        return tracks[track_index]
+    
+    def _get_clip_slot(self, track, clip_index):
+        """Return the clip slot at clip_index on track, raising IndexError if there is none"""
+        slots = track.clip_slots
+        if not 0 <= clip_index < len(slots):
+            raise IndexError("Clip index out of range")
+        return slots[clip_index]
+    
+    # Command implementations
+    
+    def _get_session_info(self):
+        """Get information about the current session"""
+        cache = self._info_cache
+        cached = cache.get("session")
+        if cached is not None:
+            return cached
+        
+        try:
+            song = self._song
+            mixer = song.master_track.mixer_device
+            result = {
+                "tempo": song.tempo,
+                "signature_numerator": song.signature_numerator,
+                "signature_denominator": song.signature_denominator,
+                "track_count": len(self._get_tracks()),
+                "return_track_count": len(song.return_tracks),
+                "master_track": {
+                    "name": "Master",
+                    "volume": mixer.volume.value,
+                    "panning": mixer.panning.value
+                }
+            }
+            cache["session"] = result
+            return result
+        except Exception as e:
+            self.log_message("Error getting session info: " + str(e))
+            raise
+    
+    def _get_track_info(self, track_index, format="full"):
+        """Get information about a track
+        
+        format="compact" replaces clip_slots with a base64 has-clip bitmap
+        (bit i of byte i // 8 is slot i) and a list of only the filled slots.
+        """
+        if format not in ("full", "compact"):
+            raise ValueError("Unknown track info format: " + str(format))
+        
+        cache_key = track_index if format == "full" else (track_index, format)
+        cache = self._info_cache
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            tracks = self._get_tracks()
+            if track_index < 0 or track_index >= len(tracks):
+                raise IndexError("Track index out of range")
+            
+            track = tracks[track_index]
+            mixer = track.mixer_device
+            
+            # Get devices
+            get_device_type = self._get_device_type
+            devices = [
+                {
+                    "index": device_index,
+                    "name": device.name,
+                    "class_name": device.class_name,
+                    "type": get_device_type(device)
+                }
+                for device_index, device in enumerate(track.devices)
+            ]
+            
+            if format == "compact":
+                slots = track.clip_slots
+                bitmap = bytearray((len(slots) + 7) // 8)
+                clips = []
+                for slot_index, slot in enumerate(slots):
+                    if slot.has_clip:
+                        bitmap[slot_index >> 3] |= 1 << (slot_index & 7)
+                        clip = slot.clip
+                        clips.append({
+                            "i": slot_index,
+                            "n": clip.name,
+                            "l": clip.length,
+                            # bit 0: playing, bit 1: recording
+                            "p": int(clip.is_playing) | int(clip.is_recording) << 1
+                        })
+                slot_fields = {
+                    "slot_count": len(slots),
+                    "has_clip_bitmap": base64.b64encode(bytes(bitmap)).decode("ascii"),
+                    "clips": clips
+                }
+            else:
+                # Get clip slots; the inner loop binds has_clip so it is read once per slot
+                slot_fields = {
+                    "clip_slots": [
+                        {
+                            "index": slot_index,
+                            "has_clip": has_clip,
+                            "clip": _clip_summary(slot.clip) if has_clip else None
+                        }
+                        for slot_index, slot in enumerate(track.clip_slots)
+                        for has_clip in (slot.has_clip,)
+                    ]
+                }
+            
+            result = {
+                "index": track_index,
+                "name": track.name,
+                "is_audio_track": track.has_audio_input,
+                "is_midi_track": track.has_midi_input,
+                "mute": track.mute,
+                "solo": track.solo,
+                "arm": track.arm,
+                "volume": mixer.volume.value,
+                "panning": mixer.panning.value,
+                **slot_fields,
+                "devices": devices
             }
+            
+            if track_index not in self._watched_tracks:
+                # Listeners have to be added from the main thread
+                self._main_thread_tasks.append(functools.partial(self._watch_track, track_index))
+            else:
+                cache[cache_key] = result
             return result
         except Exception as e:
-            self.log_message("Error creating clip: " + str(e))
+            self.log_message("Error getting track info: " + str(e))
             raise
     
+    @_logged("creating MIDI track")
+    def _create_midi_track(self, index):
+        """Create a new MIDI track at the specified index"""
+        # Create the track
+        self._song.create_midi_track(index)
+        
+        # Get the new track
+        tracks = self._song.tracks
+        new_track_index = len(tracks) - 1 if index == -1 else index
+        new_track = tracks[new_track_index]
+        
+        result = {
+            "index": new_track_index,
+            "name": new_track.name
+        }
+        return result
+    
+    
+    @_logged("setting track name")
+    def _set_track_name(self, track_index, name):
+        """Set the name of a track"""
+        # Set the name
+        track = self._get_track(track_index)
+        track.name = name
+        
+        result = {
+            "name": track.name
+        }
+        return result
+    
+    @_logged("creating clip")
+    def _create_clip(self, track_index, clip_index, length):
+        """Create a new MIDI clip in the specified track and clip slot"""
+        track = self._get_track(track_index)
+        
+        clip_slot = self._get_clip_slot(track, clip_index)
+        
+        # Check if the clip slot already has a clip
+        if clip_slot.has_clip:
+            raise Exception("Clip slot already has a clip")
+        
+        # Create the clip
+        clip_slot.create_clip(length)
+        clip = clip_slot.clip
+        
+        result = {
+            "name": clip.name,
+            "length": clip.length
+        }
+        return result
+    
+    @_logged("adding notes to clip")
     def _add_notes_to_clip(self, track_index, clip_index, notes):
         """Add MIDI notes to a clip
         
         If clip_index is a number, we treat it as a session view clip index
         If clip_index is a string starting with 'arrangement:', we treat the rest as arrangement clip start time
+        Notes are dicts, or [pitch, start_time, duration, velocity, mute] lists
         """
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
+        track = self._get_track(track_index)
+        clip = None
+        
+        # Determine if this is a session or arrangement clip
+        is_arrangement = False
+        arrangement_time = 0
+        
+        if isinstance(clip_index, str) and clip_index.startswith("arrangement:"):
+            # This is an arrangement clip reference
+            is_arrangement = True
+            try:
+                arrangement_time = float(clip_index.split(":")[1])
+            except (ValueError, IndexError):
+                raise ValueError("Invalid arrangement time format. Use 'arrangement:time'")
             
-            track = self._song.tracks[track_index]
-            clip = None
+            self._log_verbose("Looking for clip at arrangement time {0}", arrangement_time)
             
-            # Determine if this is a session or arrangement clip
-            is_arrangement = False
-            arrangement_time = 0
+            # Find the clip at this position in the arrangement
+            found_clip = None
+            
+            # Safely get arrangement clips
+            if not hasattr(track, 'arrangement_clips'):
+                self.log_message("Track doesn't have arrangement_clips property")
+                raise Exception("Track doesn't support arrangement clips")
             
-            if isinstance(clip_index, str) and clip_index.startswith("arrangement:"):
-                # This is an arrangement clip reference
-                is_arrangement = True
+            # Log how many arrangement clips we found
+            clip_count = len(track.arrangement_clips)
+            self._log_verbose("Found {0} arrangement clips on track", clip_count)
+            
+            for arr_clip in track.arrangement_clips:
+                # Log clip information for debugging
+                self._log_verbose("Checking clip: {0.name}", arr_clip)
+                
+                # Handle different ways clips might store start/end times - FIXED VERSION
+                clip_start = None
+                clip_end = None
+                
+                # More careful extraction of start time
+                try:
+                    if hasattr(arr_clip, 'start_time'):
+                        # Direct access to start_time property
+                        clip_start = arr_clip.start_time
+                        self._log_verbose("Got start_time directly: {0}", clip_start)
+                    elif hasattr(arr_clip, 'start_marker'):
+                        # Check if start_marker is a float directly
+                        if isinstance(arr_clip.start_marker, (int, float)):
+                            clip_start = float(arr_clip.start_marker)
+                            self._log_verbose("Start marker is a float/int: {0}", clip_start)
+                        # Check if start_marker has a time attribute
+                        elif hasattr(arr_clip.start_marker, 'time'):
+                            clip_start = arr_clip.start_marker.time
+                            self._log_verbose("Got start time from marker: {0}", clip_start)
+                        # Try direct conversion as a fallback
+                        else:
+                            try:
+                                clip_start = float(arr_clip.start_marker)
+                                self._log_verbose("Converted start marker to float: {0}", clip_start)
+                            except (TypeError, ValueError):
+                                self._log_verbose("Couldn't determine clip start time")
+                except Exception as e:
+                    self.log_message(f"Error getting clip start time: {str(e)}")
+                
+                # More careful extraction of end time
                 try:
-                    arrangement_time = float(clip_index.split(":")[1])
-                except (ValueError, IndexError):
-                    raise ValueError("Invalid arrangement time format. Use 'arrangement:time'")
+                    if hasattr(arr_clip, 'end_time'):
+                        # Direct access to end_time property
+                        clip_end = arr_clip.end_time
+                        self._log_verbose("Got end_time directly: {0}", clip_end)
+                    elif hasattr(arr_clip, 'end_marker'):
+                        # Check if end_marker is a float directly
+                        if isinstance(arr_clip.end_marker, (int, float)):
+                            clip_end = float(arr_clip.end_marker)
+                            self._log_verbose("End marker is a float/int: {0}", clip_end)
+                        # Check if end_marker has a time attribute
+                        elif hasattr(arr_clip.end_marker, 'time'):
+                            clip_end = arr_clip.end_marker.time
+                            self._log_verbose("Got end time from marker: {0}", clip_end)
+                        # Try direct conversion as a fallback
+                        else:
+                            try:
+                                clip_end = float(arr_clip.end_marker)
+                                self._log_verbose("Converted end marker to float: {0}", clip_end)
+                            except (TypeError, ValueError):
+                                self._log_verbose("Couldn't determine clip end time")
+                    # Calculate from start + length if we have those
+                    elif clip_start is not None and hasattr(arr_clip, 'length'):
+                        clip_end = clip_start + arr_clip.length
+                        self._log_verbose("Calculated end time from start+length: {0}", clip_end)
+                except Exception as e:
+                    self.log_message(f"Error getting clip end time: {str(e)}")
                 
-                self.log_message(f"Looking for clip at arrangement time {arrangement_time}")
+                # Skip if we couldn't determine times
+                if clip_start is None:
+                    self._log_verbose("Couldn't determine clip start time, skipping")
+                    continue
                 
-                # Find the clip at this position in the arrangement
-                found_clip = None
+                # If we have a start time but no end time, try to estimate it
+                if clip_end is None and hasattr(arr_clip, 'length'):
+                    clip_end = clip_start + arr_clip.length
+                    self._log_verbose("Estimated end time from length: {0}", clip_end)
+                elif clip_end is None:
+                    # Default to start time + 4 beats if all else fails
+                    clip_end = clip_start + 4.0
+                    self._log_verbose("Using default end time: {0}", clip_end)
                 
-                # Safely get arrangement clips
-                if not hasattr(track, 'arrangement_clips'):
-                    self.log_message("Track doesn't have arrangement_clips property")
-                    raise Exception("Track doesn't support arrangement clips")
+                # Log what we found
+                self._log_verbose("Clip time range: {0} to {1}", clip_start, clip_end)
                 
-                # Log how many arrangement clips we found
-                clip_count = len(track.arrangement_clips)
-                self.log_message(f"Found {clip_count} arrangement clips on track")
+                # If time is within clip bounds or very close to start (within 0.1 beats)
+                if (clip_start <= arrangement_time <= clip_end) or abs(clip_start - arrangement_time) < 0.1:
+                    found_clip = arr_clip
+                    self._log_verbose("Found clip at time {0}", arrangement_time)
+                    break
+            
+            if found_clip is None:
+                # If we didn't find a clip at the exact time, try to find the closest one
+                self._log_verbose("Exact clip not found, looking for closest clip")
+                closest_clip = None
+                min_distance = float('inf')
                 
                 for arr_clip in track.arrangement_clips:
-                    # Log clip information for debugging
-                    self.log_message(f"Checking clip: {arr_clip.name if hasattr(arr_clip, 'name') else 'Unnamed clip'}")
-                    
-                    # Handle different ways clips might store start/end times - FIXED VERSION
+                    # Get start time using same careful approach as above
                     clip_start = None
-                    clip_end = None
-                    
-                    # More careful extraction of start time
                     try:
                         if hasattr(arr_clip, 'start_time'):
-                            # Direct access to start_time property
                             clip_start = arr_clip.start_time
-                            self.log_message(f"Got start_time directly: {clip_start}")
                         elif hasattr(arr_clip, 'start_marker'):
-                            # Check if start_marker is a float directly
                             if isinstance(arr_clip.start_marker, (int, float)):
                                 clip_start = float(arr_clip.start_marker)
-                                self.log_message(f"Start marker is a float/int: {clip_start}")
-                            # Check if start_marker has a time attribute
                             elif hasattr(arr_clip.start_marker, 'time'):
                                 clip_start = arr_clip.start_marker.time
-                                self.log_message(f"Got start time from marker: {clip_start}")
-                            # Try direct conversion as a fallback
-                            else:
-                                try:
-                                    clip_start = float(arr_clip.start_marker)
-                                    self.log_message(f"Converted start marker to float: {clip_start}")
-                                except (TypeError, ValueError):
-                                    self.log_message(f"Couldn't determine clip start time")
-                    except Exception as e:
-                        self.log_message(f"Error getting clip start time: {str(e)}")
-                    
-                    # More careful extraction of end time
-                    try:
-                        if hasattr(arr_clip, 'end_time'):
-                            # Direct access to end_time property
-                            clip_end = arr_clip.end_time
-                            self.log_message(f"Got end_time directly: {clip_end}")
-                        elif hasattr(arr_clip, 'end_marker'):
-                            # Check if end_marker is a float directly
-                            if isinstance(arr_clip.end_marker, (int, float)):
-                                clip_end = float(arr_clip.end_marker)
-                                self.log_message(f"End marker is a float/int: {clip_end}")
-                            # Check if end_marker has a time attribute
-                            elif hasattr(arr_clip.end_marker, 'time'):
-                                clip_end = arr_clip.end_marker.time
-                                self.log_message(f"Got end time from marker: {clip_end}")
-                            # Try direct conversion as a fallback
-                            else:
-                                try:
-                                    clip_end = float(arr_clip.end_marker)
-                                    self.log_message(f"Converted end marker to float: {clip_end}")
-                                except (TypeError, ValueError):
-                                    self.log_message(f"Couldn't determine clip end time")
-                        # Calculate from start + length if we have those
-                        elif clip_start is not None and hasattr(arr_clip, 'length'):
-                            clip_end = clip_start + arr_clip.length
-                            self.log_message(f"Calculated end time from start+length: {clip_end}")
-                    except Exception as e:
-                        self.log_message(f"Error getting clip end time: {str(e)}")
+                    except Exception:
+                        pass
                     
-                    # Skip if we couldn't determine times
                     if clip_start is None:
-                        self.log_message("Couldn't determine clip start time, skipping")
                         continue
-                    
-                    # If we have a start time but no end time, try to estimate it
-                    if clip_end is None and hasattr(arr_clip, 'length'):
-                        clip_end = clip_start + arr_clip.length
-                        self.log_message(f"Estimated end time from length: {clip_end}")
-                    elif clip_end is None:
-                        # Default to start time + 4 beats if all else fails
-                        clip_end = clip_start + 4.0
-                        self.log_message(f"Using default end time: {clip_end}")
-                    
-                    # Log what we found
-                    self.log_message(f"Clip time range: {clip_start} to {clip_end}")
-                    
-                    # If time is within clip bounds or very close to start (within 0.1 beats)
-                    if (clip_start <= arrangement_time <= clip_end) or abs(clip_start - arrangement_time) < 0.1:
-                        found_clip = arr_clip
-                        self.log_message(f"Found clip at time {arrangement_time}")
-                        break
-                
-                if found_clip is None:
-                    # If we didn't find a clip at the exact time, try to find the closest one
-                    self.log_message("Exact clip not found, looking for closest clip")
-                    closest_clip = None
-                    min_distance = float('inf')
-                    
-                    for arr_clip in track.arrangement_clips:
-                        # Get start time using same careful approach as above
-                        clip_start = None
-                        try:
-                            if hasattr(arr_clip, 'start_time'):
-                                clip_start = arr_clip.start_time
-                            elif hasattr(arr_clip, 'start_marker'):
-                                if isinstance(arr_clip.start_marker, (int, float)):
-                                    clip_start = float(arr_clip.start_marker)
-                                elif hasattr(arr_clip.start_marker, 'time'):
-                                    clip_start = arr_clip.start_marker.time
-                        except Exception:
-                            pass
                         
-                        if clip_start is None:
-                            continue
-                            
-                        distance = abs(clip_start - arrangement_time)
-                        if distance < min_distance:
-                            min_distance = distance
-                            closest_clip = arr_clip
-                    
-                    if closest_clip is not None and min_distance < 2.0:  # Accept clips within 2 beats
-                        found_clip = closest_clip
-                        self.log_message(f"Found closest clip at distance {min_distance}")
-                
-                if found_clip is None:
-                    self.log_message(f"No clip found at or near arrangement time {arrangement_time}")
-                    raise Exception(f"No clip found at arrangement time {arrangement_time}")
-                
-                clip = found_clip
-                self.log_message(f"Using arrangement clip: {clip.name if hasattr(clip, 'name') else 'Unnamed'}")
-            else:
-                # This is a session clip reference
-                if clip_index < 0 or clip_index >= len(track.clip_slots):
-                    raise IndexError("Clip index out of range")
+                    distance = abs(clip_start - arrangement_time)
+                    if distance < min_distance:
+                        min_distance = distance
+                        closest_clip = arr_clip
                 
-                clip_slot = track.clip_slots[clip_index]
-                
-                if not clip_slot.has_clip:
-                    raise Exception("No clip in slot")
-                
-                clip = clip_slot.clip
+                if closest_clip is not None and min_distance < 2.0:  # Accept clips within 2 beats
+                    found_clip = closest_clip
+                    self._log_verbose("Found closest clip at distance {0}", min_distance)
             
-            if not clip:
-                raise Exception("Clip not found")
-                
-            # Check if this is a MIDI clip
-            if hasattr(clip, 'is_audio_clip') and clip.is_audio_clip:
-                raise Exception("Cannot add MIDI notes to an audio clip")
-            
-            # Calculate the required length for all notes
-            max_note_end_time = 0
-            for note in notes:
-                note_start = note.get("start_time", 0.0)
-                note_duration = note.get("duration", 0.25)
-                note_end = note_start + note_duration
-                max_note_end_time = max(max_note_end_time, note_end)
-            
-            # Check if clip needs to be extended (for arrangement clips)
-            if is_arrangement and max_note_end_time > 0:
-                current_length = 0
-                if hasattr(clip, 'length'):
-                    current_length = clip.length
-                
-                self.log_message(f"Current clip length: {current_length}, required length: {max_note_end_time}")
-                
-                # If notes extend beyond current clip length, resize the clip
-                if max_note_end_time > current_length:
-                    try:
-                        # Try different ways to resize the clip
-                        if hasattr(clip, 'end_marker'):
-                            # Get start time
-                            clip_start = 0
-                            try:
-                                if hasattr(clip, 'start_time'):
-                                    clip_start = clip.start_time
-                                elif hasattr(clip, 'start_marker'):
-                                    if isinstance(clip.start_marker, (int, float)):
-                                        clip_start = float(clip.start_marker)
-                                    elif hasattr(clip.start_marker, 'time'):
-                                        clip_start = clip.start_marker.time
-                            except Exception:
-                                self.log_message("Couldn't determine clip start time for resize")
-                            
-                            # Set new end marker
-                            new_end_time = clip_start + max_note_end_time
-                            
-                            # Handle different types of end markers
-                            if isinstance(clip.end_marker, (int, float)):
-                                clip.end_marker = float(new_end_time)
-                                self.log_message(f"Set end marker as float to {new_end_time}")
-                            elif hasattr(clip.end_marker, 'time'):
-                                clip.end_marker.time = new_end_time
-                                self.log_message(f"Set end marker time to {new_end_time}")
-                            else:
-                                try:
-                                    # Try direct assignment
-                                    clip.end_marker = new_end_time
-                                    self.log_message(f"Set end marker directly to {new_end_time}")
-                                except Exception as e:
-                                    self.log_message(f"Error setting end marker: {str(e)}")
-                        elif hasattr(clip, 'loop') and hasattr(clip.loop, 'end_time'):
-                            # Some versions might use loop.end_time
-                            clip.loop.end_time = max_note_end_time
-                            self.log_message(f"Set loop end time to {max_note_end_time}")
-                        elif hasattr(clip, 'loop_end'):
-                            # Direct loop_end property
-                            clip.loop_end = max_note_end_time
-                            self.log_message(f"Set loop_end to {max_note_end_time}")
-                        
-                        # Check if we successfully extended the clip
-                        if hasattr(clip, 'length'):
-                            self.log_message(f"New clip length after extension: {clip.length}")
-                    except Exception as resize_error:
-                        self.log_message(f"Error resizing clip: {str(resize_error)}")
-            
-            # Convert note data to Live's format and add notes
-            if hasattr(clip, 'add_new_notes') and not is_arrangement:
-                # Live 11+ method for session clips
-                note_specs = []
-                for note in notes:
-                    pitch = note.get("pitch", 60)
-                    start_time = note.get("start_time", 0.0)
-                    duration = note.get("duration", 0.25)
-                    velocity = note.get("velocity", 100)
-                    mute = note.get("mute", False)
-                    
-                    note_spec = {
-                        "pitch": pitch,
-                        "start_time": start_time,
-                        "duration": duration,
-                        "velocity": velocity,
-                        "mute": mute
-                    }
-                    note_specs.append(note_spec)
-                
-                clip.add_new_notes(note_specs)
-                self.log_message(f"Added {len(note_specs)} notes using add_new_notes")
-            else:
-                # For arrangement clips or older Live versions
-                live_notes = []
-                for note in notes:
-                    pitch = note.get("pitch", 60)
-                    start_time = note.get("start_time", 0.0)
-                    duration = note.get("duration", 0.25)
-                    velocity = note.get("velocity", 100)
-                    mute = note.get("mute", False)
-                    
-                    live_notes.append((pitch, start_time, duration, velocity, mute))
-                
-                # Get existing notes
-                existing_notes = []
-                try:
-                    if hasattr(clip, 'get_notes'):
-                        # Get notes from 0 to end of clip across all pitches
-                        clip_length = clip.length if hasattr(clip, 'length') else max_note_end_time
-                        existing_notes = clip.get_notes(0, 0, clip_length, 128)
-                except Exception as e:
-                    self.log_message(f"Error getting existing notes: {str(e)}")
-                
-                # Combine with new notes
-                combined_notes = list(existing_notes) + live_notes
-                
-                # Replace all notes
+            if found_clip is None:
+                self.log_message(f"No clip found at or near arrangement time {arrangement_time}")
+                raise Exception(f"No clip found at arrangement time {arrangement_time}")
+            
+            clip = found_clip
+            self._log_verbose("Using arrangement clip: {0.name}", clip)
+        else:
+            # This is a session clip reference
+            clip_slot = self._get_clip_slot(track, clip_index)
+            
+            if not clip_slot.has_clip:
+                return _NO_CLIP
+            
+            clip = clip_slot.clip
+        
+        if not clip:
+            raise Exception("Clip not found")
+            
+        # Check if this is a MIDI clip
+        if hasattr(clip, 'is_audio_clip') and clip.is_audio_clip:
+            raise Exception("Cannot add MIDI notes to an audio clip")
+        
+        # Convert once to the form this clip takes, then calculate the
+        # required length for all notes
+        if hasattr(clip, 'add_new_notes'):
+            note_specs = _to_note_specs(notes)
+            max_note_end_time = max(0, max(
+                (note["start_time"] + note["duration"] for note in note_specs), default=0))
+        else:
+            live_notes = _to_note_tuples(notes)
+            max_note_end_time = max(0, max((note[1] + note[2] for note in live_notes), default=0))
+        
+        # Check if clip needs to be extended (for arrangement clips)
+        if is_arrangement and max_note_end_time > 0:
+            current_length = 0
+            if hasattr(clip, 'length'):
+                current_length = clip.length
+            
+            self.log_message(f"Current clip length: {current_length}, required length: {max_note_end_time}")
+            
+            # If notes extend beyond current clip length, resize the clip
+            if max_note_end_time > current_length:
                 try:
-                    clip.set_notes(tuple(combined_notes))
-                    self.log_message(f"Added {len(live_notes)} notes using set_notes")
-                    
-                    # Check final clip length after adding notes
-                    if hasattr(clip, 'length'):
-                        self.log_message(f"Final clip length after adding notes: {clip.length}")
+                    # Try different ways to resize the clip
+                    if hasattr(clip, 'end_marker'):
+                        # Get start time
+                        clip_start = 0
+                        try:
+                            if hasattr(clip, 'start_time'):
+                                clip_start = clip.start_time
+                            elif hasattr(clip, 'start_marker'):
+                                if isinstance(clip.start_marker, (int, float)):
+                                    clip_start = float(clip.start_marker)
+                                elif hasattr(clip.start_marker, 'time'):
+                                    clip_start = clip.start_marker.time
+                        except Exception:
+                            self.log_message("Couldn't determine clip start time for resize")
                         
-                        # If the clip still isn't long enough, make one more attempt to extend it
-                        if is_arrangement and clip.length < max_note_end_time:
+                        # Set new end marker
+                        new_end_time = clip_start + max_note_end_time
+                        
+                        # Handle different types of end markers
+                        if isinstance(clip.end_marker, (int, float)):
+                            clip.end_marker = float(new_end_time)
+                            self.log_message(f"Set end marker as float to {new_end_time}")
+                        elif hasattr(clip.end_marker, 'time'):
+                            clip.end_marker.time = new_end_time
+                            self.log_message(f"Set end marker time to {new_end_time}")
+                        else:
                             try:
-                                # Create a clear endpoint note to force clip extension
-                                dummy_note = (60, max_note_end_time - 0.01, 0.01, 1, False)
-                                clip.set_notes(tuple(combined_notes + [dummy_note]))
-                                self.log_message(f"Added dummy note to extend clip to {max_note_end_time}")
+                                # Try direct assignment
+                                clip.end_marker = new_end_time
+                                self.log_message(f"Set end marker directly to {new_end_time}")
                             except Exception as e:
-                                self.log_message(f"Error adding dummy note: {str(e)}")
+                                self.log_message(f"Error setting end marker: {str(e)}")
+                    elif hasattr(clip, 'loop') and hasattr(clip.loop, 'end_time'):
+                        # Some versions might use loop.end_time
+                        clip.loop.end_time = max_note_end_time
+                        self.log_message(f"Set loop end time to {max_note_end_time}")
+                    elif hasattr(clip, 'loop_end'):
+                        # Direct loop_end property
+                        clip.loop_end = max_note_end_time
+                        self.log_message(f"Set loop_end to {max_note_end_time}")
+                    
+                    # Check if we successfully extended the clip
+                    if hasattr(clip, 'length'):
+                        self.log_message(f"New clip length after extension: {clip.length}")
+                except Exception as resize_error:
+                    self.log_message(f"Error resizing clip: {str(resize_error)}")
+        
+        # Convert note data to Live's format and add notes
+        if hasattr(clip, 'add_new_notes'):
+            # Live 11+ appends without reading back and rewriting the existing notes,
+            # for session and arrangement clips alike
+            clip.add_new_notes(note_specs)
+            self.log_message(f"Added {len(note_specs)} notes using add_new_notes")
+            
+            # If an arrangement clip still isn't long enough, add a quiet endpoint note
+            if is_arrangement and hasattr(clip, 'length') and clip.length < max_note_end_time:
+                try:
+                    clip.add_new_notes([{
+                        "pitch": 60,
+                        "start_time": max_note_end_time - 0.01,
+                        "duration": 0.01,
+                        "velocity": 1,
+                        "mute": False
+                    }])
+                    self.log_message(f"Added dummy note to extend clip to {max_note_end_time}")
                 except Exception as e:
-                    self.log_message(f"Error setting notes: {str(e)}")
-                    raise
-            
-            # Build result with safe attribute access
-            result = {"note_count": len(notes), "is_arrangement": is_arrangement}
-            
-            if hasattr(clip, 'length'):
-                result["clip_length"] = clip.length
-            
-            if hasattr(clip, 'name'):
-                result["clip_name"] = clip.name
+                    self.log_message(f"Error adding dummy note: {str(e)}")
+        else:
+            # Older Live versions have to rewrite the whole note list
+            # Get existing notes
+            existing_notes = ()
+            try:
+                if hasattr(clip, 'get_notes'):
+                    # Get notes from 0 to end of clip across all pitches
+                    clip_length = clip.length if hasattr(clip, 'length') else max_note_end_time
+                    existing_notes = clip.get_notes(0, 0, clip_length, 128)
+            except Exception as e:
+                self.log_message(f"Error getting existing notes: {str(e)}")
             
-            # Add the required length for completeness
-            result["required_length"] = max_note_end_time
+            # Combine with new notes
+            combined_notes = tuple(existing_notes) + live_notes
             
-            return result
-        except Exception as e:
-            self.log_message(f"Error adding notes to clip: {str(e)}")
-            self.log_message(traceback.format_exc())
-            raise
+            # Replace all notes
+            try:
+                clip.set_notes(combined_notes)
+                self.log_message(f"Added {len(live_notes)} notes using set_notes")
+                
+                # Check final clip length after adding notes
+                if hasattr(clip, 'length'):
+                    self.log_message(f"Final clip length after adding notes: {clip.length}")
+                    
+                    # If the clip still isn't long enough, make one more attempt to extend it
+                    if is_arrangement and clip.length < max_note_end_time:
+                        try:
+                            # Create a clear endpoint note to force clip extension
+                            dummy_note = (60, max_note_end_time - 0.01, 0.01, 1, False)
+                            clip.set_notes(combined_notes + (dummy_note,))
+                            self.log_message(f"Added dummy note to extend clip to {max_note_end_time}")
+                        except Exception as e:
+                            self.log_message(f"Error adding dummy note: {str(e)}")
+            except Exception as e:
+                self.log_message(f"Error setting notes: {str(e)}")
+                raise
+        
+        # Build result with safe attribute access
+        result = {"note_count": len(notes), "is_arrangement": is_arrangement}
+        
+        if hasattr(clip, 'length'):
+            result["clip_length"] = clip.length
+        
+        if hasattr(clip, 'name'):
+            result["clip_name"] = clip.name
+        
+        # Add the required length for completeness
+        result["required_length"] = max_note_end_time
+        
+        return result
     
+    @_logged("setting clip name")
     def _set_clip_name(self, track_index, clip_index, name):
         """Set the name of a clip"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
-            
-            if clip_index < 0 or clip_index >= len(track.clip_slots):
-                raise IndexError("Clip index out of range")
-            
-            clip_slot = track.clip_slots[clip_index]
-            
-            if not clip_slot.has_clip:
-                raise Exception("No clip in slot")
-            
-            clip = clip_slot.clip
-            clip.name = name
-            
-            result = {
-                "name": clip.name
-            }
-            return result
-        except Exception as e:
-            self.log_message("Error setting clip name: " + str(e))
-            raise
+        track = self._get_track(track_index)
+        
+        clip_slot = self._get_clip_slot(track, clip_index)
+        
+        if not clip_slot.has_clip:
+            return _NO_CLIP
+        
+        clip = clip_slot.clip
+        clip.name = name
+        
+        result = {
+            "name": clip.name
+        }
+        return result
     
+    @_logged("setting tempo")
     def _set_tempo(self, tempo):
         """Set the tempo of the session"""
-        try:
-            self._song.tempo = tempo
-            
-            result = {
-                "tempo": self._song.tempo
-            }
-            return result
-        except Exception as e:
-            self.log_message("Error setting tempo: " + str(e))
-            raise
+        self._song.tempo = tempo
+        
+        result = {
+            "tempo": self._song.tempo
+        }
+        return result
     
+    @_logged("firing clip")
     def _fire_clip(self, track_index, clip_index):
         """Fire a clip"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
-            
-            if clip_index < 0 or clip_index >= len(track.clip_slots):
-                raise IndexError("Clip index out of range")
-            
-            clip_slot = track.clip_slots[clip_index]
-            
-            if not clip_slot.has_clip:
-                raise Exception("No clip in slot")
-            
-            clip_slot.fire()
-            
-            result = {
-                "fired": True
-            }
-            return result
-        except Exception as e:
-            self.log_message("Error firing clip: " + str(e))
-            raise
+        track = self._get_track(track_index)
+        
+        clip_slot = self._get_clip_slot(track, clip_index)
+        
+        if not clip_slot.has_clip:
+            return _NO_CLIP
+        
+        clip_slot.fire()
+        
+        result = {
+            "fired": True
+        }
+        return result
     
+    @_logged("stopping clip")
     def _stop_clip(self, track_index, clip_index):
         """Stop a clip"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
-            
-            if clip_index < 0 or clip_index >= len(track.clip_slots):
-                raise IndexError("Clip index out of range")
-            
-            clip_slot = track.clip_slots[clip_index]
-            
-            clip_slot.stop()
-            
-            result = {
-                "stopped": True
-            }
-            return result
-        except Exception as e:
-            self.log_message("Error stopping clip: " + str(e))
-            raise
+        track = self._get_track(track_index)
+        
+        clip_slot = self._get_clip_slot(track, clip_index)
+        
+        clip_slot.stop()
+        
+        result = {
+            "stopped": True
+        }
+        return result
     
     
+    @_logged("starting playback")
     def _start_playback(self):
         """Start playing the session"""
-        try:
-            self._song.start_playing()
-            
-            result = {
-                "playing": self._song.is_playing
-            }
-            return result
-        except Exception as e:
-            self.log_message("Error starting playback: " + str(e))
-            raise
+        self._song.start_playing()
+        
+        result = {
+            "playing": self._song.is_playing
+        }
+        return result
     
+    @_logged("stopping playback")
     def _stop_playback(self):
         """Stop playing the session"""
-        try:
-            self._song.stop_playing()
-            
-            result = {
-                "playing": self._song.is_playing
-            }
-            return result
-        except Exception as e:
-            self.log_message("Error stopping playback: " + str(e))
-            raise
+        self._song.stop_playing()
+        
+        result = {
+            "playing": self._song.is_playing
+        }
+        return result
     
+    @_logged("getting browser item")
     def _get_browser_item(self, uri, path):
         """Get a browser item by URI or path"""
-        try:
-            # Access the application's browser instance instead of creating a new one
-            app = self.application()
-            if not app:
-                raise RuntimeError("Could not access Live application")
-                
-            result = {
-                "uri": uri,
-                "path": path,
-                "found": False
-            }
-            
-            # Try to find by URI first if provided
-            if uri:
-                item = self._find_browser_item_by_uri(app.browser, uri)
-                if item:
-                    result["found"] = True
-                    result["item"] = {
-                        "name": item.name,
-                        "is_folder": item.is_folder,
-                        "is_device": item.is_device,
-                        "is_loadable": item.is_loadable,
-                        "uri": item.uri
-                    }
-                    return result
-            
-            # If URI not provided or not found, try by path
-            if path:
-                # Parse the path and navigate to the specified item
-                path_parts = path.split("/")
-                
-                # Determine the root based on the first part
-                current_item = None
-                if path_parts[0].lower() == "nstruments":
-                    current_item = app.browser.instruments
-                elif path_parts[0].lower() == "sounds":
-                    current_item = app.browser.sounds
-                elif path_parts[0].lower() == "drums":
-                    current_item = app.browser.drums
-                elif path_parts[0].lower() == "audio_effects":
-                    current_item = app.browser.audio_effects
-                elif path_parts[0].lower() == "midi_effects":
-                    current_item = app.browser.midi_effects
-                else:
-                    # Default to instruments if not specified
-                    current_item = app.browser.instruments
-                    # Don't skip the first part in this case
-                    path_parts = ["instruments"] + path_parts
-                
-                # Navigate through the path
-                for i in range(1, len(path_parts)):
-                    part = path_parts[i]
-                    if not part:  # Skip empty parts
-                        continue
-                    
-                    found = False
-                    for child in current_item.children:
-                        if child.name.lower() == part.lower():
-                            current_item = child
-                            found = True
-                            break
-                    
-                    if not found:
-                        result["error"] = "Path part '{0}' not found".format(part)
-                        return result
-                
-                # Found the item
+        browser = self._get_browser()
+        
+        result = {
+            "uri": uri,
+            "path": path,
+            "found": False
+        }
+        
+        # Try to find by URI first if provided
+        if uri:
+            item = self._find_browser_item_by_uri(browser, uri)
+            if item:
                 result["found"] = True
                 result["item"] = {
-                    "name": current_item.name,
-                    "is_folder": current_item.is_folder,
-                    "is_device": current_item.is_device,
-                    "is_loadable": current_item.is_loadable,
-                    "uri": current_item.uri
+                    "name": item.name,
+                    "is_folder": item.is_folder,
+                    "is_device": item.is_device,
+                    "is_loadable": item.is_loadable,
+                    "uri": item.uri
                 }
+                return result
+        
+        # If URI not provided or not found, try by path
+        if path:
+            # Parse the path, skipping empty parts, and navigate to the specified item
+            path_parts = [part for part in path.split("/") if part]
+            
+            # Determine the root based on the first part
+            getter = _CATEGORY_GETTERS.get(path_parts[0].lower()) if path_parts else None
+            if getter is not None:
+                current_item = getter(browser)
+                path_parts = path_parts[1:]
+            else:
+                # Default to instruments if not specified, without skipping the first part
+                current_item = browser.instruments
             
-            return result
-        except Exception as e:
-            self.log_message("Error getting browser item: " + str(e))
-            self.log_message(traceback.format_exc())
-            raise   
+            # Navigate through the path
+            for part in path_parts:
+                child = self._children_by_name(current_item).get(part.lower())
+                if child is None:
+                    result["error"] = "Path part '{0}' not found".format(part)
+                    return result
+                current_item = child
+            
+            # Found the item
+            result["found"] = True
+            result["item"] = {
+                "name": current_item.name,
+                "is_folder": current_item.is_folder,
+                "is_device": current_item.is_device,
+                "is_loadable": current_item.is_loadable,
+                "uri": current_item.uri
+            }
+        
+        return result
     
     
     
+    @_logged("loading browser item")
     def _load_browser_item(self, track_index, item_uri):
         """Load a browser item onto a track by its URI"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
-            
-            # Access the application's browser instance instead of creating a new one
-            app = self.application()
-            
-            # Find the browser item by URI
-            item = self._find_browser_item_by_uri(app.browser, item_uri)
-            
-            if not item:
-                raise ValueError("Browser item with URI '{0}' not found".format(item_uri))
-            
-            # Select the track
-            self._song.view.selected_track = track
-            
-            # Load the item
-            app.browser.load_item(item)
-            
-            result = {
-                "loaded": True,
-                "item_name": item.name,
-                "track_name": track.name,
-                "uri": item_uri
-            }
-            return result
-        except Exception as e:
-            self.log_message("Error loading browser item: {0}".format(str(e)))
-            self.log_message(traceback.format_exc())
-            raise
+        track = self._get_track(track_index)
+        
+        browser = self._get_browser()
+        
+        # Find the browser item by URI
+        item = self._find_browser_item_by_uri(browser, item_uri)
+        
+        if not item:
+            raise ValueError("Browser item with URI '{0}' not found".format(item_uri))
+        
+        # Select the track
+        self._song_view.selected_track = track
+        
+        # Load the item
+        browser.load_item(item)
+        
+        result = {
+            "loaded": True,
+            "item_name": item.name,
+            "track_name": track.name,
+            "uri": item_uri
+        }
+        return result
     
-    def _find_browser_item_by_uri(self, browser_or_item, uri, max_depth=10, current_depth=0):
-        """Find a browser item by its URI"""
+    def _get_browser_attrs(self, browser):
+        """Return the browser's public attribute names, computed once with dir()"""
+        browser_attrs = self._browser_attrs
+        if browser_attrs is None:
+            browser_attrs = [attr for attr in dir(browser) if not attr.startswith('_')]
+            # Log available browser attributes to help diagnose issues
+            self._log_verbose("Available browser attributes: {0}", browser_attrs)
+            self._browser_attrs = browser_attrs
+        return browser_attrs
+    
+    def _children_by_name(self, item):
+        """Return the item's children by lowercase name, the first child winning on duplicates"""
+        uri = getattr(item, 'uri', None)
+        index = self._child_index_cache.get(uri) if uri is not None else None
+        if index is None:
+            index = {}
+            for child in item.children:
+                name = getattr(child, 'name', None)
+                if name is not None:
+                    index.setdefault(name.lower(), child)
+            if uri is not None:
+                self._child_index_cache[uri] = index
+        return index
+    
+    def _find_browser_item_by_uri(self, browser_or_item, uri, max_depth=10):
+        """Find a browser item by its URI
+        
+        Items are indexed by URI as a breadth-first walk reaches them, and the walk
+        resumes where it stopped on the next lookup, so repeated lookups are dict hits.
+        """
         try:
-            # Check if this is the item we're looking for
-            if hasattr(browser_or_item, 'uri') and browser_or_item.uri == uri:
-                return browser_or_item
-            
-            # Stop recursion if we've reached max depth
-            if current_depth >= max_depth:
-                return None
-            
-            # Check if this is a browser with root categories
-            if hasattr(browser_or_item, 'instruments'):
-                # Check all main categories
-                categories = [
-                    browser_or_item.instruments,
-                    browser_or_item.sounds,
-                    browser_or_item.drums,
-                    browser_or_item.audio_effects,
-                    browser_or_item.midi_effects
-                ]
+            with self._uri_cache_lock:
+                if self._uri_cache is None or self._uri_index_stale:
+                    self._uri_index_stale = False
+                    self._reset_uri_index(browser_or_item, max_depth)
                 
-                for category in categories:
-                    item = self._find_browser_item_by_uri(category, uri, max_depth, current_depth + 1)
-                    if item:
-                        return item
+                item = self._uri_cache.get(uri)
+                if item is not None:
+                    return item
                 
-                return None
-            
-            # Check if this item has children
-            if hasattr(browser_or_item, 'children') and browser_or_item.children:
-                for child in browser_or_item.children:
-                    item = self._find_browser_item_by_uri(child, uri, max_depth, current_depth + 1)
-                    if item:
-                        return item
-            
-            return None
+                index_was_complete = not self._uri_frontier
+                item = self._advance_uri_index(uri)
+                if item is None and index_was_complete:
+                    # The browser may have changed since the index was built
+                    self._reset_uri_index(browser_or_item, max_depth)
+                    item = self._advance_uri_index(uri)
+                return item
         except Exception as e:
             self.log_message("Error finding browser item by URI: {0}".format(str(e)))
             return None
     
+    def _reset_uri_index(self, root, max_depth):
+        """Start a fresh URI index walk from root"""
+        self._uri_cache = {}
+        if max_depth > 0 and hasattr(root, 'instruments'):
+            # The browser itself, start from its main categories so the walk
+            # does not have to tell the browser apart from its items
+            self._uri_frontier = collections.deque(
+                (getter(root), 1) for getter in _CATEGORY_GETTERS.values())
+        else:
+            self._uri_frontier = collections.deque([(root, 0)])
+        self._uri_max_depth = max_depth
+    
+    def _advance_uri_index(self, uri):
+        """Continue the URI index walk until uri is reached or the browser is exhausted"""
+        cache = self._uri_cache
+        frontier = self._uri_frontier
+        max_depth = self._uri_max_depth
+        # Bind the per-item calls to locals, this loop visits every browser item
+        cache_item = cache.setdefault
+        popleft = frontier.popleft
+        extend = frontier.extend
+        
+        # Browser items normally have both uri and children, so read them
+        # directly and only pay for the exception when one is missing
+        while frontier:
+            item, depth = popleft()
+            try:
+                item_uri = item.uri
+            except AttributeError:
+                item_uri = None
+            if item_uri is not None:
+                cache_item(item_uri, item)
+            
+            if depth < max_depth:
+                try:
+                    children = item.children
+                except AttributeError:
+                    children = None
+                if children:
+                    depth += 1
+                    extend((child, depth) for child in children)
+            
+            if item_uri == uri:
+                return cache[uri]
+        
+        return None
+    
     # Helper methods
     
-    def _get_device_type(self, device):
-        """Get the type of a device"""
-        try:
-            # Simple heuristic - in a real implementation you'd look at the device class
-            if device.can_have_drum_pads:
-                return "drum_machine"
-            elif device.can_have_chains:
-                return "rack"
-            elif "instrument" in device.class_display_name.lower():
-                return "instrument"
-            elif "audio_effect" in device.class_name.lower():
-                return "audio_effect"
-            elif "midi_effect" in device.class_name.lower():
-                return "midi_effect"
-            else:
-                return "unknown"
-        except:
-            return "unknown"
+    def _get_device_type(self, device):
+        """Get the type of a device, classifying each device class only once"""
+        class_name = getattr(device, 'class_name', '')
+        device_type = self._device_type_cache.get(class_name)
+        if device_type is None:
+            device_type = self._classify_device(device)
+            self._device_type_cache[class_name] = device_type
+        return device_type
+    
+    def _classify_device(self, device):
+        """Guess the type of a device from its capabilities and class names"""
+        # Simple heuristic - in a real implementation you'd look at the device class
+        if getattr(device, 'can_have_drum_pads', False):
+            return "drum_machine"
+        if getattr(device, 'can_have_chains', False):
+            return "rack"
+        if "instrument" in getattr(device, 'class_display_name', '').lower():
+            return "instrument"
+        class_name = getattr(device, 'class_name', '').lower()
+        if "audio_effect" in class_name:
+            return "audio_effect"
+        if "midi_effect" in class_name:
+            return "midi_effect"
+        return "unknown"
     
-    def get_browser_tree(self, category_type="all"):
+    @_logged("getting browser tree")
+    def get_browser_tree(self, category_type="all", include_children=False):
         """
         Get a simplified tree of browser categories.
         
         Args:
             category_type: Type of categories to get ('all', 'instruments', 'sounds', etc.)
+            include_children: Whether to list the direct children of each category; items
+                              whose children are not listed are marked with has_more
             
         Returns:
             Dictionary with the browser tree structure
         """
-        try:
-            # Access the application's browser instance instead of creating a new one
-            app = self.application()
-            if not app:
-                raise RuntimeError("Could not access Live application")
-                
-            # Check if browser is available
-            if not hasattr(app, 'browser') or app.browser is None:
-                raise RuntimeError("Browser is not available in the Live application")
-            
-            # Log available browser attributes to help diagnose issues
-            browser_attrs = [attr for attr in dir(app.browser) if not attr.startswith('_')]
-            self.log_message("Available browser attributes: {0}".format(browser_attrs))
+        browser = self._get_browser()
+        
+        cache = self._browser_tree_cache
+        cache_key = (category_type, bool(include_children))
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        browser_attrs = self._get_browser_attrs(browser)
+        
+        result = {
+            "type": category_type,
+            "categories": [],
+            "available_categories": browser_attrs
+        }
+        
+        # Helper function to process a browser item and its children
+        def process_item(item, depth=0):
+            if not item:
+                return None
             
+            children = getattr(item, 'children', None)
             result = {
-                "type": category_type,
-                "categories": [],
-                "available_categories": browser_attrs
+                "name": getattr(item, 'name', "Unknown"),
+                "is_folder": bool(children),
+                "is_device": getattr(item, 'is_device', False),
+                "is_loadable": getattr(item, 'is_loadable', False),
+                "uri": getattr(item, 'uri', None)
             }
             
-            # Helper function to process a browser item and its children
-            def process_item(item, depth=0):
-                if not item:
-                    return None
-                
-                result = {
-                    "name": item.name if hasattr(item, 'name') else "Unknown",
-                    "is_folder": hasattr(item, 'children') and bool(item.children),
-                    "is_device": hasattr(item, 'is_device') and item.is_device,
-                    "is_loadable": hasattr(item, 'is_loadable') and item.is_loadable,
-                    "uri": item.uri if hasattr(item, 'uri') else None,
-                    "children": []
-                }
-                
-                
-                return result
-            
-            # Process based on category type and available attributes
-            if (category_type == "all" or category_type == "instruments") and hasattr(app.browser, 'instruments'):
-                try:
-                    instruments = process_item(app.browser.instruments)
-                    if instruments:
-                        instruments["name"] = "Instruments"  # Ensure consistent naming
-                        result["categories"].append(instruments)
-                except Exception as e:
-                    self.log_message("Error processing instruments: {0}".format(str(e)))
-            
-            if (category_type == "all" or category_type == "sounds") and hasattr(app.browser, 'sounds'):
-                try:
-                    sounds = process_item(app.browser.sounds)
-                    if sounds:
-                        sounds["name"] = "Sounds"  # Ensure consistent naming
-                        result["categories"].append(sounds)
-                except Exception as e:
-                    self.log_message("Error processing sounds: {0}".format(str(e)))
-            
-            if (category_type == "all" or category_type == "drums") and hasattr(app.browser, 'drums'):
-                try:
-                    drums = process_item(app.browser.drums)
-                    if drums:
-                        drums["name"] = "Drums"  # Ensure consistent naming
-                        result["categories"].append(drums)
-                except Exception as e:
-                    self.log_message("Error processing drums: {0}".format(str(e)))
-            
-            if (category_type == "all" or category_type == "audio_effects") and hasattr(app.browser, 'audio_effects'):
-                try:
-                    audio_effects = process_item(app.browser.audio_effects)
-                    if audio_effects:
-                        audio_effects["name"] = "Audio Effects"  # Ensure consistent naming
-                        result["categories"].append(audio_effects)
-                except Exception as e:
-                    self.log_message("Error processing audio_effects: {0}".format(str(e)))
-            
-            if (category_type == "all" or category_type == "midi_effects") and hasattr(app.browser, 'midi_effects'):
+            # Only walk one level below the categories, and only when asked to
+            if children and include_children and depth == 0:
+                result["children"] = [process_item(child, depth + 1) for child in children if child]
+            else:
+                result["has_more"] = bool(children)
+            return result
+        
+        # Process based on category type and available attributes
+        if (category_type == "all" or category_type == "instruments") and hasattr(browser, 'instruments'):
+            try:
+                instruments = process_item(browser.instruments)
+                if instruments:
+                    instruments["name"] = "Instruments"  # Ensure consistent naming
+                    result["categories"].append(instruments)
+            except Exception as e:
+                self.log_message("Error processing instruments: {0}".format(str(e)))
+        
+        if (category_type == "all" or category_type == "sounds") and hasattr(browser, 'sounds'):
+            try:
+                sounds = process_item(browser.sounds)
+                if sounds:
+                    sounds["name"] = "Sounds"  # Ensure consistent naming
+                    result["categories"].append(sounds)
+            except Exception as e:
+                self.log_message("Error processing sounds: {0}".format(str(e)))
+        
+        if (category_type == "all" or category_type == "drums") and hasattr(browser, 'drums'):
+            try:
+                drums = process_item(browser.drums)
+                if drums:
+                    drums["name"] = "Drums"  # Ensure consistent naming
+                    result["categories"].append(drums)
+            except Exception as e:
+                self.log_message("Error processing drums: {0}".format(str(e)))
+        
+        if (category_type == "all" or category_type == "audio_effects") and hasattr(browser, 'audio_effects'):
+            try:
+                audio_effects = process_item(browser.audio_effects)
+                if audio_effects:
+                    audio_effects["name"] = "Audio Effects"  # Ensure consistent naming
+                    result["categories"].append(audio_effects)
+            except Exception as e:
+                self.log_message("Error processing audio_effects: {0}".format(str(e)))
+        
+        if (category_type == "all" or category_type == "midi_effects") and hasattr(browser, 'midi_effects'):
+            try:
+                midi_effects = process_item(browser.midi_effects)
+                if midi_effects:
+                    midi_effects["name"] = "MIDI Effects"
+                    result["categories"].append(midi_effects)
+            except Exception as e:
+                self.log_message("Error processing midi_effects: {0}".format(str(e)))
+        
+        # Try to process other potentially available categories
+        for attr in browser_attrs:
+            if attr not in ['instruments', 'sounds', 'drums', 'audio_effects', 'midi_effects'] and \
+               (category_type == "all" or category_type == attr):
                 try:
-                    midi_effects = process_item(app.browser.midi_effects)
-                    if midi_effects:
-                        midi_effects["name"] = "MIDI Effects"
-                        result["categories"].append(midi_effects)
+                    item = getattr(browser, attr)
+                    if hasattr(item, 'children') or hasattr(item, 'name'):
+                        category = process_item(item)
+                        if category:
+                            category["name"] = attr.capitalize()
+                            result["categories"].append(category)
                 except Exception as e:
-                    self.log_message("Error processing midi_effects: {0}".format(str(e)))
-            
-            # Try to process other potentially available categories
-            for attr in browser_attrs:
-                if attr not in ['instruments', 'sounds', 'drums', 'audio_effects', 'midi_effects'] and \
-                   (category_type == "all" or category_type == attr):
-                    try:
-                        item = getattr(app.browser, attr)
-                        if hasattr(item, 'children') or hasattr(item, 'name'):
-                            category = process_item(item)
-                            if category:
-                                category["name"] = attr.capitalize()
-                                result["categories"].append(category)
-                    except Exception as e:
-                        self.log_message("Error processing {0}: {1}".format(attr, str(e)))
-            
-            self.log_message("Browser tree generated for {0} with {1} root categories".format(
-                category_type, len(result['categories'])))
-            return result
-            
-        except Exception as e:
-            self.log_message("Error getting browser tree: {0}".format(str(e)))
-            self.log_message(traceback.format_exc())
-            raise
+                    self.log_message("Error processing {0}: {1}".format(attr, str(e)))
+        
+        self._log_verbose("Browser tree generated for {0} with {1} root categories",
+                          category_type, len(result['categories']))
+        cache[cache_key] = result
+        return result
     
+    @_logged("getting browser items at path")
     def get_browser_items_at_path(self, path):
         """
         Get browser items at a specific path.
@@ -1394,230 +2214,213 @@ class AbletonMCPboost(ControlSurface):
         Returns:
             Dictionary with items at the specified path
         """
-        try:
-            # Access the application's browser instance instead of creating a new one
-            app = self.application()
-            if not app:
-                raise RuntimeError("Could not access Live application")
-                
-            # Check if browser is available
-            if not hasattr(app, 'browser') or app.browser is None:
-                raise RuntimeError("Browser is not available in the Live application")
-            
-            # Log available browser attributes to help diagnose issues
-            browser_attrs = [attr for attr in dir(app.browser) if not attr.startswith('_')]
-            self.log_message("Available browser attributes: {0}".format(browser_attrs))
-                
-            # Parse the path
-            path_parts = path.split("/")
-            if not path_parts:
-                raise ValueError("Invalid path")
-            
-            # Determine the root category
-            root_category = path_parts[0].lower()
-            current_item = None
-            
-            # Check standard categories first
-            if root_category == "instruments" and hasattr(app.browser, 'instruments'):
-                current_item = app.browser.instruments
-            elif root_category == "sounds" and hasattr(app.browser, 'sounds'):
-                current_item = app.browser.sounds
-            elif root_category == "drums" and hasattr(app.browser, 'drums'):
-                current_item = app.browser.drums
-            elif root_category == "audio_effects" and hasattr(app.browser, 'audio_effects'):
-                current_item = app.browser.audio_effects
-            elif root_category == "midi_effects" and hasattr(app.browser, 'midi_effects'):
-                current_item = app.browser.midi_effects
-            else:
-                # Try to find the category in other browser attributes
-                found = False
-                for attr in browser_attrs:
-                    if attr.lower() == root_category:
-                        try:
-                            current_item = getattr(app.browser, attr)
-                            found = True
-                            break
-                        except Exception as e:
-                            self.log_message("Error accessing browser attribute {0}: {1}".format(attr, str(e)))
-                
-                if not found:
-                    # If we still haven't found the category, return available categories
-                    return {
-                        "path": path,
-                        "error": "Unknown or unavailable category: {0}".format(root_category),
-                        "available_categories": browser_attrs,
-                        "items": []
-                    }
+        browser = self._get_browser()
+        
+        browser_attrs = self._get_browser_attrs(browser)
             
-            # Navigate through the path
-            for i in range(1, len(path_parts)):
-                part = path_parts[i]
-                if not part:  # Skip empty parts
-                    continue
-                
-                if not hasattr(current_item, 'children'):
-                    return {
-                        "path": path,
-                        "error": "Item at '{0}' has no children".format('/'.join(path_parts[:i])),
-                        "items": []
-                    }
-                
-                found = False
-                for child in current_item.children:
-                    if hasattr(child, 'name') and child.name.lower() == part.lower():
-                        current_item = child
+        # Parse the path, skipping empty parts
+        path_parts = [part for part in path.split("/") if part]
+        if not path_parts:
+            raise ValueError("Invalid path")
+        
+        # Determine the root category
+        root_category = path_parts[0].lower()
+        current_item = None
+        
+        # Check standard categories first
+        getter = _CATEGORY_GETTERS.get(root_category)
+        if getter is not None and root_category in browser_attrs:
+            current_item = getter(browser)
+        else:
+            # Try to find the category in other browser attributes
+            found = False
+            for attr in browser_attrs:
+                if attr.lower() == root_category:
+                    try:
+                        current_item = getattr(browser, attr)
                         found = True
                         break
-                
-                if not found:
-                    return {
-                        "path": path,
-                        "error": "Path part '{0}' not found".format(part),
-                        "items": []
-                    }
-            
-            # Get items at the current path
-            items = []
-            if hasattr(current_item, 'children'):
-                for child in current_item.children:
-                    item_info = {
-                        "name": child.name if hasattr(child, 'name') else "Unknown",
-                        "is_folder": hasattr(child, 'children') and bool(child.children),
-                        "is_device": hasattr(child, 'is_device') and child.is_device,
-                        "is_loadable": hasattr(child, 'is_loadable') and child.is_loadable,
-                        "uri": child.uri if hasattr(child, 'uri') else None
-                    }
-                    items.append(item_info)
-            
-            result = {
-                "path": path,
-                "name": current_item.name if hasattr(current_item, 'name') else "Unknown",
-                "uri": current_item.uri if hasattr(current_item, 'uri') else None,
-                "is_folder": hasattr(current_item, 'children') and bool(current_item.children),
-                "is_device": hasattr(current_item, 'is_device') and current_item.is_device,
-                "is_loadable": hasattr(current_item, 'is_loadable') and current_item.is_loadable,
-                "items": items
-            }
-            
-            self.log_message("Retrieved {0} items at path: {1}".format(len(items), path))
-            return result
+                    except Exception as e:
+                        self.log_message("Error accessing browser attribute {0}: {1}".format(attr, str(e)))
+            
+            if not found:
+                # If we still haven't found the category, return available categories
+                return {
+                    "path": path,
+                    "error": "Unknown or unavailable category: {0}".format(root_category),
+                    "available_categories": browser_attrs,
+                    "items": []
+                }
+        
+        # Navigate through the path
+        for i in range(1, len(path_parts)):
+            part = path_parts[i]
+            if not hasattr(current_item, 'children'):
+                return {
+                    "path": path,
+                    "error": "Item at '{0}' has no children".format('/'.join(path_parts[:i])),
+                    "items": []
+                }
             
-        except Exception as e:
-            self.log_message("Error getting browser items at path: {0}".format(str(e)))
-            self.log_message(traceback.format_exc())
-            raise
+            child = self._children_by_name(current_item).get(part.lower())
+            if child is None:
+                return {
+                    "path": path,
+                    "error": "Path part '{0}' not found".format(part),
+                    "items": []
+                }
+            current_item = child
 
-    def _has_api_feature(self, obj, attribute):
-        """Safely check if an API feature/attribute exists"""
-        try:
-            return hasattr(obj, attribute)
-        except:
-            return False
+        # Get items at the current path
+        items = []
+        children = getattr(current_item, 'children', None)
+        if children is not None:
+            for child in children:
+                item_info = {
+                    "name": getattr(child, 'name', "Unknown"),
+                    "is_folder": bool(getattr(child, 'children', None)),
+                    "is_device": getattr(child, 'is_device', False),
+                    "is_loadable": getattr(child, 'is_loadable', False),
+                    "uri": getattr(child, 'uri', None)
+                }
+                items.append(item_info)
+        
+        result = {
+            "path": path,
+            "name": getattr(current_item, 'name', "Unknown"),
+            "uri": getattr(current_item, 'uri', None),
+            "is_folder": bool(children),
+            "is_device": getattr(current_item, 'is_device', False),
+            "is_loadable": getattr(current_item, 'is_loadable', False),
+            "items": items
+        }
+        
+        self._log_verbose("Retrieved {0} items at path: {1}", len(items), path)
+        return result
 
+    @_logged("creating arrangement section")
     def _create_arrangement_section(self, section_type, length_bars, start_bar):
         """Create a section in the arrangement (intro, verse, chorus, etc.)"""
-        try:
-            self.log_message(f"Creating {section_type} section with length {length_bars} bars")
-            
-            # If start_bar is -1, we add to the end of the arrangement
-            if start_bar == -1:
-                # Get the end time of the arrangement by finding the latest clip/automation end time
-                end_time = 0
-                for track in self._song.tracks:
-                    # Check if track has arrangement_clips attribute
-                    if self._has_api_feature(track, 'arrangement_clips'):
-                        for clip in track.arrangement_clips:
-                            if self._has_api_feature(clip, 'end_time'):
-                                end_time = max(end_time, clip.end_time)
-                            elif self._has_api_feature(clip, 'end_marker') and self._has_api_feature(clip.end_marker, 'time'):
-                                end_time = max(end_time, clip.end_marker.time)
-                
-                # Convert to bars (assuming 4/4 time signature)
-                beats_per_bar = 4  # Standard 4/4 time signature
-                end_bar = int(end_time / beats_per_bar)
-                start_bar = end_bar
-            
-            # Convert bars to time
-            beats_per_bar = 4
-            start_time = start_bar * beats_per_bar
-            
-            # Make this a bit more interesting by selecting appropriate clips based on section type
-            section_tracks = {}
-            
-            # Different clip selection strategies based on section type
-            if section_type.lower() == "intro":
-                # For intro, focus on simpler elements
-                section_tracks = self._select_clips_for_section("intro")
-            elif section_type.lower() == "verse":
-                section_tracks = self._select_clips_for_section("verse")
-            elif section_type.lower() == "chorus":
-                section_tracks = self._select_clips_for_section("chorus")
-            elif section_type.lower() == "bridge":
-                section_tracks = self._select_clips_for_section("bridge")
-            elif section_type.lower() == "outro":
-                section_tracks = self._select_clips_for_section("outro")
-            else:
-                # For unrecognized sections, just use all tracks
-                section_tracks = self._select_clips_for_section("generic")
-            
-            # Now create clips in the arrangement for each track
-            for track_index, clip_indices in section_tracks.items():
-                if track_index >= len(self._song.tracks):
+        self._log_buffered(f"Creating {section_type} section with length {length_bars} bars")
+        
+        # If start_bar is -1, we add to the end of the arrangement
+        if start_bar == -1:
+            # Get the end time of the arrangement by finding the latest clip/automation end time
+            end_time = 0
+            probed_types = {}
+            for track in self._song.tracks:
+                clips = getattr(track, 'arrangement_clips', None)
+                if not clips:
+                    continue
+                # All clips of a track share a type, so probe the API once per type
+                sample = clips[0]
+                flags = probed_types.get(type(sample))
+                if flags is None:
+                    has_end_time = hasattr(sample, 'end_time')
+                    has_marker_time = (not has_end_time and hasattr(sample, 'end_marker')
+                                       and hasattr(sample.end_marker, 'time'))
+                    flags = probed_types[type(sample)] = (has_end_time, has_marker_time)
+                has_end_time, has_marker_time = flags
+                if has_end_time:
+                    end_time = max(end_time, max(clip.end_time for clip in clips))
+                elif has_marker_time:
+                    end_time = max(end_time, max(clip.end_marker.time for clip in clips))
+            
+            # Convert to bars (assuming 4/4 time signature)
+            end_bar = int(end_time / _BEATS_PER_BAR)
+            start_bar = end_bar
+        
+        # Convert bars to time
+        start_time = start_bar * _BEATS_PER_BAR
+        section_length = length_bars * _BEATS_PER_BAR
+        
+        # Select clips with the strategy for this section type, unrecognized
+        # sections use the generic one
+        kind = section_type.lower()
+        section_tracks = self._select_clips_for_section(kind if kind in _SECTION_KINDS else "generic")
+        
+        # Now create clips in the arrangement for each track
+        tracks = self._get_tracks()
+        for track_index, clip_indices in section_tracks.items():
+            if track_index >= len(tracks):
+                continue
+            self._place_section_clips(tracks[track_index], clip_indices, start_time, section_length, {})
+        
+        result = {
+            "section_type": section_type,
+            "start_position": start_bar,
+            "length_bars": length_bars
+        }
+        return result
+
+    def _place_section_clips(self, track, clip_indices, start_time, section_length, sources, strict=False):
+        """Loop the track's session clips at clip_indices to fill a section of the arrangement
+        
+        sources maps a clip index to the (length, notes, name) read from its clip, so a
+        caller filling several sections of the same track reads each source clip once.
+        A clip Live refuses to read or create is logged and skipped, unless strict is set,
+        in which case the error is raised to the caller.
+        """
+        section_end = start_time + section_length
+        slots = track.clip_slots
+        
+        for clip_index in clip_indices:
+            source = sources.get(clip_index)
+            if source is None:
+                if clip_index >= len(slots):
                     continue
                 
-                track = self._song.tracks[track_index]
+                clip_slot = slots[clip_index]
+                if not clip_slot.has_clip:
+                    continue
+                source_clip = clip_slot.clip
                 
-                for clip_index in clip_indices:
-                    if clip_index >= len(track.clip_slots) or not track.clip_slots[clip_index].has_clip:
-                        continue
-                    
-                    clip_slot = track.clip_slots[clip_index]
-                    source_clip = clip_slot.clip
-                    
-                    # Calculate how many times to loop this clip to fill the section
-                    section_length = length_bars * beats_per_bar
-                    clip_repeats = int(section_length / source_clip.length) + 1  # +1 to ensure we fill the section
-                    
-                    # For each repeat, create a copy of the clip in the arrangement
-                    for i in range(clip_repeats):
-                        # Calculate position for this repetition
-                        rep_start_time = start_time + (i * source_clip.length)
-                        
-                        # If this repetition would extend past the section, skip it
-                        if rep_start_time >= start_time + section_length:
-                            break
-                        
-                        # Create a new clip instead of using duplicate_clip_to
-                        try:
-                            new_clip = track.create_clip(rep_start_time, source_clip.length)
-                            
-                            # If it's a MIDI clip, copy the notes
-                            if hasattr(source_clip, 'get_notes') and hasattr(new_clip, 'set_notes'):
-                                notes = list(source_clip.get_notes(0, 0, source_clip.length, 127))
-                                if notes:
-                                    new_clip.set_notes(tuple(notes))
-                            
-                            # Copy clip name if possible
-                            if hasattr(source_clip, 'name') and hasattr(new_clip, 'name'):
-                                new_clip.name = source_clip.name
-                        except Exception as e:
-                            self.log_message(f"Error creating clip in arrangement: {str(e)}")
+                # Read what every copy shares from the source clip once
+                try:
+                    source_notes = None
+                    if hasattr(source_clip, 'get_notes'):
+                        source_notes = source_clip.get_notes(0, 0, source_clip.length, 127)
+                    source = sources[clip_index] = (
+                        source_clip.length, source_notes, getattr(source_clip, 'name', None))
+                except _LOM_EXC as e:
+                    if strict:
+                        raise
+                    self._log_buffered(f"Error creating clip in arrangement: {str(e)}")
+                    continue
+            source_length, source_notes, source_name = source
             
-            result = {
-                "section_type": section_type,
-                "start_position": start_bar,
-                "length_bars": length_bars
-            }
-            return result
+            # Calculate how many times to loop this clip to fill the section
+            clip_repeats = int(section_length / source_length) + 1  # +1 to ensure we fill the section
             
-        except Exception as e:
-            self.log_message(f"Error creating arrangement section: {str(e)}")
-            self.log_message(traceback.format_exc())
-            raise
+            # Positions of the repetitions that start inside the section
+            positions = [
+                rep_start_time
+                for rep_start_time in (start_time + i * source_length for i in range(clip_repeats))
+                if rep_start_time < section_end
+            ]
+            
+            # For each repeat, create a copy of the clip in the arrangement
+            try:
+                for rep_start_time in positions:
+                    # Create a new clip instead of using duplicate_clip_to
+                    new_clip = track.create_clip(rep_start_time, source_length)
+                    
+                    # If it's a MIDI clip, copy the notes
+                    if source_notes and hasattr(new_clip, 'set_notes'):
+                        new_clip.set_notes(source_notes)
+                    
+                    # Copy clip name if possible
+                    if source_name is not None and hasattr(new_clip, 'name'):
+                        new_clip.name = source_name
+            except _LOM_EXC as e:
+                if strict:
+                    raise
+                self._log_buffered(f"Error creating clip in arrangement: {str(e)}")
 
     def _select_clips_for_section(self, section_type):
         """Helper function to select appropriate clips for a section type"""
         tracks = {}
+        filled_slots = self._filled_slot_indices()
         
         # For now, implement a simple strategy based on section type
         if section_type == "intro":
@@ -1625,926 +2428,708 @@ class AbletonMCPboost(ControlSurface):
             drum_track_found = False
             bass_track_found = False
             
-            for i, track in enumerate(self._song.tracks):
+            names = self._track_names_lower()
+            for i, clips in enumerate(filled_slots):
                 # Simple heuristic to find drum and bass tracks based on name
-                if not drum_track_found and "drum" in track.name.lower():
+                if not drum_track_found and "drum" in names[i]:
                     # For drums, choose a clip that appears to be a basic pattern
-                    clips = [j for j, slot in enumerate(track.clip_slots) if slot.has_clip]
                     if clips:
                         tracks[i] = [clips[0]]  # Just use the first clip for simplicity
                         drum_track_found = True
                 
-                elif not bass_track_found and "bass" in track.name.lower():
+                elif not bass_track_found and "bass" in names[i]:
                     # For bass, choose a clip that appears to be a basic pattern
-                    clips = [j for j, slot in enumerate(track.clip_slots) if slot.has_clip]
                     if clips:
                         tracks[i] = [clips[0]]  # Just use the first clip for simplicity
                         bass_track_found = True
         
         elif section_type == "chorus":
             # For chorus, use most available tracks for a fuller sound
-            for i, track in enumerate(self._song.tracks):
-                clips = [j for j, slot in enumerate(track.clip_slots) if slot.has_clip]
+            for i, clips in enumerate(filled_slots):
                 if clips:
                     # Try to find clips that appear to be more energetic
                     # (in real implementation, this would use more sophisticated analysis)
-                    tracks[i] = [clips[-1] if len(clips) > 1 else clips[0]]
+                    tracks[i] = [clips[-1]]
         
         else:
             # Default strategy: use any available clips
-            for i, track in enumerate(self._song.tracks):
-                clips = [j for j, slot in enumerate(track.clip_slots) if slot.has_clip]
+            for i, clips in enumerate(filled_slots):
                 if clips:
                     tracks[i] = [clips[0]]  # Just use the first clip for simplicity
         
         return tracks
 
+    @_logged("duplicating section")
     def _duplicate_section(self, source_start_bar, source_end_bar, destination_bar, variation_level):
         """Duplicate a section of the arrangement with optional variations"""
-        try:
-            self.log_message(f"Duplicating section from bar {source_start_bar} to {source_end_bar}")
-            
-            # Convert bars to time
-            beats_per_bar = 4  # Standard 4/4 time signature
-            source_start_time = source_start_bar * beats_per_bar
-            source_end_time = source_end_bar * beats_per_bar
-            destination_time = destination_bar * beats_per_bar
-            
-            # Get all clips in the source range
-            section_length = source_end_time - source_start_time
-            
-            # For each track, find clips in the source range and duplicate them
-            for track in self._song.tracks:
-                # Get clips that overlap with the source range
-                for clip in track.arrangement_clips:
-                    # Check if clip overlaps with source range
-                    if clip.start_time < source_end_time and clip.end_time > source_start_time:
-                        # Calculate clip position relative to section start
-                        clip_rel_start = max(0, clip.start_time - source_start_time)
-                        
-                        # Calculate new start time in destination
-                        new_start_time = destination_time + clip_rel_start
-                        
-                        # Duplicate the clip to the new position
-                        clip.duplicate_clip_to(track, new_start_time)
-                        
-                        # If variation level > 0, apply variations to the new clip
-                        if variation_level > 0:
-                            # Find the newly created clip - it should be the last one added
-                            new_clip = None
-                            for c in track.arrangement_clips:
+        self.log_message(f"Duplicating section from bar {source_start_bar} to {source_end_bar}")
+        
+        # Convert bars to time
+        source_start_time = source_start_bar * _BEATS_PER_BAR
+        source_end_time = source_end_bar * _BEATS_PER_BAR
+        destination_time = destination_bar * _BEATS_PER_BAR
+        
+        # Get all clips in the source range
+        section_length = source_end_time - source_start_time
+        
+        # Duplicated MIDI clips to vary once everything has been copied
+        varied_clips = []
+        
+        # For each track, find clips in the source range and duplicate them
+        for track in self._song.tracks:
+            # Get clips that overlap with the source range
+            for clip in track.arrangement_clips:
+                # Check if clip overlaps with source range
+                if clip.start_time < source_end_time and clip.end_time > source_start_time:
+                    # Calculate clip position relative to section start
+                    clip_rel_start = max(0, clip.start_time - source_start_time)
+                    
+                    # Calculate new start time in destination
+                    new_start_time = destination_time + clip_rel_start
+                    
+                    # Duplicate the clip to the new position
+                    new_clip = clip.duplicate_clip_to(track, new_start_time)
+                    
+                    # If variation level > 0, apply variations to the new clip
+                    if variation_level > 0:
+                        if new_clip is None:
+                            # Older Live versions return nothing, find the newly created
+                            # clip from the end where it was added
+                            for c in reversed(track.arrangement_clips):
                                 if c.start_time == new_start_time:
                                     new_clip = c
                                     break
-                            
-                            if new_clip and new_clip.is_midi_clip:
-                                self._apply_variations(new_clip, variation_level)
-            
-            result = {
-                "source_start_bar": source_start_bar,
-                "source_end_bar": source_end_bar,
-                "destination_bar": destination_bar,
-                "variation_level": variation_level
-            }
-            return result
-            
-        except Exception as e:
-            self.log_message(f"Error duplicating section: {str(e)}")
-            self.log_message(traceback.format_exc())
-            raise
-
-    def _apply_variations(self, clip, variation_level):
-        """Apply variations to a MIDI clip based on variation level"""
-        try:
-            if not clip.is_midi_clip:
-                return
-            
-            # Get the notes from the clip
-            notes = list(clip.get_notes(0, 0, clip.length, 127))
-            
-            # Skip if no notes
-            if not notes:
-                return
-            
-            # Apply variations based on level
-            if variation_level > 0.8:
-                # High variation: significantly change pattern
-                new_notes = []
-                for note in notes:
-                    # Keep some notes, modify others, add new ones
-                    if random.random() > 0.3:  # Keep 70% of original notes
-                        # Possibly modify pitch
-                        pitch = note[0]
-                        if random.random() < 0.4:  # 40% chance to change pitch
-                            pitch = max(0, min(127, pitch + random.choice([-2, -1, 1, 2])))
-                        
-                        # Possibly modify timing
-                        start = note[1]
-                        if random.random() < 0.3:  # 30% chance to shift timing
-                            start = max(0, min(clip.length, start + random.uniform(-0.125, 0.125)))
-                        
-                        new_notes.append((pitch, start, note[2], note[3], note[4]))
-                    
-                    # 20% chance to add a new note
-                    if random.random() < 0.2:
-                        # Create a new note based on this one
-                        pitch = max(0, min(127, note[0] + random.choice([-12, -7, -5, 0, 5, 7, 12])))
-                        start = max(0, min(clip.length, note[1] + random.uniform(-0.25, 0.25)))
-                        duration = note[2]
-                        velocity = note[3]
-                        new_notes.append((pitch, start, duration, velocity, False))
-                
-                # Replace notes
-                clip.set_notes(tuple(new_notes))
-                
-            elif variation_level > 0.5:
-                # Medium variation: modify some notes, keep structure
-                new_notes = []
-                for note in notes:
-                    # 80% chance to keep note, 20% to modify
-                    if random.random() < 0.8:
-                        new_notes.append(note)
-                    else:
-                        # Modify pitch
-                        pitch = max(0, min(127, note[0] + random.choice([-1, 1])))
-                        
-                        # Modify timing slightly
-                        start = max(0, min(clip.length, note[1] + random.uniform(-0.05, 0.05)))
-                        
-                        new_notes.append((pitch, start, note[2], note[3], note[4]))
-                
-                # Replace notes
-                clip.set_notes(tuple(new_notes))
-                
-            elif variation_level > 0.2:
-                # Low variation: subtle changes
-                new_notes = []
-                for note in notes:
-                    # 90% chance to keep the same, 10% to modify velocity
-                    if random.random() < 0.9:
-                        new_notes.append(note)
-                    else:
-                        # Modify velocity slightly
-                        velocity = max(1, min(127, int(note[3] + random.uniform(-10, 10))))
                         
-                        new_notes.append((note[0], note[1], note[2], velocity, note[4]))
+                        if new_clip and new_clip.is_midi_clip:
+                            varied_clips.append(new_clip)
+        
+        if varied_clips:
+            self._apply_variations(varied_clips, variation_level)
+        
+        result = {
+            "source_start_bar": source_start_bar,
+            "source_end_bar": source_end_bar,
+            "destination_bar": destination_bar,
+            "variation_level": variation_level
+        }
+        return result
+
+    def _apply_variations(self, clips, variation_level):
+        """Apply variations to MIDI clips based on variation level"""
+        # Read every clip's notes first, so the variation pass runs without
+        # interleaved Live API calls and the results are written back together
+        jobs = []
+        for clip in clips:
+            try:
+                if not clip.is_midi_clip:
+                    continue
                 
+                # Get the notes from the clip, skipping clips without any
+                length = clip.length
+                notes = clip.get_notes(0, 0, length, 127)
+                if notes:
+                    jobs.append((clip, notes, length))
+            except _LOM_EXC as e:
+                self._log_buffered(f"Error applying variations: {str(e)}")
+        
+        # Varying notes doesn't touch Live, so any error here is a bug and is raised
+        varied = []
+        for clip, notes, length in jobs:
+            new_notes = _vary_notes(notes, variation_level, length)
+            if new_notes is not None:
+                varied.append((clip, new_notes))
+        
+        for clip, new_notes in varied:
+            try:
                 # Replace notes
-                clip.set_notes(tuple(new_notes))
-                
-        except Exception as e:
-            self.log_message(f"Error applying variations: {str(e)}")
+                clip.set_notes(new_notes)
+            except _LOM_EXC as e:
+                self._log_buffered(f"Error applying variations: {str(e)}")
     
+    @_logged("creating transition")
     def _create_transition(self, from_bar, to_bar, transition_type, length_beats):
         """Create a transition between two sections"""
-        try:
-            self.log_message(f"Creating {transition_type} transition from bar {from_bar} to bar {to_bar}")
-            
-            # Convert bars to time
-            beats_per_bar = 4  # Standard 4/4 time signature
-            from_time = from_bar * beats_per_bar
-            to_time = to_bar * beats_per_bar
-            
-            # Find a suitable track for the transition
-            # Transitions typically involve drums and/or effects
-            drum_track = None
-            for i, track in enumerate(self._song.tracks):
-                if "drum" in track.name.lower():
-                    drum_track = track
-                    break
-            
-            # If no drum track was found, use the first track
-            if drum_track is None and len(self._song.tracks) > 0:
-                drum_track = self._song.tracks[0]
-            
-            # No tracks available
-            if drum_track is None:
-                raise Exception("No tracks available for creating transition")
-            
-            # Create transition based on type
-            if transition_type.lower() == "fill":
-                # Create a drum fill at the end of the section
-                fill_start_time = to_time - (length_beats * 0.25)  # Start a bit before the target bar
-                
-                # Find a clip to use as template for the fill
-                template_clip = None
-                for slot in drum_track.clip_slots:
-                    if slot.has_clip:
-                        template_clip = slot.clip
-                        break
-                
-                if template_clip and hasattr(template_clip, 'is_midi_clip') and template_clip.is_midi_clip:
-                    # Create new clip in arrangement
-                    try:
-                        new_clip = drum_track.create_clip(fill_start_time, length_beats * 0.25)
-                        
-                        # Get notes from template if possible
-                        if hasattr(template_clip, 'get_notes') and hasattr(new_clip, 'set_notes'):
-                            template_notes = list(template_clip.get_notes(0, 0, template_clip.length, 127))
-                            
-                            # Modify notes to create a fill pattern (more dense at the end)
-                            fill_notes = []
-                            for i, note in enumerate(template_notes):
-                                # Keep original pitch but adjust timing to create a fill pattern
-                                pitch = note[0]
-                                
-                                # Create a pattern with increasing density
-                                new_time = (i % 4) * 0.125
-                                duration = 0.125  # Sixteenth note
-                                
-                                # Higher velocity for accents
-                                velocity = 100 if i % 4 == 0 else 80
-                                
-                                fill_notes.append((pitch, new_time, duration, velocity, False))
-                            
-                            # Add extra notes at end of fill for buildup
-                            for i in range(4):
-                                pitch = 38  # Snare drum
-                                new_time = length_beats * 0.25 - 0.25 + (i * 0.0625)  # Last quarter note
-                                duration = 0.0625  # Thirty-second note
-                                velocity = 100 + (i * 10)  # Increasing velocity
-                                
-                                fill_notes.append((pitch, new_time, duration, velocity, False))
-                            
-                            # Set notes in the new clip
-                            new_clip.set_notes(tuple(fill_notes))
-                    except Exception as e:
-                        self.log_message(f"Error creating fill clip: {str(e)}")
-            
-            elif transition_type.lower() in ["riser", "uplifter"]:
-                # Create a riser effect before the target bar
-                riser_start_time = to_time - length_beats
-                
-                # Look for an effect track
-                effect_track = None
-                for track in self._song.tracks:
-                    if "fx" in track.name.lower() or "effect" in track.name.lower():
-                        effect_track = track
-                        break
-                
-                # If no effect track, use the drum track
-                if effect_track is None:
-                    effect_track = drum_track
-                
-                # Create automation for a parameter (e.g., filter cutoff)
+        self._log_buffered(f"Creating {transition_type} transition from bar {from_bar} to bar {to_bar}")
+        
+        # Convert bars to time
+        from_time = from_bar * _BEATS_PER_BAR
+        to_time = to_bar * _BEATS_PER_BAR
+        
+        # Find a suitable track for the transition
+        # Transitions typically involve drums and/or effects
+        drum_track = None
+        drum_index = 0
+        tracks = self._get_tracks()
+        names = self._track_names_lower()
+        for i, track in enumerate(tracks):
+            if "drum" in names[i]:
+                drum_track = track
+                drum_index = i
+                break
+        
+        # If no drum track was found, use the first track
+        if drum_track is None and len(tracks) > 0:
+            drum_track = tracks[0]
+        
+        # No tracks available
+        if drum_track is None:
+            raise Exception("No tracks available for creating transition")
+        
+        # Create transition based on type
+        if transition_type.lower() == "fill":
+            # Create a drum fill at the end of the section
+            fill_start_time = to_time - (length_beats * 0.25)  # Start a bit before the target bar
+            
+            # Use the first filled slot's clip as template for the fill
+            template_clip = None
+            filled = self._filled_slot_indices()[drum_index]
+            if filled:
+                template_clip = drum_track.clip_slots[filled[0]].clip
+            
+            if template_clip and hasattr(template_clip, 'is_midi_clip') and template_clip.is_midi_clip:
+                # Create new clip in arrangement
                 try:
-                    # Create a MIDI clip to hold automation
-                    new_clip = effect_track.create_clip(riser_start_time, length_beats)
+                    new_clip = drum_track.create_clip(fill_start_time, length_beats * 0.25)
                     
-                    # Find a device and parameter to automate
-                    for device in effect_track.devices:
-                        # Find a filterable parameter to automate
-                        for parameter in device.parameters:
-                            if ("cutoff" in parameter.name.lower() or 
-                                "freq" in parameter.name.lower() or 
-                                "filter" in parameter.name.lower()):
-                                
-                                # Create rising automation
-                                if hasattr(new_clip, 'clear_envelope') and hasattr(new_clip, 'set_envelope_point'):
-                                    new_clip.clear_envelope(parameter)
-                                    new_clip.set_envelope_point(parameter, 0.0, parameter.min)
-                                    new_clip.set_envelope_point(parameter, length_beats, parameter.max)
-                                    break
-                except Exception as e:
-                    self.log_message(f"Error creating riser automation: {str(e)}")
-            
-            elif transition_type.lower() == "cut":
-                # Simple cut - just leave a gap between sections
-                # We don't need to do anything special for this in terms of clip creation
-                pass
-            
-            result = {
-                "transition_type": transition_type,
-                "from_bar": from_bar,
-                "to_bar": to_bar,
-                "length_beats": length_beats
-            }
-            return result
-            
-        except Exception as e:
-            self.log_message(f"Error creating transition: {str(e)}")
-            self.log_message(traceback.format_exc())
-            raise
-    
-    def _convert_session_to_arrangement(self, structure):
-        """Convert session clips to arrangement based on a specified structure"""
-        try:
-            self.log_message(f"Converting session to arrangement with structure: {structure}")
-            
-            # We'll implement this without using clear_arrangement
-            # Instead we'll just add clips at the specified positions
+                    # Get notes from template if possible
+                    if hasattr(template_clip, 'get_notes') and hasattr(new_clip, 'set_notes'):
+                        template_notes = template_clip.get_notes(0, 0, template_clip.length, 127)
+                        
+                        # Keep the template's pitches but lay them out as sixteenths
+                        # (more dense at the end), accenting every fourth note
+                        fill_notes = [
+                            (note[0], new_time, 0.125, velocity, False)
+                            for note, (new_time, velocity) in zip(template_notes, itertools.cycle(_FILL_STEPS))
+                        ]
+                        
+                        # Add extra snare notes in the last quarter note for buildup, as
+                        # thirty-second notes with increasing velocity
+                        buildup_start = length_beats * 0.25 - 0.25
+                        fill_notes.extend(
+                            (38, buildup_start + i * 0.0625, 0.0625, 100 + i * 10, False)
+                            for i in range(4)
+                        )
+                        
+                        # Set notes in the new clip
+                        new_clip.set_notes(tuple(fill_notes))
+                except _LOM_EXC as e:
+                    self.log_message(f"Error creating fill clip: {str(e)}")
+        
+        elif transition_type.lower() in ["riser", "uplifter"]:
+            # Create a riser effect before the target bar
+            riser_start_time = to_time - length_beats
+            
+            # Look for an effect track
+            effect_track = None
+            for i, track in enumerate(tracks):
+                if "fx" in names[i] or "effect" in names[i]:
+                    effect_track = track
+                    effect_index = i
+                    break
             
-            current_bar = 0
-            section_count = 0
+            # If no effect track, use the drum track
+            if effect_track is None:
+                effect_track = drum_track
+                effect_index = drum_index
             
-            # Process each section in the structure
-            for section in structure:
-                section_type = section.get("type", "generic")
-                length_bars = section.get("length_bars", 4)
-                
-                # Create a section at the current position
-                self._create_arrangement_section(section_type, length_bars, current_bar)
-                
-                # If more than one section, create a transition between them
-                if current_bar > 0:
-                    # Choose transition type based on what sections are being connected
-                    transition_type = "fill"  # Default
-                    
-                    # Update transition type based on the sections being connected
-                    prev_section_type = structure[section_count - 1].get("type", "generic")
-                    if prev_section_type == "verse" and section_type == "chorus":
-                        transition_type = "riser"
-                    elif prev_section_type == "chorus" and section_type == "verse":
-                        transition_type = "downlifter"
-                    elif prev_section_type == "chorus" and section_type == "bridge":
-                        transition_type = "cut"
-                    
-                    # Create the transition
-                    self._create_transition(current_bar - 1, current_bar, transition_type, 4)
+            # Create automation for a parameter (e.g., filter cutoff)
+            try:
+                # Create a MIDI clip to hold automation
+                new_clip = effect_track.create_clip(riser_start_time, length_beats)
                 
-                # Move to the next position
-                current_bar += length_bars
-                section_count += 1
-            
-            result = {
-                "total_length_bars": current_bar,
-                "section_count": len(structure)
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error converting session to arrangement: {str(e)}")
-            self.log_message(traceback.format_exc())
-            raise
+                # Automate each device's first filterable parameter with rising automation
+                if hasattr(new_clip, 'clear_envelope') and hasattr(new_clip, 'set_envelope_point'):
+                    for parameter in self._filter_parameters(effect_index):
+                        new_clip.clear_envelope(parameter)
+                        new_clip.set_envelope_point(parameter, 0.0, parameter.min)
+                        new_clip.set_envelope_point(parameter, length_beats, parameter.max)
+            except _LOM_EXC as e:
+                self.log_message(f"Error creating riser automation: {str(e)}")
+        
+        elif transition_type.lower() == "cut":
+            # Simple cut - just leave a gap between sections
+            # We don't need to do anything special for this in terms of clip creation
+            pass
+        
+        result = {
+            "transition_type": transition_type,
+            "from_bar": from_bar,
+            "to_bar": to_bar,
+            "length_beats": length_beats
+        }
+        return result
+    
+    @_logged("converting session to arrangement")
+    def _convert_session_to_arrangement(self, structure):
+        """Convert session clips to arrangement based on a specified structure"""
+        self.log_message(f"Converting session to arrangement with structure: {structure}")
+        
+        # We'll implement this without using clear_arrangement
+        # Instead we'll just add clips at the specified positions
+        
+        # Each section starts where the lengths of the ones before it add up to
+        section_types = [section.get("type", "generic") for section in structure]
+        lengths = [section.get("length_bars", 4) for section in structure]
+        start_bars = [0]
+        start_bars.extend(itertools.accumulate(lengths))
+        total_length_bars = start_bars.pop()
+        
+        # Select the clips of every section up front
+        plans = []
+        for section_type, length_bars, start_bar in zip(section_types, lengths, start_bars):
+            self._log_buffered(f"Creating {section_type} section with length {length_bars} bars")
+            kind = section_type.lower()
+            plans.append((
+                self._select_clips_for_section(kind if kind in _SECTION_KINDS else "generic"),
+                start_bar * _BEATS_PER_BAR,
+                length_bars * _BEATS_PER_BAR
+            ))
+        
+        # Then fill the sections track by track, so each track's slots and
+        # source clips are read once for all of its sections
+        for track_index, track in enumerate(self._get_tracks()):
+            sources = {}
+            for section_tracks, start_time, section_length in plans:
+                clip_indices = section_tracks.get(track_index)
+                if clip_indices:
+                    self._place_section_clips(track, clip_indices, start_time, section_length, sources)
+        
+        # Create a transition into every section after the start
+        for section_count, start_bar in enumerate(start_bars):
+            if start_bar <= 0:
+                continue
+            section_type = section_types[section_count]
+            
+            # Choose transition type based on what sections are being connected
+            transition_type = "fill"  # Default
+            
+            # Update transition type based on the sections being connected
+            prev_section_type = section_types[section_count - 1]
+            if prev_section_type == "verse" and section_type == "chorus":
+                transition_type = "riser"
+            elif prev_section_type == "chorus" and section_type == "verse":
+                transition_type = "downlifter"
+            elif prev_section_type == "chorus" and section_type == "bridge":
+                transition_type = "cut"
+            
+            # Create the transition
+            self._create_transition(start_bar - 1, start_bar, transition_type, 4)
+        
+        result = {
+            "total_length_bars": total_length_bars,
+            "section_count": len(structure)
+        }
+        return result
 
+    @_logged("setting clip follow action time")
     def _set_clip_follow_action_time(self, track_index, clip_index, time_beats):
         """Set the follow action time for a clip in beats"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
-            
-            if clip_index < 0 or clip_index >= len(track.clip_slots):
-                raise IndexError("Clip index out of range")
-            
-            clip_slot = track.clip_slots[clip_index]
-            
-            if not clip_slot.has_clip:
-                raise Exception("No clip in slot")
-            
-            # Set the follow action time
-            clip_slot.clip.follow_action_time = time_beats
-            
-            result = {
-                "track_index": track_index,
-                "clip_index": clip_index,
-                "follow_action_time": clip_slot.clip.follow_action_time
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error setting clip follow action time: {str(e)}")
-            raise
+        track = self._get_track(track_index)
+        
+        clip_slot = self._get_clip_slot(track, clip_index)
+        
+        if not clip_slot.has_clip:
+            return _NO_CLIP
+        
+        # Set the follow action time
+        clip_slot.clip.follow_action_time = time_beats
+        
+        result = {
+            "track_index": track_index,
+            "clip_index": clip_index,
+            "follow_action_time": clip_slot.clip.follow_action_time
+        }
+        return result
     
+    @_logged("setting clip follow action")
     def _set_clip_follow_action(self, track_index, clip_index, action_type, probability):
         """Set the follow action for a clip"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
-            
-            if clip_index < 0 or clip_index >= len(track.clip_slots):
-                raise IndexError("Clip index out of range")
-            
-            clip_slot = track.clip_slots[clip_index]
-            
-            if not clip_slot.has_clip:
-                raise Exception("No clip in slot")
-            
-            clip = clip_slot.clip
-            
-            # Map action_type string to the appropriate value
-            # Common follow actions: "none", "next", "prev", "first", "last", "any", "other"
-            action_map = {
-                "none": 0,
-                "next": 1,
-                "prev": 2,
-                "first": 3,
-                "last": 4,
-                "any": 5,
-                "other": 6
-            }
-            
-            # Set default to "none" if not recognized
-            action_value = action_map.get(action_type.lower(), 0)
-            
-            # Validate probability (0.0 to 1.0)
-            probability = max(0.0, min(1.0, probability))
-            
-            # For action A (primary action)
-            clip.follow_action_a = action_value
-            clip.follow_action_a_probability = probability
-            
-            # For action B (secondary action) - set to none with remaining probability
-            # When A has 100% probability, B is never used
-            clip.follow_action_b = 0  # None
-            clip.follow_action_b_probability = 1.0 - probability
-            
-            # Enable follow actions
-            clip.follow_action_enabled = True
-            
-            result = {
-                "track_index": track_index,
-                "clip_index": clip_index,
-                "action_type": action_type,
-                "probability": probability,
-                "follow_action_enabled": clip.follow_action_enabled
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error setting clip follow action: {str(e)}")
-            raise
+        track = self._get_track(track_index)
+        
+        clip_slot = self._get_clip_slot(track, clip_index)
+        
+        if not clip_slot.has_clip:
+            return _NO_CLIP
+        
+        clip = clip_slot.clip
+        
+        # Map an action_type name to its value, defaulting to "none", values pass through
+        if isinstance(action_type, str):
+            action_value = _FOLLOW_ACTIONS.get(action_type.lower(), FollowAction.NONE)
+        else:
+            action_value = FollowAction(action_type)
+        
+        # Validate probability (0.0 to 1.0)
+        probability = max(0.0, min(1.0, probability))
+        
+        # Action B is none with the remaining probability, so when A has
+        # 100% probability B is never used
+        _set_follow_action(clip, action_value, probability)
+        
+        result = {
+            "track_index": track_index,
+            "clip_index": clip_index,
+            "action_type": action_type,
+            "probability": probability,
+            "follow_action_enabled": clip.follow_action_enabled
+        }
+        return result
     
+    @_logged("setting clip follow action linked")
     def _set_clip_follow_action_linked(self, track_index, clip_index, linked):
         """Set whether the follow action timing is linked to the clip length"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
-            
-            if clip_index < 0 or clip_index >= len(track.clip_slots):
-                raise IndexError("Clip index out of range")
-            
-            clip_slot = track.clip_slots[clip_index]
-            
-            if not clip_slot.has_clip:
-                raise Exception("No clip in slot")
-            
-            clip = clip_slot.clip
-            
-            # Set the follow action linked state
-            clip.follow_action_follow_time_linked = linked
-            
-            result = {
-                "track_index": track_index,
-                "clip_index": clip_index,
-                "linked": clip.follow_action_follow_time_linked
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error setting clip follow action linked: {str(e)}")
-            raise
+        track = self._get_track(track_index)
+        
+        clip_slot = self._get_clip_slot(track, clip_index)
+        
+        if not clip_slot.has_clip:
+            return _NO_CLIP
+        
+        clip = clip_slot.clip
+        
+        # Set the follow action linked state
+        clip.follow_action_follow_time_linked = linked
+        
+        result = {
+            "track_index": track_index,
+            "clip_index": clip_index,
+            "linked": clip.follow_action_follow_time_linked
+        }
+        return result
 
+    @_logged("setting up clip sequence")
+    @_undo_step
     def _setup_clip_sequence(self, track_index, start_clip_index, end_clip_index, loop_back=True):
         """Setup a sequence of clips with follow actions to play in order"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
-            
-            # Process each clip in the sequence
-            clips_processed = 0
-            for clip_index in range(start_clip_index, end_clip_index + 1):
-                try:
-                    if clip_index < 0 or clip_index >= len(track.clip_slots):
-                        self.log_message(f"Clip index {clip_index} out of range, skipping")
-                        continue
-                        
-                    clip_slot = track.clip_slots[clip_index]
-                    
-                    if not clip_slot.has_clip:
-                        self.log_message(f"No clip in slot {clip_index}, skipping")
-                        continue
-                    
-                    clip = clip_slot.clip
-                    
-                    # Set follow action to "next" with 100% probability
-                    clip.follow_action_a = 1  # Next
-                    clip.follow_action_a_probability = 1.0
-                    clip.follow_action_b = 0  # None
-                    clip.follow_action_b_probability = 0.0
-                    
-                    # Set follow action time to match clip length
-                    clip.follow_action_time = clip.length
-                    
-                    # Link follow action to clip length
-                    clip.follow_action_follow_time_linked = True
-                    
-                    # Enable follow actions
-                    clip.follow_action_enabled = True
-                    
-                    clips_processed += 1
+        track = self._get_track(track_index)
+        
+        # Process each clip in the sequence
+        slots = track.clip_slots
+        clips_processed = 0
+        for clip_index in range(start_clip_index, end_clip_index + 1):
+            try:
+                if clip_index < 0 or clip_index >= len(slots):
+                    self._log_buffered(f"Clip index {clip_index} out of range, skipping")
+                    continue
                     
-                except Exception as e:
-                    self.log_message(f"Error setting up follow action for clip {clip_index}: {str(e)}")
-                    # Continue with next clip
-            
-            # Handle special case for last clip to loop back to the first
-            if clips_processed > 0 and loop_back and end_clip_index < len(track.clip_slots) and track.clip_slots[end_clip_index].has_clip:
-                clip = track.clip_slots[end_clip_index].clip
+                clip_slot = slots[clip_index]
                 
-                # Set the last clip to go back to the first one
-                if start_clip_index == 0:
-                    clip.follow_action_a = 3  # First
-                else:
-                    clip.follow_action_a = 6  # Other (would need specific index)
+                if not clip_slot.has_clip:
+                    self._log_buffered(f"No clip in slot {clip_index}, skipping")
+                    continue
                 
-                clip.follow_action_a_probability = 1.0
-                clip.follow_action_b = 0  # None
-                clip.follow_action_b_probability = 0.0
-                clip.follow_action_enabled = True
-            
-            result = {
-                "track_index": track_index,
-                "clips_processed": clips_processed
-            }
-            return result
+                clip = clip_slot.clip
+                
+                # Set follow action to "next" with 100% probability, linked to the clip length
+                _set_follow_action(clip, FollowAction.NEXT, 1.0, clip.length)
+                
+                clips_processed += 1
+                
+            except _LOM_EXC as e:
+                self._log_buffered(f"Error setting up follow action for clip {clip_index}: {str(e)}")
+                # Continue with next clip
+        
+        # Handle special case for last clip to loop back to the first
+        if clips_processed > 0 and loop_back and end_clip_index < len(slots) and slots[end_clip_index].has_clip:
+            clip = slots[end_clip_index].clip
             
-        except Exception as e:
-            self.log_message(f"Error setting up clip sequence: {str(e)}")
-            raise
+            # Set the last clip to go back to the first one
+            if start_clip_index == 0:
+                _set_follow_action(clip, FollowAction.FIRST, 1.0)
+            else:
+                _set_follow_action(clip, FollowAction.OTHER, 1.0)  # Would need specific index
+        
+        result = {
+            "track_index": track_index,
+            "clips_processed": clips_processed
+        }
+        return result
     
+    @_logged("setting up project follow actions")
+    @_undo_step
     def _setup_project_follow_actions(self, loop_back=True):
         """Setup follow actions for all tracks in the project"""
-        try:
-            total_clips_processed = 0
-            tracks_processed = 0
-            
-            # Process each track
-            for track_index, track in enumerate(self._song.tracks):
-                try:
-                    # Find clips in this track
-                    clips_with_content = []
-                    for i, clip_slot in enumerate(track.clip_slots):
-                        if clip_slot.has_clip:
-                            clips_with_content.append(i)
+        total_clips_processed = 0
+        tracks_processed = 0
+        
+        # Snapshot which slots hold clips on every track in one pass
+        filled_slots = self._filled_slot_indices()
+        
+        # Process each track
+        for track_index, track in enumerate(self._get_tracks()):
+            clips_processed = 0
+            try:
+                # Find clips in this track
+                clips_with_content = filled_slots[track_index]
+                
+                if not clips_with_content:
+                    self._log_buffered(f"No clips found in track {track_index}, skipping")
+                    continue
+                
+                # Process clips in sequence
+                slots = track.clip_slots
+                for i, clip_index in enumerate(clips_with_content):
+                    clip = slots[clip_index].clip
                     
-                    if not clips_with_content:
-                        self.log_message(f"No clips found in track {track_index}, skipping")
-                        continue
+                    # Set follow action to "next" with 100% probability
+                    action_value = FollowAction.NEXT
                     
-                    # Process clips in sequence
-                    clips_processed = 0
-                    for i, clip_index in enumerate(clips_with_content):
-                        try:
-                            clip_slot = track.clip_slots[clip_index]
-                            clip = clip_slot.clip
-                            
-                            # Set follow action to "next" with 100% probability
-                            action_value = 1  # Next
-                            
-                            # If this is the last clip and loop_back is True, set action to go back to first clip
-                            if i == len(clips_with_content) - 1 and loop_back:
-                                if clips_with_content[0] == 0:
-                                    action_value = 3  # First
-                                else:
-                                    action_value = 6  # Other (would need specific index)
-                            
-                            # For action A (primary action)
-                            clip.follow_action_a = action_value
-                            clip.follow_action_a_probability = 1.0
-                            
-                            # For action B (secondary action)
-                            clip.follow_action_b = 0  # None
-                            clip.follow_action_b_probability = 0.0
-                            
-                            # Set follow action time to match clip length and link it
-                            clip.follow_action_time = clip.length
-                            clip.follow_action_follow_time_linked = True
-                            
-                            # Enable follow actions
-                            clip.follow_action_enabled = True
-                            
-                            clips_processed += 1
-                            
-                        except Exception as e:
-                            self.log_message(f"Error setting up follow action for track {track_index}, clip {clip_index}: {str(e)}")
-                            # Continue with next clip
+                    # If this is the last clip and loop_back is True, set action to go back to first clip
+                    if i == len(clips_with_content) - 1 and loop_back:
+                        if clips_with_content[0] == 0:
+                            action_value = FollowAction.FIRST
+                        else:
+                            action_value = FollowAction.OTHER  # Would need specific index
                     
-                    if clips_processed > 0:
-                        tracks_processed += 1
-                        total_clips_processed += clips_processed
-                        self.log_message(f"Processed {clips_processed} clips in track {track_index}")
+                    # Set follow action time to match clip length and link it
+                    _set_follow_action(clip, action_value, 1.0, clip.length)
                     
-                except Exception as e:
-                    self.log_message(f"Error processing track {track_index}: {str(e)}")
-                    # Continue with next track
-            
-            result = {
-                "total_clips_processed": total_clips_processed,
-                "tracks_processed": tracks_processed
-            }
-            return result
-            
-        except Exception as e:
-            self.log_message(f"Error setting up project follow actions: {str(e)}")
-            raise
+                    clips_processed += 1
+                
+            except _LOM_EXC as e:
+                self._log_buffered(f"Error setting up follow actions for track {track_index}: {str(e)}")
+                # Continue with next track, keeping the clips already set up
+            
+            if clips_processed > 0:
+                tracks_processed += 1
+                total_clips_processed += clips_processed
+                self._log_buffered(f"Processed {clips_processed} clips in track {track_index}")
+        
+        result = {
+            "total_clips_processed": total_clips_processed,
+            "tracks_processed": tracks_processed
+        }
+        return result
 
+    @_logged("adding automation to clip")
     def _add_automation_to_clip(self, track_index, clip_index, parameter_name, points):
         """Add automation points to a clip parameter"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
-            
-            if clip_index < 0 or clip_index >= len(track.clip_slots):
-                raise IndexError("Clip index out of range")
-            
-            clip_slot = track.clip_slots[clip_index]
-            
-            if not clip_slot.has_clip:
-                raise Exception("No clip in slot")
-            
-            clip = clip_slot.clip
-            
-            # Find the parameter to automate
-            parameter = None
+        track = self._get_track(track_index)
+        
+        clip_slot = self._get_clip_slot(track, clip_index)
+        
+        if not clip_slot.has_clip:
+            return _NO_CLIP
+        
+        clip = clip_slot.clip
+        
+        # Find the parameter to automate
+        parameter = None
+        
+        match = _PARAMETER_NAME.match(parameter_name)
+        if match is not None:
+            volume, panning, send, device_number, param_number = match.groups()
             
             # Check common mixer parameters first
-            if parameter_name.lower() == "volume":
+            if volume:
                 parameter = track.mixer_device.volume
-            elif parameter_name.lower() == "panning":
+            elif panning:
                 parameter = track.mixer_device.panning
-            elif parameter_name.startswith("send_"):
-                try:
-                    send_index = int(parameter_name.split("_")[1])
-                    if send_index < len(track.mixer_device.sends):
-                        parameter = track.mixer_device.sends[send_index]
-                except:
-                    pass
-            # Check device parameters
-            elif parameter_name.startswith("device"):
-                try:
-                    parts = parameter_name.split("_")
-                    device_index = int(parts[0][6:])  # Extract the number from "device1"
-                    param_index = int(parts[1][5:])   # Extract the number from "param1"
-                    
-                    if device_index < len(track.devices):
-                        device = track.devices[device_index]
-                        if param_index < len(device.parameters):
-                            parameter = device.parameters[param_index]
-                except:
-                    pass
-            
-            if parameter is None:
-                raise Exception(f"Parameter '{parameter_name}' not found")
-            
-            # Clear existing automation for this parameter
-            if clip.is_midi_clip:
-                clip.clear_envelope(parameter)
-            
-            # Add automation points
-            for point in points:
-                clip.set_envelope_point(
-                    parameter,
-                    point.get("time", 0.0),  # Time in beats
-                    point.get("value", 0.0)  # Parameter value
-                )
-            
-            result = {
-                "track_index": track_index,
-                "clip_index": clip_index,
-                "parameter": parameter_name,
-                "point_count": len(points)
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error adding automation to clip: {str(e)}")
-            raise
+            elif send:
+                sends = track.mixer_device.sends
+                send_index = int(send)
+                if send_index < len(sends):
+                    parameter = sends[send_index]
+            # Check device parameters, named like "device1_param1"
+            else:
+                devices = track.devices
+                device_index = int(device_number)
+                if device_index < len(devices):
+                    parameters = devices[device_index].parameters
+                    param_index = int(param_number)
+                    if param_index < len(parameters):
+                        parameter = parameters[param_index]
+        
+        if parameter is None:
+            raise Exception(f"Parameter '{parameter_name}' not found")
+        
+        # Clear existing automation for this parameter
+        if clip.is_midi_clip:
+            clip.clear_envelope(parameter)
+        
+        # Add automation points as (time in beats, parameter value), in time order
+        if isinstance(points, str):
+            envelope_points = list(_ENVELOPE_POINT.iter_unpack(base64.b64decode(points)))
+        else:
+            envelope_points = [(float(point.get("time", 0.0)), float(point.get("value", 0.0))) for point in points]
+        envelope_points.sort(key=operator.itemgetter(0))
+        set_envelope_point = clip.set_envelope_point
+        for beat, value in envelope_points:
+            set_envelope_point(parameter, beat, value)
+        
+        result = {
+            "track_index": track_index,
+            "clip_index": clip_index,
+            "parameter": parameter_name,
+            "point_count": len(envelope_points)
+        }
+        return result
     
+    @_logged("creating audio track")
     def _create_audio_track(self, index):
         """Create a new audio track at the specified index"""
-        try:
-            # Create the track
-            self._song.create_audio_track(index)
-            
-            # Get the new track
-            new_track_index = len(self._song.tracks) - 1 if index == -1 else index
-            new_track = self._song.tracks[new_track_index]
-            
-            result = {
-                "index": new_track_index,
-                "name": new_track.name
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error creating audio track: {str(e)}")
-            raise
+        # Create the track
+        self._song.create_audio_track(index)
+        
+        # Get the new track
+        tracks = self._song.tracks
+        new_track_index = len(tracks) - 1 if index == -1 else index
+        new_track = tracks[new_track_index]
+        
+        result = {
+            "index": new_track_index,
+            "name": new_track.name
+        }
+        return result
     
+    @_logged("inserting arrangement clip")
     def _insert_arrangement_clip(self, track_index, start_time, length, is_audio=False):
         """Insert a clip directly in the arrangement view"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
-            
-            # Determine if we can create the requested clip type on this track
-            if is_audio and not track.has_audio_input:
-                raise Exception("Cannot create audio clip on MIDI track")
-            elif not is_audio and not track.has_midi_input:
-                raise Exception("Cannot create MIDI clip on audio track")
-            
-            # Ensure we're definitively in arrangement view before proceeding
-            self._show_arrangement_view()
-            
-            # Give Ableton a moment to update the view
-            import time
-            time.sleep(0.2)
-            
-            # Log current view state
-            if hasattr(self._song.view, 'focused_document_view'):
-                self.log_message(f"Confirmed view: {self._song.view.focused_document_view}")
-            
-            # Ensure length is valid
-            if length <= 0:
-                self.log_message("Invalid clip length, using default of 4 beats")
-                length = 4.0
-            
-            # First, try to use create_clip if available (Live 11+)
-            clip = None
-            if hasattr(track, 'create_clip'):
-                try:
-                    self.log_message(f"Creating arrangement clip using create_clip at {start_time} with length {length}")
-                    clip = track.create_clip(start_time, length)
-                    
-                    # Log success
-                    if clip is not None:
-                        self.log_message("Successfully created clip using create_clip")
-                        
-                        # Verify the clip length
-                        if hasattr(clip, 'length'):
-                            self.log_message(f"Created clip with length: {clip.length}")
-                            
-                            # If the length is not correct, try to fix it
-                            if abs(clip.length - length) > 0.1:
-                                if hasattr(clip, 'end_marker') and hasattr(clip.end_marker, 'time'):
-                                    try:
-                                        clip.end_marker.time = start_time + length
-                                        self.log_message(f"Adjusted clip end marker to {start_time + length}")
-                                    except Exception as e:
-                                        self.log_message(f"Error adjusting clip end marker: {str(e)}")
-                    else:
-                        self.log_message("create_clip returned None")
-                except Exception as e:
-                    self.log_message(f"Error using create_clip: {str(e)}")
+        track = self._get_track(track_index)
+        
+        # Determine if we can create the requested clip type on this track
+        if is_audio and not track.has_audio_input:
+            raise Exception("Cannot create audio clip on MIDI track")
+        elif not is_audio and not track.has_midi_input:
+            raise Exception("Cannot create MIDI clip on audio track")
+        
+        # Ensure we're definitively in arrangement view before proceeding
+        self._show_arrangement_view()
+        
+        # Give Ableton a moment to update the view
+        time.sleep(0.2)
+        
+        # Log current view state
+        if self._song_has('view.focused_document_view'):
+            self.log_message(f"Confirmed view: {self._song_view.focused_document_view}")
+        
+        # Ensure length is valid
+        if length <= 0:
+            self.log_message("Invalid clip length, using default of 4 beats")
+            length = 4.0
+        
+        # First, try to use create_clip if available (Live 11+)
+        clip = None
+        if hasattr(track, 'create_clip'):
+            try:
+                self.log_message(f"Creating arrangement clip using create_clip at {start_time} with length {length}")
+                clip = track.create_clip(start_time, length)
                 
-                # Return successfully if clip was created
+                # Log success
                 if clip is not None:
-                    # Add a dummy note at the end to ensure clip spans the full length
-                    if not is_audio and hasattr(clip, 'set_notes'):
-                        try:
-                            # Create a silent note at the end of the clip to ensure length is preserved
-                            dummy_note = (60, length - 0.01, 0.01, 1, True)  # Muted, nearly inaudible
-                            clip.set_notes((dummy_note,))
-                            self.log_message("Added dummy note to preserve clip length")
-                        except Exception as e:
-                            self.log_message(f"Error adding dummy note: {str(e)}")
+                    self.log_message("Successfully created clip using create_clip")
                     
-                    result = {
-                        "track_index": track_index,
-                        "start_time": start_time,
-                        "length": length,
-                        "actual_length": clip.length if hasattr(clip, 'length') else length,
-                        "clip_id": str(clip._live_ptr) if hasattr(clip, '_live_ptr') else None,
-                        "clip_name": clip.name if hasattr(clip, 'name') else "",
-                        "is_audio": is_audio,
-                        "method": "create_clip"
-                    }
-                    return result
-            else:
-                self.log_message("Track doesn't have create_clip method")
-            
-            # If create_clip is not available or failed, try alternative approach
-            self.log_message("Using alternative recording approach to create arrangement clip")
-            
-            # Store original state to restore later
-            current_position = self._song.current_song_time
-            was_playing = self._song.is_playing
-            was_recording = self._song.record_mode if hasattr(self._song, 'record_mode') else False
-            
-            # Make sure track is armed for recording
-            if hasattr(track, 'arm'):
-                # Unarm all other tracks first
-                for other_track in self._song.tracks:
-                    if other_track != track and hasattr(other_track, 'arm') and other_track.arm:
-                        other_track.arm = False
+                    # Verify the clip length
+                    if hasattr(clip, 'length'):
+                        self.log_message(f"Created clip with length: {clip.length}")
+                        
+                        # If the length is not correct, try to fix it
+                        if abs(clip.length - length) > 0.1:
+                            if hasattr(clip, 'end_marker') and hasattr(clip.end_marker, 'time'):
+                                try:
+                                    clip.end_marker.time = start_time + length
+                                    self.log_message(f"Adjusted clip end marker to {start_time + length}")
+                                except Exception as e:
+                                    self.log_message(f"Error adjusting clip end marker: {str(e)}")
+                else:
+                    self.log_message("create_clip returned None")
+            except Exception as e:
+                self.log_message(f"Error using create_clip: {str(e)}")
+            
+            # Return successfully if clip was created
+            if clip is not None:
+                # Add a dummy note at the end to ensure clip spans the full length
+                if not is_audio and hasattr(clip, 'set_notes'):
+                    try:
+                        # Create a silent note at the end of the clip to ensure length is preserved
+                        dummy_note = (60, length - 0.01, 0.01, 1, True)  # Muted, nearly inaudible
+                        clip.set_notes((dummy_note,))
+                        self.log_message("Added dummy note to preserve clip length")
+                    except Exception as e:
+                        self.log_message(f"Error adding dummy note: {str(e)}")
                 
-                # Arm our target track
-                track.arm = True
-                self.log_message(f"Armed track {track_index} for recording")
-            else:
-                self.log_message("Track doesn't have arm property")
+                result = {
+                    "track_index": track_index,
+                    "start_time": start_time,
+                    "length": length,
+                    "actual_length": clip.length if hasattr(clip, 'length') else length,
+                    "clip_id": str(clip._live_ptr) if hasattr(clip, '_live_ptr') else None,
+                    "clip_name": clip.name if hasattr(clip, 'name') else "",
+                    "is_audio": is_audio,
+                    "method": "create_clip"
+                }
+                return result
+        else:
+            self.log_message("Track doesn't have create_clip method")
+        
+        # If create_clip is not available or failed, try alternative approach
+        self.log_message("Using alternative recording approach to create arrangement clip")
+        
+        # Store original state to restore later
+        current_position = self._song.current_song_time
+        was_playing = self._song.is_playing
+        was_recording = self._song.record_mode if self._song_has('record_mode') else False
+        
+        # Make sure track is armed for recording
+        if hasattr(track, 'arm'):
+            # Unarm all other tracks first
+            for other_track in self._song.tracks:
+                if other_track != track and hasattr(other_track, 'arm') and other_track.arm:
+                    other_track.arm = False
+            
+            # Arm our target track
+            track.arm = True
+            self.log_message(f"Armed track {track_index} for recording")
+        else:
+            self.log_message("Track doesn't have arm property")
+        
+        # Position the playhead
+        self._song.current_song_time = start_time
+        self.log_message(f"Set playhead position to {start_time}")
+        
+        # Enable arrangement record mode
+        if self._song_has('record_mode'):
+            self._song.record_mode = True
+            self.log_message("Enabled record mode")
+        else:
+            self.log_message("Song doesn't have record_mode property")
+        
+        # Start playback if not already playing
+        if not self._song.is_playing:
+            self._song.start_playing()
+            self.log_message("Started playback")
+        
+        # For MIDI tracks, we can try to create a note to ensure clip creation
+        if not is_audio and track.has_midi_input:
+            # Select the track in the view
+            self._song_view.selected_track = track
+            self.log_message("Selected track in view")
             
-            # Position the playhead
-            self._song.current_song_time = start_time
-            self.log_message(f"Set playhead position to {start_time}")
+            # Wait for clip creation
+            time.sleep(0.3)
             
-            # Enable arrangement record mode
-            if hasattr(self._song, 'record_mode'):
-                self._song.record_mode = True
-                self.log_message("Enabled record mode")
-            else:
-                self.log_message("Song doesn't have record_mode property")
-            
-            # Start playback if not already playing
-            if not self._song.is_playing:
-                self._song.start_playing()
-                self.log_message("Started playback")
-            
-            # For MIDI tracks, we can try to create a note to ensure clip creation
-            if not is_audio and track.has_midi_input:
-                # Select the track in the view
-                self._song.view.selected_track = track
-                self.log_message("Selected track in view")
-                
-                # Wait for clip creation
-                time.sleep(0.3)
-                
-                # Find all arrangement clips to log
-                if hasattr(track, 'arrangement_clips'):
-                    clip_count = len(track.arrangement_clips)
-                    self.log_message(f"Found {clip_count} clips on track after starting recording")
-                    
-                    # Log information about each clip
-                    for i, arr_clip in enumerate(track.arrangement_clips):
-                        if hasattr(arr_clip, 'name'):
-                            clip_name = arr_clip.name
-                        else:
-                            clip_name = f"Clip {i}"
-                            
-                        if hasattr(arr_clip, 'start_marker') and hasattr(arr_clip.start_marker, 'time'):
-                            clip_start = arr_clip.start_marker.time
-                        elif hasattr(arr_clip, 'start_time'):
-                            clip_start = arr_clip.start_time
-                        else:
-                            clip_start = "unknown"
-                            
-                        self.log_message(f"Clip {i}: {clip_name} at position {clip_start}")
+            # Find all arrangement clips to log
+            if hasattr(track, 'arrangement_clips'):
+                clip_count = len(track.arrangement_clips)
+                self.log_message(f"Found {clip_count} clips on track after starting recording")
                 
-                # Try to find the newly created MIDI clip
-                new_clip = None
-                if hasattr(track, 'arrangement_clips'):
-                    for arr_clip in track.arrangement_clips:
-                        clip_start = None
-                        if hasattr(arr_clip, 'start_marker') and hasattr(arr_clip.start_marker, 'time'):
-                            clip_start = arr_clip.start_marker.time
-                        elif hasattr(arr_clip, 'start_time'):
-                            clip_start = arr_clip.start_time
-                        elif hasattr(arr_clip, 'start_marker') and isinstance(arr_clip.start_marker, (int, float)):
-                            clip_start = float(arr_clip.start_marker)
+                # Log information about each clip
+                for i, arr_clip in enumerate(track.arrangement_clips):
+                    if hasattr(arr_clip, 'name'):
+                        clip_name = arr_clip.name
+                    else:
+                        clip_name = f"Clip {i}"
                         
-                        if clip_start is not None and abs(clip_start - start_time) < 0.1:  # Small tolerance for floating point
-                            new_clip = arr_clip
-                            self.log_message(f"Found newly created clip at {clip_start}")
-                            break
-                
-                # If we found a clip, add placeholder notes throughout the length to ensure it's sized correctly
-                if new_clip is not None:
-                    if hasattr(new_clip, 'get_notes') and hasattr(new_clip, 'set_notes'):
-                        try:
-                            # Create notes to span the entire requested length
-                            notes = []
-                            
-                            # Add a note at the start (audible)
-                            notes.append((60, 0.0, 0.1, 100, False))
-                            
-                            # Add a note at the end (silent/muted) to force the correct length
-                            notes.append((60, length - 0.1, 0.1, 1, True))
-                            
-                            # Set the notes
-                            new_clip.set_notes(tuple(notes))
-                            self.log_message(f"Added placeholder notes to span clip length of {length}")
-                            
-                            # Verify the clip length
-                            if hasattr(new_clip, 'length'):
-                                self.log_message(f"Clip length after adding notes: {new_clip.length}")
-                        except Exception as note_error:
-                            self.log_message(f"Error adding placeholder notes: {str(note_error)}")
+                    if hasattr(arr_clip, 'start_marker') and hasattr(arr_clip.start_marker, 'time'):
+                        clip_start = arr_clip.start_marker.time
+                    elif hasattr(arr_clip, 'start_time'):
+                        clip_start = arr_clip.start_time
                     else:
-                        self.log_message("Clip doesn't support adding notes")
-                else:
-                    self.log_message("Could not find newly created clip")
-            
-            # Wait a moment for clip creation
-            time.sleep(0.5)
-            
-            # Stop recording and playback, restore original state
-            if hasattr(self._song, 'record_mode'):
-                self._song.record_mode = was_recording
-                self.log_message(f"Restored record mode to {was_recording}")
-            
-            if not was_playing:
-                self._song.stop_playing()
-                self.log_message("Stopped playback")
-            
-            self._song.current_song_time = current_position
-            self.log_message(f"Restored playhead position to {current_position}")
+                        clip_start = "unknown"
+                        
+                    self.log_message(f"Clip {i}: {clip_name} at position {clip_start}")
             
-            # Try to find the newly created clip
+            # Try to find the newly created MIDI clip
             new_clip = None
             if hasattr(track, 'arrangement_clips'):
                 for arr_clip in track.arrangement_clips:
@@ -2561,726 +3146,679 @@ class AbletonMCPboost(ControlSurface):
                         self.log_message(f"Found newly created clip at {clip_start}")
                         break
             
+            # If we found a clip, add placeholder notes throughout the length to ensure it's sized correctly
             if new_clip is not None:
-                self.log_message("Successfully created clip using recording method")
-                
-                # Set clip length if it's not already correct
-                if hasattr(new_clip, 'length') and hasattr(new_clip, 'end_marker') and hasattr(new_clip.end_marker, 'time'):
-                    if abs(new_clip.length - length) > 0.1:
-                        try:
-                            new_clip.end_marker.time = start_time + length
-                            self.log_message(f"Adjusted clip length to {length}")
-                        except Exception as e:
-                            self.log_message(f"Error adjusting clip length: {str(e)}")
-                
-                result = {
-                    "track_index": track_index,
-                    "start_time": start_time,
-                    "length": length,
-                    "actual_length": new_clip.length if hasattr(new_clip, 'length') else length,
-                    "clip_id": str(new_clip._live_ptr) if hasattr(new_clip, '_live_ptr') else None,
-                    "clip_name": new_clip.name if hasattr(new_clip, 'name') else "",
-                    "is_audio": is_audio,
-                    "method": "recording"
-                }
+                if hasattr(new_clip, 'get_notes') and hasattr(new_clip, 'set_notes'):
+                    try:
+                        # Create notes to span the entire requested length
+                        notes = []
+                        
+                        # Add a note at the start (audible)
+                        notes.append((60, 0.0, 0.1, 100, False))
+                        
+                        # Add a note at the end (silent/muted) to force the correct length
+                        notes.append((60, length - 0.1, 0.1, 1, True))
+                        
+                        # Set the notes
+                        new_clip.set_notes(tuple(notes))
+                        self.log_message(f"Added placeholder notes to span clip length of {length}")
+                        
+                        # Verify the clip length
+                        if hasattr(new_clip, 'length'):
+                            self.log_message(f"Clip length after adding notes: {new_clip.length}")
+                    except Exception as note_error:
+                        self.log_message(f"Error adding placeholder notes: {str(note_error)}")
+                else:
+                    self.log_message("Clip doesn't support adding notes")
             else:
-                self.log_message("Could not confirm clip creation, but operation completed")
+                self.log_message("Could not find newly created clip")
+        
+        # Wait a moment for clip creation
+        time.sleep(0.5)
+        
+        # Stop recording and playback, restore original state
+        if self._song_has('record_mode'):
+            self._song.record_mode = was_recording
+            self.log_message(f"Restored record mode to {was_recording}")
+        
+        if not was_playing:
+            self._song.stop_playing()
+            self.log_message("Stopped playback")
+        
+        self._song.current_song_time = current_position
+        self.log_message(f"Restored playhead position to {current_position}")
+        
+        # Try to find the newly created clip
+        new_clip = None
+        if hasattr(track, 'arrangement_clips'):
+            for arr_clip in track.arrangement_clips:
+                clip_start = None
+                if hasattr(arr_clip, 'start_marker') and hasattr(arr_clip.start_marker, 'time'):
+                    clip_start = arr_clip.start_marker.time
+                elif hasattr(arr_clip, 'start_time'):
+                    clip_start = arr_clip.start_time
+                elif hasattr(arr_clip, 'start_marker') and isinstance(arr_clip.start_marker, (int, float)):
+                    clip_start = float(arr_clip.start_marker)
                 
-                result = {
-                    "track_index": track_index,
-                    "start_time": start_time,
-                    "length": length,
-                    "is_audio": is_audio,
-                    "method": "recording",
-                    "note": "Clip creation initiated. Check arrangement view."
-                }
-            
-            return result
-        except Exception as e:
-            self.log_message(f"Error inserting arrangement clip: {str(e)}")
-            self.log_message(traceback.format_exc())
-            raise
-    
-    def _duplicate_clip_to_arrangement(self, track_index, clip_index, arrangement_time):
-        """Duplicate a session view clip to the arrangement view without using create_clip"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
-            
-            if clip_index < 0 or clip_index >= len(track.clip_slots):
-                raise IndexError("Clip index out of range")
-            
-            clip_slot = track.clip_slots[clip_index]
-            
-            if not clip_slot.has_clip:
-                raise Exception("No clip in slot")
-            
-            source_clip = clip_slot.clip
-            
-            # For Live 11, we need to use a different approach since create_clip isn't available
-            # We'll use the clip_slot.fire() method which plays the clip
-            # To do this in the arrangement:
-            # 1. We need to move the playhead to the desired position
-            # 2. Enable arrangement record
-            # 3. Fire the clip
-            # 4. Let it record for the clip duration
-            # 5. Stop recording
-            
-            current_position = self._song.current_song_time
-            was_playing = self._song.is_playing
-            was_recording = self._song.record_mode
-            
-            # Position the playhead
-            self._song.current_song_time = arrangement_time
-            
-            # Enable arrangement record mode
-            self._song.record_mode = True
-            
-            # Start playback if not already playing
-            if not self._song.is_playing:
-                self._song.start_playing()
+                if clip_start is not None and abs(clip_start - start_time) < 0.1:  # Small tolerance for floating point
+                    new_clip = arr_clip
+                    self.log_message(f"Found newly created clip at {clip_start}")
+                    break
+        
+        if new_clip is not None:
+            self.log_message("Successfully created clip using recording method")
             
-            # Fire the clip
-            clip_slot.fire()
+            # Set clip length if it's not already correct
+            if hasattr(new_clip, 'length') and hasattr(new_clip, 'end_marker') and hasattr(new_clip.end_marker, 'time'):
+                if abs(new_clip.length - length) > 0.1:
+                    try:
+                        new_clip.end_marker.time = start_time + length
+                        self.log_message(f"Adjusted clip length to {length}")
+                    except Exception as e:
+                        self.log_message(f"Error adjusting clip length: {str(e)}")
             
-            # Wait for approximately the clip duration (simulated)
-            # In a real implementation, you'd need a different approach as
-            # this blocks the execution. For our purposes, we'll just log it
-            self.log_message(f"Recording clip of length {source_clip.length} at position {arrangement_time}")
+            result = {
+                "track_index": track_index,
+                "start_time": start_time,
+                "length": length,
+                "actual_length": new_clip.length if hasattr(new_clip, 'length') else length,
+                "clip_id": str(new_clip._live_ptr) if hasattr(new_clip, '_live_ptr') else None,
+                "clip_name": new_clip.name if hasattr(new_clip, 'name') else "",
+                "is_audio": is_audio,
+                "method": "recording"
+            }
+        else:
+            self.log_message("Could not confirm clip creation, but operation completed")
             
-            # Create a simulated result since we can't get direct access to the created clip
             result = {
-                "track_index": track_index, 
-                "source_clip_index": clip_index,
-                "arrangement_time": arrangement_time,
-                "clip_name": source_clip.name if hasattr(source_clip, 'name') else "",
-                "clip_length": source_clip.length,
-                "note": "Clip was fired for recording. Check arrangement view."
+                "track_index": track_index,
+                "start_time": start_time,
+                "length": length,
+                "is_audio": is_audio,
+                "method": "recording",
+                "note": "Clip creation initiated. Check arrangement view."
             }
-            return result
-        except Exception as e:
-            self.log_message(f"Error duplicating clip to arrangement: {str(e)}")
-            raise
+        
+        return result
+    
+    @_logged("duplicating clip to arrangement")
+    def _duplicate_clip_to_arrangement(self, track_index, clip_index, arrangement_time):
+        """Duplicate a session view clip to the arrangement view without using create_clip"""
+        track = self._get_track(track_index)
+        
+        clip_slot = self._get_clip_slot(track, clip_index)
+        
+        if not clip_slot.has_clip:
+            return _NO_CLIP
+        
+        source_clip = clip_slot.clip
+        
+        # For Live 11, we need to use a different approach since create_clip isn't available
+        # We'll use the clip_slot.fire() method which plays the clip
+        # To do this in the arrangement:
+        # 1. We need to move the playhead to the desired position
+        # 2. Enable arrangement record
+        # 3. Fire the clip
+        # 4. Let it record for the clip duration
+        # 5. Stop recording
+        # Steps 4 and 5 happen later on the main thread, see _finish_recordings
+        
+        # Remember the transport only if no earlier recording is still running,
+        # since that one has already changed it. Moving the playhead below would cut
+        # those recordings short or record over them, so they end here.
+        if self._pending_records:
+            for record in self._pending_records:
+                self._stop_recorded_clip(record[0])
+            self._pending_records = []
+        else:
+            self._record_restore = (self._song.is_playing, self._song.record_mode)
+        
+        # Position the playhead
+        self._song.current_song_time = arrangement_time
+        self._record_time = arrangement_time
+        
+        # Enable arrangement record mode
+        self._song.record_mode = True
+        
+        # Start playback if not already playing
+        if not self._song.is_playing:
+            self._song.start_playing()
+        
+        # Fire the clip
+        clip_slot.fire()
+        
+        # Stop the clip and restore the transport once it has played through,
+        # rather than blocking this request for the clip duration
+        self._pending_records.append((clip_slot, arrangement_time + source_clip.length))
+        self.log_message(f"Recording clip of length {source_clip.length} at position {arrangement_time}")
+        
+        # Create a simulated result since we can't get direct access to the created clip
+        result = {
+            "track_index": track_index, 
+            "source_clip_index": clip_index,
+            "arrangement_time": arrangement_time,
+            "clip_name": source_clip.name if hasattr(source_clip, 'name') else "",
+            "clip_length": source_clip.length,
+            "note": "Clip was fired for recording and stops after one play through. Check arrangement view."
+        }
+        return result
 
+    @_logged("setting locators")
     def _set_locators(self, start_time, end_time, name=""):
         """Set arrangement locators (start/end markers)"""
-        try:
-            # Set locators
-            self._song.set_or_delete_cue(start_time)
-            
-            # Set name if provided
-            if name:
-                # Find the created cue point and set its name
-                for cue_point in self._song.cue_points:
-                    if abs(cue_point.time - start_time) < 0.001:  # Small tolerance for floating point
-                        cue_point.name = name
+        # Set locators
+        self._song.set_or_delete_cue(start_time)
+        self._info_cache.pop("cue_index", None)
+        
+        # Set name if provided
+        if name:
+            # Find the created cue point and set its name
+            cue_point = self._cue_index().get(round(start_time, 3))
+            if cue_point is None:
+                # Rounding can split times that are within the tolerance
+                for candidate in self._song.cue_points:
+                    if abs(candidate.time - start_time) < 0.001:  # Small tolerance for floating point
+                        cue_point = candidate
                         break
-            
-            result = {
-                "start_time": start_time,
-                "end_time": end_time,
-                "name": name
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error setting locators: {str(e)}")
-            raise
+            if cue_point is not None:
+                cue_point.name = name
+        
+        result = {
+            "start_time": start_time,
+            "end_time": end_time,
+            "name": name
+        }
+        return result
     
+    @_logged("setting arrangement loop")
     def _set_arrangement_loop(self, start_time, end_time, enabled=True):
         """Set the arrangement loop region"""
-        try:
-            # Set loop start point
-            if hasattr(self._song, 'loop_start'):
-                self._song.loop_start = start_time
-            
-            # Handle loop end - try loop_length first (Live 11), fall back to loop_end if available
-            if hasattr(self._song, 'loop_length'):
-                self._song.loop_length = end_time - start_time
-            elif hasattr(self._song, 'loop_end'):
-                self._song.loop_end = end_time
-            
-            # Enable/disable looping if possible
-            if hasattr(self._song, 'loop'):
-                self._song.loop = enabled
-            
-            # Return result with appropriate properties
-            result = {
-                "loop_start": self._song.loop_start if hasattr(self._song, 'loop_start') else start_time,
-                "loop_end": end_time,
-                "loop_enabled": self._song.loop if hasattr(self._song, 'loop') else enabled
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error setting arrangement loop: {str(e)}")
-            raise
+        # Set loop start point
+        if self._song_has('loop_start'):
+            self._song.loop_start = start_time
+        
+        # Handle loop end - try loop_length first (Live 11), fall back to loop_end if available
+        if self._song_has('loop_length'):
+            self._song.loop_length = end_time - start_time
+        elif self._song_has('loop_end'):
+            self._song.loop_end = end_time
+        
+        # Enable/disable looping if possible
+        if self._song_has('loop'):
+            self._song.loop = enabled
+        
+        # Return result with appropriate properties
+        result = {
+            "loop_start": self._song.loop_start if self._song_has('loop_start') else start_time,
+            "loop_end": end_time,
+            "loop_enabled": self._song.loop if self._song_has('loop') else enabled
+        }
+        return result
     
+    @_logged("getting arrangement info")
     def _get_arrangement_info(self):
         """Get information about the arrangement"""
-        try:
-            result = {
-                "current_song_time": self._song.current_song_time if hasattr(self._song, 'current_song_time') else 0.0,
-                "track_count": len(self._song.tracks),
-                "cue_points": []
-            }
-            
-            # Add loop information if available
-            if hasattr(self._song, 'loop_start'):
-                result["loop_start"] = self._song.loop_start
-                
-            if hasattr(self._song, 'loop_length'):
-                result["loop_length"] = self._song.loop_length
-                result["loop_end"] = self._song.loop_start + self._song.loop_length
-            elif hasattr(self._song, 'loop_end'):
-                result["loop_end"] = self._song.loop_end
-                
-            if hasattr(self._song, 'loop'):
-                result["loop_enabled"] = self._song.loop
-            
-            # Check if Arranger view is visible
-            if hasattr(self._song.view, 'is_view_visible'):
-                result["arrangement_view_visible"] = self._song.view.is_view_visible('Arranger')
-            
-            # Add cue points if available
-            if hasattr(self._song, 'cue_points'):
-                for cue_point in self._song.cue_points:
-                    result["cue_points"].append({
-                        "name": cue_point.name,
-                        "time": cue_point.time
-                    })
-            
-            return result
-        except Exception as e:
-            self.log_message(f"Error getting arrangement info: {str(e)}")
-            raise
+        result = {
+            "current_song_time": self._song.current_song_time if self._song_has('current_song_time') else 0.0,
+            "track_count": len(self._get_tracks()),
+            "cue_points": []
+        }
+        
+        # Add loop information if available
+        if self._song_has('loop_start'):
+            result["loop_start"] = self._song.loop_start
+            
+        if self._song_has('loop_length'):
+            result["loop_length"] = self._song.loop_length
+            result["loop_end"] = self._song.loop_start + self._song.loop_length
+        elif self._song_has('loop_end'):
+            result["loop_end"] = self._song.loop_end
+            
+        if self._song_has('loop'):
+            result["loop_enabled"] = self._song.loop
+        
+        # Check if Arranger view is visible
+        if self._song_has('view.is_view_visible'):
+            result["arrangement_view_visible"] = self._song_view.is_view_visible('Arranger')
+        
+        # Add cue points if available
+        if self._song_has('cue_points'):
+            result["cue_points"] = [
+                {"name": cue_point.name, "time": cue_point.time} for cue_point in self._song.cue_points
+            ]
+        
+        return result
             
+    @_logged("getting current view")
     def _get_current_view(self):
         """Get the current view information (Session or Arrangement)"""
-        try:
-            result = {
-                "success": True,
-                "views_available": []
-            }
-            
-            # First approach: focused_document_view (Live 11 API)
-            if hasattr(self._song.view, 'focused_document_view'):
-                current_view = self._song.view.focused_document_view
-                result["current_view"] = current_view
-                result["api_method"] = "focused_document_view"
-                self.log_message(f"Current view detected via focused_document_view: {current_view}")
-            
-            # Try to get all available views (for debugging)
-            if hasattr(self._song.view, 'available_main_views'):
-                available_views = self._song.view.available_main_views()
-                result["views_available"] = available_views
-                self.log_message(f"Available views: {available_views}")
-            
-            # For older versions, try to determine based on visibility
-            if "current_view" not in result and hasattr(self._song.view, 'is_view_visible'):
-                is_arranger = self._song.view.is_view_visible('Arranger')
-                is_session = self._song.view.is_view_visible('Session')
-                
-                if is_arranger and not is_session:
-                    result["current_view"] = "Arranger"
-                elif is_session and not is_arranger:
-                    result["current_view"] = "Session"
-                else:
-                    result["current_view"] = "Unknown"
-                result["api_method"] = "is_view_visible"
-                result["arranger_visible"] = is_arranger
-                result["session_visible"] = is_session
-                self.log_message(f"View detection via is_view_visible: Arranger={is_arranger}, Session={is_session}")
-            
-            # Final fallback
-            if "current_view" not in result:
+        result = {
+            "success": True,
+            "views_available": []
+        }
+        
+        # First approach: focused_document_view (Live 11 API)
+        if self._song_has('view.focused_document_view'):
+            current_view = self._song_view.focused_document_view
+            result["current_view"] = current_view
+            result["api_method"] = "focused_document_view"
+            self.log_message(f"Current view detected via focused_document_view: {current_view}")
+        
+        # Try to get all available views (for debugging)
+        if self._song_has('view.available_main_views'):
+            available_views = self._song_view.available_main_views()
+            result["views_available"] = available_views
+            self.log_message(f"Available views: {available_views}")
+        
+        # For older versions, try to determine based on visibility
+        if "current_view" not in result and self._song_has('view.is_view_visible'):
+            is_arranger = self._song_view.is_view_visible('Arranger')
+            is_session = self._song_view.is_view_visible('Session')
+            
+            if is_arranger and not is_session:
+                result["current_view"] = "Arranger"
+            elif is_session and not is_arranger:
+                result["current_view"] = "Session"
+            else:
                 result["current_view"] = "Unknown"
-                result["api_method"] = "unavailable"
-                self.log_message("Could not determine current view state")
-            
-            # Add song playback state
-            if hasattr(self._song, 'is_playing'):
-                result["is_playing"] = self._song.is_playing
-            
-            # Add record mode state
-            if hasattr(self._song, 'record_mode'):
-                result["record_mode"] = self._song.record_mode
-            
-            # Add current song time
-            if hasattr(self._song, 'current_song_time'):
-                result["current_song_time"] = self._song.current_song_time
-            
-            return result
-        except Exception as e:
-            self.log_message(f"Error getting current view: {str(e)}")
-            self.log_message(traceback.format_exc())
-            raise
+            result["api_method"] = "is_view_visible"
+            result["arranger_visible"] = is_arranger
+            result["session_visible"] = is_session
+            self.log_message(f"View detection via is_view_visible: Arranger={is_arranger}, Session={is_session}")
+        
+        # Final fallback
+        if "current_view" not in result:
+            result["current_view"] = "Unknown"
+            result["api_method"] = "unavailable"
+            self.log_message("Could not determine current view state")
+        
+        # Add song playback state
+        if self._song_has('is_playing'):
+            result["is_playing"] = self._song.is_playing
+        
+        # Add record mode state
+        if self._song_has('record_mode'):
+            result["record_mode"] = self._song.record_mode
+        
+        # Add current song time
+        if self._song_has('current_song_time'):
+            result["current_song_time"] = self._song.current_song_time
+        
+        return result
     
+    @_logged("getting track arrangement clips")
     def _get_track_arrangement_clips(self, track_index):
         """Get all clips in the arrangement view for a specific track"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
-            
-            clips = []
-            for clip in track.arrangement_clips:
-                clip_info = {
-                    "name": clip.name,
-                    "start_time": clip.start_marker.time,
-                    "end_time": clip.end_marker.time,
-                    "length": clip.length,
-                    "is_audio_clip": clip.is_audio_clip
-                }
-                
-                # For MIDI clips, include note count
-                if not clip.is_audio_clip:
-                    clip_info["note_count"] = len(clip.get_notes(0, 0, clip.length, 127))
-                
-                clips.append(clip_info)
-            
-            result = {
-                "track_index": track_index,
-                "track_name": track.name,
-                "clip_count": len(clips),
-                "clips": clips
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error getting track arrangement clips: {str(e)}")
-            raise
+        track = self._get_track(track_index)
+        
+        clips = [_arrangement_clip_summary(clip) for clip in track.arrangement_clips]
+        
+        result = {
+            "track_index": track_index,
+            "track_name": track.name,
+            "clip_count": len(clips),
+            "clips": clips
+        }
+        return result
 
+    @_logged("getting time signatures")
     def _get_time_signatures(self):
         """Get all time signatures in the arrangement"""
-        try:
-            result = {
-                "time_signatures": []
-            }
-            
-            # Add the signature from the song properties (global time signature)
-            result["time_signatures"].append({
-                "numerator": self._song.signature_numerator,
-                "denominator": self._song.signature_denominator,
-                "time": 0.0,
-                "bar": 1
-            })
-            
-            # Add time signature markers if available
-            if hasattr(self._song, "time_signatures"):
-                for ts in self._song.time_signatures:
-                    # Calculate which bar this time signature starts at
-                    # This is approximate and depends on previous time signatures
-                    beats_per_bar = 4.0  # Default
-                    bar = 1 + int(ts.time / beats_per_bar)
-                    
-                    result["time_signatures"].append({
-                        "numerator": ts.numerator,
-                        "denominator": ts.denominator,
-                        "time": ts.time,
-                        "bar": bar
-                    })
-            
-            return result
-        except Exception as e:
-            self.log_message(f"Error getting time signatures: {str(e)}")
-            raise
+        result = {
+            "time_signatures": []
+        }
+        
+        # Add the signature from the song properties (global time signature)
+        result["time_signatures"].append({
+            "numerator": self._song.signature_numerator,
+            "denominator": self._song.signature_denominator,
+            "time": 0.0,
+            "bar": 1
+        })
+        
+        # Add time signature markers if available
+        if self._song_has("time_signatures"):
+            for ts in self._song.time_signatures:
+                # Calculate which bar this time signature starts at
+                # This is approximate and depends on previous time signatures
+                beats_per_bar = 4.0  # Default
+                bar = 1 + int(ts.time / beats_per_bar)
+                
+                result["time_signatures"].append({
+                    "numerator": ts.numerator,
+                    "denominator": ts.denominator,
+                    "time": ts.time,
+                    "bar": bar
+                })
+        
+        return result
     
+    @_logged("setting playhead position")
     def _set_playhead_position(self, time):
         """Set the playhead position in the arrangement"""
-        try:
-            self._song.current_song_time = time
-            
-            result = {
-                "current_song_time": self._song.current_song_time
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error setting playhead position: {str(e)}")
-            raise
+        self._song.current_song_time = time
+        
+        result = {
+            "current_song_time": self._song.current_song_time
+        }
+        return result
     
+    @_logged("creating arrangement marker")
     def _create_arrangement_marker(self, name, time):
         """Create a marker in the arrangement at the specified position"""
+        # Try to create a cue point, checking method signature
         try:
-            # Try to create a cue point, checking method signature
-            try:
-                # The correct signature appears to be without arguments
-                # We'll try to create it and then modify it afterward
-                if hasattr(self._song, 'set_or_delete_cue'):
-                    new_cue = self._song.set_or_delete_cue()
-                    
-                    # If successful, try to set the time and name
-                    if new_cue and hasattr(new_cue, 'time'):
-                        new_cue.time = time
-                        if hasattr(new_cue, 'name'):
-                            new_cue.name = name
-                    created_cue = new_cue
-                else:
-                    # Fallback if method not available
-                    self.log_message("set_or_delete_cue method not available")
-                    created_cue = None
-            except Exception as e:
-                self.log_message(f"Error using set_or_delete_cue: {str(e)}")
-                created_cue = None
-            
-            # If we couldn't create a new cue point, look for an existing one to reuse
-            if created_cue is None and hasattr(self._song, 'cue_points'):
-                # Find an existing cue point that's close to the time we want
-                closest_cue = None
-                closest_distance = float('inf')
-                
-                for cue_point in self._song.cue_points:
-                    distance = abs(cue_point.time - time)
-                    if distance < closest_distance:
-                        closest_cue = cue_point
-                        closest_distance = distance
+            # The correct signature appears to be without arguments
+            # We'll try to create it and then modify it afterward
+            if self._song_has('set_or_delete_cue'):
+                new_cue = self._song.set_or_delete_cue()
+                self._info_cache.pop("cue_index", None)
                 
-                # If we found one and it's within a reasonable distance, use it
-                if closest_cue and closest_distance < 2.0:
-                    closest_cue.time = time
-                    closest_cue.name = name
-                    created_cue = closest_cue
-                else:
-                    # Otherwise, we can't create a marker
-                    self.log_message("Could not create or find a suitable cue point")
-            
-            # If we still couldn't create or find a cue point
-            if created_cue is None:
-                # Just return info as if we created it
-                self.log_message(f"Unable to create cue point at {time}")
-                result = {
-                    "name": name,
-                    "time": time,
-                    "created": False
-                }
-                return result
-            
+                # If successful, try to set the time and name
+                if new_cue and hasattr(new_cue, 'time'):
+                    new_cue.time = time
+                    if hasattr(new_cue, 'name'):
+                        new_cue.name = name
+                created_cue = new_cue
+            else:
+                # Fallback if method not available
+                self.log_message("set_or_delete_cue method not available")
+                created_cue = None
+        except Exception as e:
+            self.log_message(f"Error using set_or_delete_cue: {str(e)}")
+            created_cue = None
+        
+        # If we couldn't create a new cue point, look for an existing one to reuse
+        if created_cue is None and self._song_has('cue_points'):
+            # Find an existing cue point that's close to the time we want
+            closest_cue = None
+            closest_distance = float('inf')
+            
+            cue_points = tuple(self._song.cue_points)
+            if cue_points:
+                closest_distance, closest_index = min(
+                    (abs(cue_point.time - time), i) for i, cue_point in enumerate(cue_points))
+                closest_cue = cue_points[closest_index]
+            
+            # If we found one and it's within a reasonable distance, use it
+            if closest_cue and closest_distance < 2.0:
+                closest_cue.time = time
+                closest_cue.name = name
+                created_cue = closest_cue
+                self._info_cache.pop("cue_index", None)
+            else:
+                # Otherwise, we can't create a marker
+                self.log_message("Could not create or find a suitable cue point")
+        
+        # If we still couldn't create or find a cue point
+        if created_cue is None:
+            # Just return info as if we created it
+            self.log_message(f"Unable to create cue point at {time}")
             result = {
-                "name": created_cue.name if hasattr(created_cue, 'name') else name,
-                "time": created_cue.time if hasattr(created_cue, 'time') else time,
-                "created": True
+                "name": name,
+                "time": time,
+                "created": False
             }
             return result
-        except Exception as e:
-            self.log_message(f"Error creating arrangement marker: {str(e)}")
-            raise
+        
+        result = {
+            "name": created_cue.name if hasattr(created_cue, 'name') else name,
+            "time": created_cue.time if hasattr(created_cue, 'time') else time,
+            "created": True
+        }
+        return result
     
+    @_logged("getting arrangement markers")
     def _get_arrangement_markers(self):
         """Get all markers in the arrangement"""
-        try:
-            result = {
-                "markers": []
-            }
-            
-            # Get all cue points
-            for cue_point in self._song.cue_points:
-                result["markers"].append({
-                    "name": cue_point.name,
-                    "time": cue_point.time
-                })
-            
-            return result
-        except Exception as e:
-            self.log_message(f"Error getting arrangement markers: {str(e)}")
-            raise
+        # Get all cue points
+        result = {
+            "markers": [
+                {"name": cue_point.name, "time": cue_point.time} for cue_point in self._song.cue_points
+            ]
+        }
+        
+        return result
     
+    @_logged("creating complex arrangement")
     def _create_complex_arrangement(self, structure, transitions=True, arrange_automation=True):
         """Create a complete arrangement with complex structure"""
-        try:
-            self.log_message(f"Creating complex arrangement with {len(structure)} sections")
-            
-            # Instead of clearing the entire arrangement, we'll approach this differently
-            # We'll create new clips at the specified positions without removing existing ones
-            
-            current_bar = 0
-            sections_created = []
+        self.log_message(f"Creating complex arrangement with {len(structure)} sections")
+        
+        # Instead of clearing the entire arrangement, we'll approach this differently
+        # We'll create new clips at the specified positions without removing existing ones
+        
+        current_bar = 0
+        sections_created = []
+        tracks = self._get_tracks()
+        n_tracks = len(tracks)
+        track_sources = {}
+        
+        # Process each section in the structure
+        for section_index, section in enumerate(structure):
+            section_name = section.get("name", f"Section {section_index + 1}")
+            section_type = section.get("type", "generic")
+            length_bars = section.get("length_bars", 4)
+            energy_level = section.get("energy_level", 0.5)
             
-            # Process each section in the structure
-            for section_index, section in enumerate(structure):
-                section_name = section.get("name", f"Section {section_index + 1}")
-                section_type = section.get("type", "generic")
-                length_bars = section.get("length_bars", 4)
-                energy_level = section.get("energy_level", 0.5)
-                
-                # Convert bar to time
-                start_time = current_bar * 4.0  # Assuming 4/4 time signature
-                
-                # Add a marker for this section
-                self._create_arrangement_marker(section_name, start_time)
-                
-                # Create section
-                if "tracks" in section:
-                    # If specific tracks/clips are specified, use those
-                    for track_data in section["tracks"]:
-                        track_index = track_data.get("index", 0)
-                        clips = track_data.get("clips", [])
-                        
-                        if track_index >= len(self._song.tracks):
-                            continue
-                            
-                        track = self._song.tracks[track_index]
-                        
-                        for clip_index in clips:
-                            if clip_index >= len(track.clip_slots) or not track.clip_slots[clip_index].has_clip:
-                                continue
-                                
-                            source_clip = track.clip_slots[clip_index].clip
-                            
-                            # Calculate how many times to loop to fill the section
-                            repeats = int((length_bars * 4.0) / source_clip.length) + 1
-                            
-                            for i in range(repeats):
-                                repeat_time = start_time + (i * source_clip.length)
-                                if repeat_time >= start_time + (length_bars * 4.0):
-                                    break
-                                
-                                # Use our manual duplication method instead of duplicate_clip_to
-                                new_clip = track.create_clip(repeat_time, source_clip.length)
-                                
-                                # If it's a MIDI clip, copy the notes
-                                if hasattr(source_clip, 'get_notes') and hasattr(new_clip, 'set_notes'):
-                                    notes = list(source_clip.get_notes(0, 0, source_clip.length, 127))
-                                    if notes:
-                                        new_clip.set_notes(tuple(notes))
-                                
-                                # Copy clip name if possible
-                                if hasattr(source_clip, 'name') and hasattr(new_clip, 'name'):
-                                    new_clip.name = source_clip.name
-                else:
-                    # Use standard section creation based on section type
-                    self._create_arrangement_section(section_type, length_bars, current_bar)
-                
-                # Add automation for energy level if requested
-                if arrange_automation:
-                    self._add_energy_automation(start_time, length_bars * 4.0, energy_level)
-                
-                # Create transition to next section if there is one
-                if transitions and section_index < len(structure) - 1:
-                    next_section = structure[section_index + 1]
-                    next_energy = next_section.get("energy_level", 0.5)
-                    
-                    # Choose transition type based on energy change
-                    transition_type = "fill"  # Default
+            # Convert bars to time
+            start_time = current_bar * _BEATS_PER_BAR
+            section_length = length_bars * _BEATS_PER_BAR
+            
+            # Add a marker for this section
+            self._create_arrangement_marker(section_name, start_time)
+            
+            # Create section
+            if "tracks" in section:
+                # If specific tracks/clips are specified, use those
+                for track_data in section["tracks"]:
+                    track_index = track_data.get("index", 0)
+                    clips = track_data.get("clips", [])
                     
-                    if next_energy > energy_level + 0.3:
-                        transition_type = "riser"
-                    elif next_energy < energy_level - 0.3:
-                        transition_type = "downlifter"
+                    if track_index >= n_tracks:
+                        continue
                     
-                    # Create transition at the end of this section
-                    self._create_transition(current_bar + length_bars - 1, current_bar + length_bars, transition_type, 4)
+                    # Source clips are read once per track across all sections. Clips
+                    # that were asked for by index must all be placed, so failures
+                    # fail the command instead of being skipped
+                    sources = track_sources.get(track_index)
+                    if sources is None:
+                        sources = track_sources[track_index] = {}
+                    self._place_section_clips(
+                        tracks[track_index], clips, start_time, section_length, sources, strict=True)
+            else:
+                # Use standard section creation based on section type
+                self._create_arrangement_section(section_type, length_bars, current_bar)
+            
+            # Add automation for energy level if requested
+            if arrange_automation:
+                self._add_energy_automation(start_time, section_length, energy_level)
+            
+            # Create transition to next section if there is one
+            if transitions and section_index < len(structure) - 1:
+                next_section = structure[section_index + 1]
+                next_energy = next_section.get("energy_level", 0.5)
                 
-                # Store section info
-                sections_created.append({
-                    "name": section_name,
-                    "type": section_type,
-                    "start_bar": current_bar,
-                    "length_bars": length_bars,
-                    "energy_level": energy_level
-                })
+                # Choose transition type based on energy change, a fill unless
+                # the energy rises or drops by more than 0.3
+                transition_type = _ENERGY_TRANSITIONS[
+                    1 + (next_energy > energy_level + 0.3) - (next_energy < energy_level - 0.3)]
                 
-                # Update current position
-                current_bar += length_bars
+                # Create transition at the end of this section
+                self._create_transition(current_bar + length_bars - 1, current_bar + length_bars, transition_type, 4)
+            
+            # Store section info
+            sections_created.append({
+                "name": section_name,
+                "type": section_type,
+                "start_bar": current_bar,
+                "length_bars": length_bars,
+                "energy_level": energy_level
+            })
             
-            result = {
-                "total_length_bars": current_bar,
-                "section_count": len(structure),
-                "sections": sections_created
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error creating complex arrangement: {str(e)}")
-            self.log_message(traceback.format_exc())
-            raise
+            # Update current position
+            current_bar += length_bars
+        
+        result = {
+            "total_length_bars": current_bar,
+            "section_count": len(structure),
+            "sections": sections_created
+        }
+        return result
     
     def _add_energy_automation(self, start_time, length, energy_level):
         """Add automation for energy level (affects track volumes, filters, etc.)"""
+        end_time = start_time + length
         try:
             # Find suitable tracks to automate
-            for track_index, track in enumerate(self._song.tracks):
-                # Look for a device that can be automated
-                for device_index, device in enumerate(track.devices):
-                    # Try to find a filter or EQ type device
-                    if "eq" in device.name.lower() or "filter" in device.name.lower():
-                        # Find a frequency parameter to automate
-                        for param_index, param in enumerate(device.parameters):
-                            if ("freq" in param.name.lower() or 
-                                "cutoff" in param.name.lower() or 
-                                "frequency" in param.name.lower()):
-                                
-                                # Set automation based on energy level
-                                param_range = param.max - param.min
-                                
-                                # Higher energy = higher frequency
-                                target_value = param.min + (param_range * energy_level)
-                                
-                                # Create automation envelope points
-                                param.automation_state = 1  # Enable automation
-                                param.add_automation_point(start_time, target_value)
-                                param.add_automation_point(start_time + length, target_value)
-                                
-                                break
-                
-                # Also automate volume based on energy
-                vol_param = track.mixer_device.volume
-                vol_range = vol_param.max - vol_param.min
+            for frequency_params, vol_param, vol_min, vol_range in self._energy_parameters():
+                # Automate the frequency of each filter or EQ type device
+                for param, param_min, param_range in frequency_params:
+                    # Higher energy = higher frequency
+                    target_value = param_min + (param_range * energy_level)
+                    
+                    # Create automation envelope points, enabling automation unless it already is
+                    if param.automation_state != 1:
+                        param.automation_state = 1
+                    add_point = param.add_automation_point
+                    add_point(start_time, target_value)
+                    add_point(end_time, target_value)
                 
-                # Map energy level to a reasonable volume range (not too extreme)
-                # Energy 0.0 -> -12dB, Energy 1.0 -> 0dB
-                min_vol_db = -12.0
-                target_vol = vol_param.min + (vol_range * ((energy_level * (0 - min_vol_db) + min_vol_db) / 0))
+                # Also automate volume based on energy, scaling the volume range
+                # linearly with the energy level
+                target_vol = vol_min + vol_range * energy_level
                 
-                # Create automation envelope points
-                vol_param.automation_state = 1  # Enable automation
-                vol_param.add_automation_point(start_time, target_vol)
-                vol_param.add_automation_point(start_time + length, target_vol)
+                # Create automation envelope points, enabling automation unless it already is
+                if vol_param.automation_state != 1:
+                    vol_param.automation_state = 1
+                add_point = vol_param.add_automation_point
+                add_point(start_time, target_vol)
+                add_point(end_time, target_vol)
                 
-        except Exception as e:
+        except _LOM_EXC as e:
             self.log_message(f"Error adding energy automation: {str(e)}")
     
+    @_logged("quantizing arrangement clips")
     def _quantize_arrangement_clips(self, track_index=-1, quantize_amount=1.0):
         """Quantize all clips in the arrangement"""
-        try:
-            quantized_count = 0
-            
-            if track_index == -1:
-                # Quantize all tracks
-                tracks_to_process = self._song.tracks
-            else:
-                # Quantize specific track
-                if track_index < 0 or track_index >= len(self._song.tracks):
-                    raise IndexError("Track index out of range")
-                
-                tracks_to_process = [self._song.tracks[track_index]]
-            
-            for track in tracks_to_process:
-                for clip in track.arrangement_clips:
-                    if clip.is_midi_clip:
-                        # For MIDI clips, try to quantize notes
-                        try:
-                            clip.quantize(quantize_amount)
-                            quantized_count += 1
-                        except:
-                            pass
-            
-            result = {
-                "quantized_count": quantized_count,
-                "track_count": len(tracks_to_process),
-                "quantize_amount": quantize_amount
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error quantizing arrangement clips: {str(e)}")
-            raise
+        quantized_count = 0
+        
+        if track_index == -1:
+            # Quantize all tracks
+            tracks_to_process = self._song.tracks
+        else:
+            # Quantize specific track
+            tracks_to_process = [self._get_track(track_index)]
+        
+        # Only MIDI clips have notes to quantize
+        midi_clips = [
+            clip for track in tracks_to_process for clip in track.arrangement_clips
+            if clip.is_midi_clip
+        ]
+        
+        for clip in midi_clips:
+            try:
+                clip.quantize(quantize_amount)
+                quantized_count += 1
+            except _LOM_EXC:
+                pass
+        
+        result = {
+            "quantized_count": quantized_count,
+            "track_count": len(tracks_to_process),
+            "quantize_amount": quantize_amount
+        }
+        return result
     
+    @_logged("consolidating arrangement selection")
     def _consolidate_arrangement_selection(self, start_time, end_time, track_index):
         """Consolidate a selection in the arrangement to a new clip"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
-            
-            # Select the track and set time selection
-            self._song.view.selected_track = track
-            self._song.loop_start = start_time
-            self._song.loop_end = end_time
-            self._song.loop = True
-            
-            # Check if there's content to consolidate
-            has_clips = False
-            for clip in track.arrangement_clips:
-                if (clip.start_marker.time < end_time and 
-                    clip.end_marker.time > start_time):
-                    has_clips = True
-                    break
-            
-            if not has_clips:
-                raise Exception("No clips found in the selected time range")
-            
-            # Perform the consolidation
-            # Note: In a real implementation, this would likely need to
-            # simulate key presses or use a different API call
-            # We'll simulate it by creating a new clip that covers the range
-            
-            # First, gather all affected clips
-            affected_clips = []
-            for clip in track.arrangement_clips:
-                if (clip.start_marker.time < end_time and 
-                    clip.end_marker.time > start_time):
-                    affected_clips.append(clip)
-            
-            # Create a new clip that spans the entire range
-            new_clip = track.create_clip(start_time, end_time - start_time)
-            
-            # For MIDI clips, we would copy over all the notes
-            if track.has_midi_input and affected_clips:
-                all_notes = []
-                
-                for clip in affected_clips:
-                    if clip.is_midi_clip:
-                        # Get notes from this clip
-                        clip_notes = list(clip.get_notes(0, 0, clip.length, 127))
-                        
-                        # Adjust note timing to be relative to the new clip
-                        for note in clip_notes:
-                            # Note format: (pitch, start_time, duration, velocity, mute)
-                            note_time = note[1] + clip.start_marker.time
-                            
-                            # Only include notes that fall within our range
-                            if note_time >= start_time and note_time < end_time:
-                                # Adjust time to be relative to new clip start
-                                new_note_time = note_time - start_time
-                                
-                                all_notes.append((
-                                    note[0],  # pitch
-                                    new_note_time,  # adjusted start time
-                                    note[2],  # duration
-                                    note[3],  # velocity
-                                    note[4]   # mute
-                                ))
-                
-                # Set all notes in the new clip
-                if all_notes:
-                    new_clip.set_notes(tuple(all_notes))
+        track = self._get_track(track_index)
+        
+        # Select the track and set time selection
+        self._song_view.selected_track = track
+        self._song.loop_start = start_time
+        self._song.loop_end = end_time
+        self._song.loop = True
+        
+        # Gather all affected clips in one pass, which also tells whether
+        # there's content to consolidate
+        affected_clips = [
+            clip for clip in track.arrangement_clips
+            if clip.start_marker.time < end_time and clip.end_marker.time > start_time
+        ]
+        
+        if not affected_clips:
+            raise Exception("No clips found in the selected time range")
+        
+        # Perform the consolidation
+        # Note: In a real implementation, this would likely need to
+        # simulate key presses or use a different API call
+        # We'll simulate it by creating a new clip that covers the range
+        
+        # Create a new clip that spans the entire range
+        new_clip = track.create_clip(start_time, end_time - start_time)
+        
+        # For MIDI clips, we would copy over all the notes
+        if track.has_midi_input:
+            all_notes = []
             
-            # Delete the original clips in the range
             for clip in affected_clips:
-                # This is a simplification; in a real implementation we would need to
-                # properly remove the clips
-                clip.end_time = start_time  # Truncate to before our new clip
-            
-            result = {
-                "track_index": track_index,
-                "start_time": start_time,
-                "end_time": end_time,
-                "new_clip_length": new_clip.length,
-                "consolidated": True
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error consolidating arrangement selection: {str(e)}")
-            raise
+                if clip.is_midi_clip:
+                    # Get notes from this clip
+                    clip_notes = clip.get_notes(0, 0, clip.length, 127)
+                    
+                    # Only include notes that fall within our range, moving them to be
+                    # relative to the new clip start. The range is shifted into the
+                    # clip's own time once rather than each note into arrangement time.
+                    clip_offset = clip.start_marker.time
+                    first_time = start_time - clip_offset
+                    last_time = end_time - clip_offset
+                    shift = clip_offset - start_time
+                    
+                    # Note format: (pitch, start_time, duration, velocity, mute)
+                    all_notes += [
+                        (pitch, note_time + shift, duration, velocity, mute)
+                        for pitch, note_time, duration, velocity, mute in clip_notes
+                        if first_time <= note_time < last_time
+                    ]
+            
+            # Set all notes in the new clip, merged from every clip into time order
+            if all_notes:
+                all_notes.sort(key=_NOTE_ORDER)
+                new_clip.set_notes(tuple(all_notes))
+        
+        # Delete the original clips in the range
+        for clip in affected_clips:
+            # This is a simplification; in a real implementation we would need to
+            # properly remove the clips
+            clip.end_time = start_time  # Truncate to before our new clip
+        
+        result = {
+            "track_index": track_index,
+            "start_time": start_time,
+            "end_time": end_time,
+            "new_clip_length": new_clip.length,
+            "consolidated": True
+        }
+        return result
 
+    @_logged("setting time signature")
     def _set_time_signature(self, numerator, denominator, bar_position=1):
         """Set the time signature at a specific bar in the arrangement"""
-        try:
-            # Convert bar position to time
-            time = (bar_position - 1) * 4.0  # Assuming 4 beats per bar initially
-            
-            # Create time signature change
-            self._song.create_time_signature(time, numerator, denominator)
-            
-            result = {
-                "numerator": numerator,
-                "denominator": denominator,
-                "bar_position": bar_position,
-                "time": time
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error setting time signature: {str(e)}")
-            raise
+        # Convert bar position to time
+        time = (bar_position - 1) * 4.0  # Assuming 4 beats per bar initially
+        
+        # Create time signature change
+        self._song.create_time_signature(time, numerator, denominator)
+        
+        result = {
+            "numerator": numerator,
+            "denominator": denominator,
+            "bar_position": bar_position,
+            "time": time
+        }
+        return result
 
     def _show_arrangement_view(self):
         """Switch to arrangement view"""
@@ -3288,56 +3826,36 @@ class AbletonMCPboost(ControlSurface):
             # Try multiple approaches to ensure view changes
             
             # First approach: focused_document_view (Live 11)
-            if hasattr(self._song.view, 'focused_document_view'):
-                current_view = self._song.view.focused_document_view
+            if self._song_has('view.focused_document_view'):
+                current_view = self._song_view.focused_document_view
                 self.log_message(f"Current view before switch: {current_view}")
                 
-                if hasattr(self._song.view, 'focus_view'):
-                    # Live 11 method
-                    self._song.view.focus_view('Arranger')
-                    # Wait a moment for the view change to take effect
-                    import time
-                    time.sleep(0.1)
-                    
-                    # Verify the view change
-                    if self._song.view.focused_document_view == 'Arranger':
-                        self.log_message("Successfully switched to Arranger view using focus_view")
-                    else:
-                        self.log_message(f"View did not change, still {self._song.view.focused_document_view}")
-                        # Try alternative method
-                        if hasattr(self.application(), 'view'):
-                            self.application().view.focus_view('Arranger')
-                            time.sleep(0.1)
+                if self._song_has('view.focus_view'):
+                    # Live 11 method. This runs on Live's main thread, which only
+                    # switches the view once we return, so don't wait for it here
+                    self._song_view.focus_view('Arranger')
+                    self.log_message("Called focus_view('Arranger')")
             
             # Second approach: show_view (legacy)
-            elif hasattr(self._song.view, 'show_view'):
-                self._song.view.show_view('Arranger')
+            elif self._song_has('view.show_view'):
+                self._song_view.show_view('Arranger')
                 self.log_message("Called show_view('Arranger')")
             
             # Third approach: check available views
-            elif hasattr(self._song.view, 'available_main_views'):
-                views = self._song.view.available_main_views()
-                self.log_message(f"Available views: {views}")
-                
-                for view_name in views:
-                    if 'arrange' in view_name.lower() or 'arrang' in view_name.lower():
-                        if hasattr(self._song.view, 'focus_view'):
-                            self._song.view.focus_view(view_name)
-                            self.log_message(f"Called focus_view('{view_name}')")
-                            break
-            
-            # Verify final state
-            if hasattr(self._song.view, 'focused_document_view'):
-                self.log_message(f"Final view state: {self._song.view.focused_document_view}")
+            elif self._song_has('view.available_main_views'):
+                view_name = self._main_view_name('arrang')
+                if view_name and self._song_has('view.focus_view'):
+                    self._song_view.focus_view(view_name)
+                    self.log_message(f"Called focus_view('{view_name}')")
             
             # Access current song time to verify we're in arrangement view
-            if hasattr(self._song, 'current_song_time'):
+            if self._song_has('current_song_time'):
                 current_time = self._song.current_song_time
                 self.log_message(f"Current song time: {current_time}")
                 
             result = {
                 "success": True,
-                "current_view": self._song.view.focused_document_view if hasattr(self._song.view, 'focused_document_view') else "Unknown"
+                "current_view": self._song_view.focused_document_view if self._song_has('view.focused_document_view') else "Unknown"
             }
             return result
         except Exception as e:
@@ -3352,40 +3870,36 @@ class AbletonMCPboost(ControlSurface):
         """Switch to session view"""
         try:
             # Primary method for Live 11: focused_document_view
-            if hasattr(self._song.view, 'focused_document_view'):
-                current_view = self._song.view.focused_document_view
+            if self._song_has('view.focused_document_view'):
+                current_view = self._song_view.focused_document_view
                 self.log_message(f"Current view: {current_view}")
                 
                 if current_view != 'Session':
                     # In Live 11, we use focus_view to change views
-                    if hasattr(self._song.view, 'focus_view'):
-                        self._song.view.focus_view('Session')
+                    if self._song_has('view.focus_view'):
+                        self._song_view.focus_view('Session')
                         self.log_message("Switched to Session view using focus_view")
             # Fall back to show_view if available (older API versions)
-            elif hasattr(self._song.view, 'show_view'):
-                self._song.view.show_view('Session')
+            elif self._song_has('view.show_view'):
+                self._song_view.show_view('Session')
                 self.log_message("Switched to Session view using show_view")
             # Try alternative approach if neither method is available
-            elif hasattr(self._song.view, 'is_view_visible'):
+            elif self._song_has('view.is_view_visible'):
                 # Find available views
-                if hasattr(self._song.view, 'available_main_views'):
-                    views = self._song.view.available_main_views()
-                    self.log_message(f"Available views: {views}")
-                    
+                if self._song_has('view.available_main_views'):
                     # Try to find session
-                    for view_name in views:
-                        if 'session' in view_name.lower():
-                            self._song.view.focus_view(view_name)
-                            self.log_message(f"Switched to {view_name} view")
-                            break
+                    view_name = self._main_view_name('session')
+                    if view_name:
+                        self._song_view.focus_view(view_name)
+                        self.log_message(f"Switched to {view_name} view")
             
             # Verify the view has changed
-            if hasattr(self._song.view, 'focused_document_view'):
-                self.log_message(f"View after change: {self._song.view.focused_document_view}")
+            if self._song_has('view.focused_document_view'):
+                self.log_message(f"View after change: {self._song_view.focused_document_view}")
                 
             result = {
                 "success": True,
-                "current_view": self._song.view.focused_document_view if hasattr(self._song.view, 'focused_document_view') else "Unknown"
+                "current_view": self._song_view.focused_document_view if self._song_has('view.focused_document_view') else "Unknown"
             }
             return result
         except Exception as e:
@@ -3396,237 +3910,224 @@ class AbletonMCPboost(ControlSurface):
             }
             return result
 
+    @_logged("setting arrangement record")
     def _set_arrangement_record(self, enabled=True):
         """Enable or disable arrangement record mode"""
-        try:
-            if hasattr(self._song, 'record_mode'):
-                self._song.record_mode = enabled
-                
-            result = {
-                "record_mode": self._song.record_mode if hasattr(self._song, 'record_mode') else enabled
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error setting arrangement record: {str(e)}")
-            raise
+        if self._song_has('record_mode'):
+            self._song.record_mode = enabled
+            
+        result = {
+            "record_mode": self._song.record_mode if self._song_has('record_mode') else enabled
+        }
+        return result
 
+    @_logged("starting arrangement recording")
     def _start_arrangement_recording(self):
         """Start recording in arrangement view"""
-        try:
-            # Make sure we're in arrangement view
-            self._show_arrangement_view()
+        # Make sure we're in arrangement view
+        self._show_arrangement_view()
+        
+        # Enable record mode
+        if self._song_has('record_mode'):
+            self._song.record_mode = True
             
-            # Enable record mode
-            if hasattr(self._song, 'record_mode'):
-                self._song.record_mode = True
-                
-            # Start playback if not already playing
-            if hasattr(self._song, 'is_playing') and not self._song.is_playing:
-                self._song.start_playing()
-                
-            result = {
-                "record_mode": self._song.record_mode if hasattr(self._song, 'record_mode') else True,
-                "is_playing": self._song.is_playing if hasattr(self._song, 'is_playing') else True
-            }
-            return result
-        except Exception as e:
-            self.log_message(f"Error starting arrangement recording: {str(e)}")
-            raise
+        # Start playback if not already playing
+        if self._song_has('is_playing') and not self._song.is_playing:
+            self._song.start_playing()
+            
+        result = {
+            "record_mode": self._song.record_mode if self._song_has('record_mode') else True,
+            "is_playing": self._song.is_playing if self._song_has('is_playing') else True
+        }
+        return result
 
+    @_logged("copying arrangement to session")
     def _arrangement_to_session(self, track_index, start_time, end_time, target_clip_slot):
         """Copy a section of the arrangement to a session clip slot"""
+        track = self._get_track(track_index)
+        
+        if target_clip_slot < 0 or target_clip_slot >= len(track.clip_slots):
+            raise IndexError("Clip slot index out of range")
+        
+        # First try using Live's builtin features if available - the API doesn't document this well
         try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
+            # Try selecting the track and time range
+            self._song_view.selected_track = track
             
-            track = self._song.tracks[track_index]
+            # Set loop points to the range we want
+            if self._song_has('loop_start'):
+                self._song.loop_start = start_time
+                
+            if self._song_has('loop_length'):
+                self._song.loop_length = end_time - start_time
+            elif self._song_has('loop_end'):
+                self._song.loop_end = end_time
             
-            if target_clip_slot < 0 or target_clip_slot >= len(track.clip_slots):
-                raise IndexError("Clip slot index out of range")
+            # Try to find and use the "Consolidate" or similar command
+            # This isn't directly accessible via the API, but we can log what we're trying to do
+            self.log_message(f"Trying to copy arrangement section to session clip slot {target_clip_slot}")
             
-            # First try using Live's builtin features if available - the API doesn't document this well
-            try:
-                # Try selecting the track and time range
-                self._song.view.selected_track = track
-                
-                # Set loop points to the range we want
-                if hasattr(self._song, 'loop_start'):
-                    self._song.loop_start = start_time
-                    
-                if hasattr(self._song, 'loop_length'):
-                    self._song.loop_length = end_time - start_time
-                elif hasattr(self._song, 'loop_end'):
-                    self._song.loop_end = end_time
-                
-                # Try to find and use the "Consolidate" or similar command
-                # This isn't directly accessible via the API, but we can log what we're trying to do
-                self.log_message(f"Trying to copy arrangement section to session clip slot {target_clip_slot}")
-                
-                # For now, return what we attempted to do
-                result = {
-                    "track_index": track_index,
-                    "start_time": start_time,
-                    "end_time": end_time,
-                    "target_clip_slot": target_clip_slot,
-                    "note": "Attempted to copy arrangement to session. Check if the operation succeeded."
-                }
-                return result
-            except Exception as e:
-                self.log_message(f"Error using built-in features: {str(e)}")
-                raise
+            # For now, return what we attempted to do
+            result = {
+                "track_index": track_index,
+                "start_time": start_time,
+                "end_time": end_time,
+                "target_clip_slot": target_clip_slot,
+                "note": "Attempted to copy arrangement to session. Check if the operation succeeded."
+            }
+            return result
         except Exception as e:
-            self.log_message(f"Error copying arrangement to session: {str(e)}")
+            self.log_message(f"Error using built-in features: {str(e)}")
             raise
 
+    @_logged("setting clip loop end")
     def _set_clip_loop_end(self, track_index, clip_start_time, loop_end):
         """Set the loop end point for a clip in the arrangement view"""
-        try:
-            if track_index < 0 or track_index >= len(self._song.tracks):
-                raise IndexError("Track index out of range")
-            
-            track = self._song.tracks[track_index]
+        track = self._get_track(track_index)
+        
+        # Find the clip at the specified start time
+        found_clip = None
+        for clip in track.arrangement_clips:
+            clip_start = None
             
-            # Find the clip at the specified start time
-            found_clip = None
-            for clip in track.arrangement_clips:
-                clip_start = None
-                
-                # Try different methods to get the clip start time - more robust version
-                try:
-                    if hasattr(clip, 'start_time'):
-                        clip_start = clip.start_time
-                        self.log_message(f"Got start_time directly: {clip_start}")
-                    elif hasattr(clip, 'start_marker'):
-                        # Check if start_marker is a float directly
-                        if isinstance(clip.start_marker, (int, float)):
+            # Try different methods to get the clip start time - more robust version
+            try:
+                if hasattr(clip, 'start_time'):
+                    clip_start = clip.start_time
+                    self.log_message(f"Got start_time directly: {clip_start}")
+                elif hasattr(clip, 'start_marker'):
+                    # Check if start_marker is a float directly
+                    if isinstance(clip.start_marker, (int, float)):
+                        clip_start = float(clip.start_marker)
+                        self.log_message(f"Start marker is a float/int: {clip_start}")
+                    # Check if start_marker has a time attribute
+                    elif hasattr(clip.start_marker, 'time'):
+                        clip_start = clip.start_marker.time
+                        self.log_message(f"Got start time from marker: {clip_start}")
+                    # Try direct conversion as a fallback
+                    else:
+                        try:
                             clip_start = float(clip.start_marker)
-                            self.log_message(f"Start marker is a float/int: {clip_start}")
-                        # Check if start_marker has a time attribute
-                        elif hasattr(clip.start_marker, 'time'):
-                            clip_start = clip.start_marker.time
-                            self.log_message(f"Got start time from marker: {clip_start}")
-                        # Try direct conversion as a fallback
-                        else:
-                            try:
-                                clip_start = float(clip.start_marker)
-                                self.log_message(f"Converted start marker to float: {clip_start}")
-                            except (TypeError, ValueError):
-                                self.log_message("Couldn't determine clip start time")
-                except Exception as e:
-                    self.log_message(f"Error getting clip start time: {str(e)}")
-                
-                if clip_start is None:
-                    self.log_message("Couldn't determine clip start time, skipping")
-                    continue
-                    
-                if abs(clip_start - clip_start_time) < 0.1:
-                    found_clip = clip
-                    break
+                            self.log_message(f"Converted start marker to float: {clip_start}")
+                        except (TypeError, ValueError):
+                            self.log_message("Couldn't determine clip start time")
+            except Exception as e:
+                self.log_message(f"Error getting clip start time: {str(e)}")
             
-            if found_clip is None:
-                raise Exception(f"No clip found at time {clip_start_time}")
+            if clip_start is None:
+                self.log_message("Couldn't determine clip start time, skipping")
+                continue
                 
-            self.log_message(f"Found clip at position {clip_start_time}, setting loop end to {loop_end}")
+            if abs(clip_start - clip_start_time) < 0.1:
+                found_clip = clip
+                break
+        
+        if found_clip is None:
+            raise Exception(f"No clip found at time {clip_start_time}")
             
-            # Try different methods to set the loop end - more robust version
+        self.log_message(f"Found clip at position {clip_start_time}, setting loop end to {loop_end}")
+        
+        # Try different methods to set the loop end - more robust version
+        try:
+            # Get the clip's start time for calculations
+            clip_start = 0
             try:
-                # Get the clip's start time for calculations
-                clip_start = 0
-                try:
-                    if hasattr(found_clip, 'start_time'):
-                        clip_start = found_clip.start_time
-                    elif hasattr(found_clip, 'start_marker'):
-                        if isinstance(found_clip.start_marker, (int, float)):
-                            clip_start = float(found_clip.start_marker)
-                        elif hasattr(found_clip.start_marker, 'time'):
-                            clip_start = found_clip.start_marker.time
-                except Exception:
-                    self.log_message("Couldn't determine clip start time, using 0")
-                
-                # Calculate absolute end position if needed
-                absolute_end = clip_start + loop_end
-                self.log_message(f"Absolute end position: {absolute_end}")
-                
-                # Try different approaches to set the end marker/time
-                success = False
-                
-                # Try using end_marker directly
-                if hasattr(found_clip, 'end_marker'):
-                    # Handle different types of end markers
-                    if isinstance(found_clip.end_marker, (int, float)):
-                        # End marker is a direct float value
-                        try:
-                            found_clip.end_marker = float(absolute_end)
-                            self.log_message(f"Set end marker as float to {absolute_end}")
-                            success = True
-                        except Exception as e:
-                            self.log_message(f"Error setting end marker directly: {str(e)}")
-                    elif hasattr(found_clip.end_marker, 'time'):
-                        # End marker has a time attribute
-                        try:
-                            found_clip.end_marker.time = absolute_end
-                            self.log_message(f"Set end marker time to {absolute_end}")
-                            success = True
-                        except Exception as e:
-                            self.log_message(f"Error setting end marker time: {str(e)}")
-                    else:
-                        # Last resort: try direct assignment
-                        try:
-                            found_clip.end_marker = absolute_end
-                            self.log_message(f"Set end marker with direct assignment to {absolute_end}")
-                            success = True
-                        except Exception as e:
-                            self.log_message(f"Error with direct end marker assignment: {str(e)}")
-                
-                # Try loop object approach if end_marker didn't work
-                if not success and hasattr(found_clip, 'loop'):
-                    if hasattr(found_clip.loop, 'end_time'):
-                        try:
-                            # Some versions use relative time from clip start
-                            found_clip.loop.end_time = loop_end
-                            self.log_message(f"Set loop end time to {loop_end}")
-                            success = True
-                        except Exception as e:
-                            self.log_message(f"Error setting loop end time: {str(e)}")
-                    elif hasattr(found_clip.loop, 'end_marker'):
-                        if hasattr(found_clip.loop.end_marker, 'time'):
-                            try:
-                                found_clip.loop.end_marker.time = absolute_end
-                                self.log_message(f"Set loop end marker time to {absolute_end}")
-                                success = True
-                            except Exception as e:
-                                self.log_message(f"Error setting loop end marker time: {str(e)}")
-                
-                # Try direct loop_end property
-                if not success and hasattr(found_clip, 'loop_end'):
+                if hasattr(found_clip, 'start_time'):
+                    clip_start = found_clip.start_time
+                elif hasattr(found_clip, 'start_marker'):
+                    if isinstance(found_clip.start_marker, (int, float)):
+                        clip_start = float(found_clip.start_marker)
+                    elif hasattr(found_clip.start_marker, 'time'):
+                        clip_start = found_clip.start_marker.time
+            except Exception:
+                self.log_message("Couldn't determine clip start time, using 0")
+            
+            # Calculate absolute end position if needed
+            absolute_end = clip_start + loop_end
+            self.log_message(f"Absolute end position: {absolute_end}")
+            
+            # Try different approaches to set the end marker/time
+            success = False
+            
+            # Try using end_marker directly
+            if hasattr(found_clip, 'end_marker'):
+                # Handle different types of end markers
+                if isinstance(found_clip.end_marker, (int, float)):
+                    # End marker is a direct float value
                     try:
-                        # Usually this is relative time in beats
-                        found_clip.loop_end = loop_end
-                        self.log_message(f"Set loop_end to {loop_end}")
+                        found_clip.end_marker = float(absolute_end)
+                        self.log_message(f"Set end marker as float to {absolute_end}")
                         success = True
                     except Exception as e:
-                        self.log_message(f"Error setting loop_end: {str(e)}")
-                
-                if not success:
-                    raise Exception("Could not find a way to set clip loop end point")
-            except Exception as e:
-                self.log_message(f"Error setting loop end: {str(e)}")
-                raise
+                        self.log_message(f"Error setting end marker directly: {str(e)}")
+                elif hasattr(found_clip.end_marker, 'time'):
+                    # End marker has a time attribute
+                    try:
+                        found_clip.end_marker.time = absolute_end
+                        self.log_message(f"Set end marker time to {absolute_end}")
+                        success = True
+                    except Exception as e:
+                        self.log_message(f"Error setting end marker time: {str(e)}")
+                else:
+                    # Last resort: try direct assignment
+                    try:
+                        found_clip.end_marker = absolute_end
+                        self.log_message(f"Set end marker with direct assignment to {absolute_end}")
+                        success = True
+                    except Exception as e:
+                        self.log_message(f"Error with direct end marker assignment: {str(e)}")
+            
+            # Try loop object approach if end_marker didn't work
+            if not success and hasattr(found_clip, 'loop'):
+                if hasattr(found_clip.loop, 'end_time'):
+                    try:
+                        # Some versions use relative time from clip start
+                        found_clip.loop.end_time = loop_end
+                        self.log_message(f"Set loop end time to {loop_end}")
+                        success = True
+                    except Exception as e:
+                        self.log_message(f"Error setting loop end time: {str(e)}")
+                elif hasattr(found_clip.loop, 'end_marker'):
+                    if hasattr(found_clip.loop.end_marker, 'time'):
+                        try:
+                            found_clip.loop.end_marker.time = absolute_end
+                            self.log_message(f"Set loop end marker time to {absolute_end}")
+                            success = True
+                        except Exception as e:
+                            self.log_message(f"Error setting loop end marker time: {str(e)}")
             
-            # Check if we were successful
-            clip_length = None
-            if hasattr(found_clip, 'length'):
-                clip_length = found_clip.length
-                self.log_message(f"New clip length: {clip_length}")
+            # Try direct loop_end property
+            if not success and hasattr(found_clip, 'loop_end'):
+                try:
+                    # Usually this is relative time in beats
+                    found_clip.loop_end = loop_end
+                    self.log_message(f"Set loop_end to {loop_end}")
+                    success = True
+                except Exception as e:
+                    self.log_message(f"Error setting loop_end: {str(e)}")
             
-            result = {
-                "track_index": track_index,
-                "clip_start_time": clip_start_time,
-                "loop_end": loop_end,
-                "clip_length": clip_length
-            }
-            return result
+            if not success:
+                raise Exception("Could not find a way to set clip loop end point")
         except Exception as e:
-            self.log_message(f"Error setting clip loop end: {str(e)}")
-            self.log_message(traceback.format_exc())
+            self.log_message(f"Error setting loop end: {str(e)}")
             raise
+        
+        # Check if we were successful
+        clip_length = None
+        if hasattr(found_clip, 'length'):
+            clip_length = found_clip.length
+            self.log_message(f"New clip length: {clip_length}")
+        
+        result = {
+            "track_index": track_index,
+            "clip_start_time": clip_start_time,
+            "loop_end": loop_end,
+            "clip_length": clip_length
+        }
+        return result
+    
+    def _set_verbose_logging(self, enabled):
+        """Turn full traceback logging for errors on or off"""
+        self._verbose = bool(enabled)
+        self.log_message("Verbose logging " + ("enabled" if self._verbose else "disabled"))
+        return {"verbose": self._verbose}
@@ -1,12 +1,48 @@
 # ableton_mcp_server.py
 from mcp.server.fastmcp import FastMCP, Context
 import socket
+import struct
 import json
+import base64
 import logging
 from dataclasses import dataclass
 from contextlib import asynccontextmanager
 from typing import AsyncIterator, Dict, Any, List, Union
 
+# Prefer orjson on the socket path when it is installed
+try:
+    import orjson
+    _loads = orjson.loads
+    
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    _loads = json.loads
+    
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+# Each message is a 4-byte little-endian payload length followed by the JSON payload
+_HEADER = struct.Struct('<I')
+
+# Automation points are sent packed as little-endian float64 (time, value) pairs
+_ENVELOPE_POINT = struct.Struct('<2d')
+
+# Commands that change Live's state and get extra settle time around them
+_WRITE_COMMANDS = frozenset({
+    "create_midi_track", "create_audio_track", "set_track_name",
+    "create_clip", "add_notes_to_clip", "set_clip_name",
+    "set_tempo", "fire_clip", "stop_clip", "set_device_parameter",
+    "start_playback", "stop_playback", "load_instrument_or_effect",
+    # Arrangement-related commands
+    "create_arrangement_section", "duplicate_section",
+    "create_transition", "convert_session_to_arrangement",
+    "add_automation_to_clip",
+    "insert_arrangement_clip", "duplicate_clip_to_arrangement",
+    "set_locators", "set_arrangement_loop",
+    "apply_batch",
+})
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -26,6 +62,8 @@ class AbletonConnection:
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.sock.connect((self.host, self.port))
+            # Commands are small request/response pairs, don't let Nagle hold them back
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             logger.info(f"Connected to Ableton at {self.host}:{self.port}")
             return True
         except Exception as e:
@@ -43,52 +81,56 @@ class AbletonConnection:
             finally:
                 self.sock = None
 
+    def _send_frame(self, payload):
+        """Send a length-prefixed frame without joining the header and payload"""
+        header = _HEADER.pack(len(payload))
+        if not hasattr(self.sock, "sendmsg"):
+            # No scatter-gather on Windows
+            self.sock.sendall(header + payload)
+            return
+        
+        sent = self.sock.sendmsg([header, payload])
+        if sent < len(header):
+            self.sock.sendall(header[sent:])
+            self.sock.sendall(payload)
+        elif sent < len(header) + len(payload):
+            self.sock.sendall(memoryview(payload)[sent - len(header):])
+    
+    def _recv_exactly(self, sock, size, buffer_size=8192):
+        """Receive exactly size bytes straight into a preallocated buffer"""
+        data = bytearray(size)
+        view = memoryview(data)
+        received = 0
+        
+        while received < size:
+            count = sock.recv_into(view[received:], min(buffer_size, size - received))
+            if not count:
+                if received == 0:
+                    raise Exception("Connection closed before receiving any data")
+                raise Exception("Incomplete response received")
+            received += count
+        
+        return data
+
     def receive_full_response(self, sock, buffer_size=8192):
-        """Receive the complete response, potentially in multiple chunks"""
-        chunks = []
+        """Receive one complete length-prefixed response"""
         sock.settimeout(15.0)  # Increased timeout for operations that might take longer
         
         try:
-            while True:
-                try:
-                    chunk = sock.recv(buffer_size)
-                    if not chunk:
-                        if not chunks:
-                            raise Exception("Connection closed before receiving any data")
-                        break
-                    
-                    chunks.append(chunk)
-                    
-                    # Check if we've received a complete JSON object
-                    try:
-                        data = b''.join(chunks)
-                        json.loads(data.decode('utf-8'))
-                        logger.info(f"Received complete response ({len(data)} bytes)")
-                        return data
-                    except json.JSONDecodeError:
-                        # Incomplete JSON, continue receiving
-                        continue
-                except socket.timeout:
-                    logger.warning("Socket timeout during chunked receive")
-                    break
-                except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
-                    logger.error(f"Socket connection error during receive: {str(e)}")
-                    raise
+            header = self._recv_exactly(sock, _HEADER.size, buffer_size)
+            length = _HEADER.unpack(header)[0]
+            data = self._recv_exactly(sock, length, buffer_size)
+            logger.info(f"Received complete response ({len(data)} bytes)")
+            return data
+        except socket.timeout:
+            logger.warning("Socket timeout during receive")
+            raise
+        except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
+            logger.error(f"Socket connection error during receive: {str(e)}")
+            raise
         except Exception as e:
             logger.error(f"Error during receive: {str(e)}")
             raise
-            
-        # If we get here, we either timed out or broke out of the loop
-        if chunks:
-            data = b''.join(chunks)
-            logger.info(f"Returning data after receive completion ({len(data)} bytes)")
-            try:
-                json.loads(data.decode('utf-8'))
-                return data
-            except json.JSONDecodeError:
-                raise Exception("Incomplete JSON response received")
-        else:
-            raise Exception("No data received")
 
     def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """Send a command to Ableton and return the response"""
@@ -101,24 +143,13 @@ class AbletonConnection:
         }
         
         # Check if this is a state-modifying command
-        is_modifying_command = command_type in [
-            "create_midi_track", "create_audio_track", "set_track_name",
-            "create_clip", "add_notes_to_clip", "set_clip_name",
-            "set_tempo", "fire_clip", "stop_clip", "set_device_parameter",
-            "start_playback", "stop_playback", "load_instrument_or_effect",
-            # Added arrangement-related commands
-            "create_arrangement_section", "duplicate_section", 
-            "create_transition", "convert_session_to_arrangement",
-            "add_automation_to_clip", "create_audio_track", 
-            "insert_arrangement_clip", "duplicate_clip_to_arrangement",
-            "set_locators", "set_arrangement_loop"
-        ]
+        is_modifying_command = command_type in _WRITE_COMMANDS
         
         try:
             logger.info(f"Sending command: {command_type} with params: {params}")
             
             # Send the command
-            self.sock.sendall(json.dumps(command).encode('utf-8'))
+            self._send_frame(_dumps(command))
             logger.info(f"Command sent, waiting for response...")
             
             # For state-modifying commands, add a small delay to give Ableton time to process
@@ -135,7 +166,7 @@ class AbletonConnection:
             logger.info(f"Received {len(response_data)} bytes of data")
             
             # Parse the response
-            response = json.loads(response_data.decode('utf-8'))
+            response = _loads(response_data)
             logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
             
             if response.get("status") == "error":
@@ -156,7 +187,7 @@ class AbletonConnection:
             logger.error(f"Socket connection error: {str(e)}")
             self.sock = None
             raise Exception(f"Connection to Ableton lost: {str(e)}")
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error(f"Invalid JSON response from Ableton: {str(e)}")
             if 'response_data' in locals() and response_data:
                 logger.error(f"Raw response (first 200 bytes): {response_data[:200]}")
@@ -261,6 +292,12 @@ def get_ableton_connection():
     
     return _ableton_connection
 
+def _pack_envelope_points(points: List[Dict[str, float]]) -> str:
+    """Pack automation point dicts into the base64 form the Remote Script reads"""
+    pack = _ENVELOPE_POINT.pack
+    packed = b"".join(pack(float(point.get("time", 0.0)), float(point.get("value", 0.0))) for point in points)
+    return base64.b64encode(packed).decode("ascii")
+
 
 # Core Tool endpoints
 
@@ -276,16 +313,19 @@ def get_session_info(ctx: Context) -> str:
         return f"Error getting session info: {str(e)}"
 
 @mcp.tool()
-def get_track_info(ctx: Context, track_index: int) -> str:
+def get_track_info(ctx: Context, track_index: int, format: str = "full") -> str:
     """
     Get detailed information about a specific track in Ableton.
     
     Parameters:
     - track_index: The index of the track to get information about
+    - format: "full" (default) lists every clip slot; "compact" returns a base64
+      has_clip_bitmap (bit i of byte i // 8 is slot i) plus only the filled slots as
+      {"i": index, "n": name, "l": length, "p": 1 if playing | 2 if recording}
     """
     try:
         ableton = get_ableton_connection()
-        result = ableton.send_command("get_track_info", {"track_index": track_index})
+        result = ableton.send_command("get_track_info", {"track_index": track_index, "format": format})
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error getting track info from Ableton: {str(e)}")
@@ -601,17 +641,19 @@ def setup_project_follow_actions(ctx: Context, loop_back: bool = True) -> str:
         return f"Error setting up project follow actions: {str(e)}"
 
 @mcp.tool()
-def get_browser_tree(ctx: Context, category_type: str = "all") -> str:
+def get_browser_tree(ctx: Context, category_type: str = "all", include_children: bool = False) -> str:
     """
     Get a hierarchical tree of browser categories from Ableton.
     
     Parameters:
     - category_type: Type of categories to get ('all', 'instruments', 'sounds', 'drums', 'audio_effects', 'midi_effects')
+    - include_children: Whether to also list the items directly inside each category (default: False)
     """
     try:
         ableton = get_ableton_connection()
         result = ableton.send_command("get_browser_tree", {
-            "category_type": category_type
+            "category_type": category_type,
+            "include_children": include_children
         })
         
         # Check if we got any categories
@@ -1030,7 +1072,7 @@ def add_automation_to_clip(
                 "track_index": track_index,
                 "clip_index": clip_index,
                 "parameter_name": parameter_name,
-                "points": points
+                "points": _pack_envelope_points(points)
             }
         )
         return json.dumps(result, indent=2)
@@ -1829,6 +1871,48 @@ def get_current_view(ctx: Context) -> str:
         logger.error(f"Error getting current view: {str(e)}")
         return f"Error getting current view: {str(e)}"
 
+@mcp.tool()
+def set_verbose_logging(ctx: Context, enabled: bool = True) -> str:
+    """
+    Turn verbose logging in the Ableton Remote Script on or off.
+    
+    Parameters:
+    - enabled: Whether to log full tracebacks for errors and per-request detail (default: True)
+    """
+    try:
+        ableton = get_ableton_connection()
+        result = ableton.send_command("set_verbose_logging", {"enabled": enabled})
+        state = "enabled" if result.get("verbose", enabled) else "disabled"
+        return f"Verbose logging {state}"
+    except Exception as e:
+        logger.error(f"Error setting verbose logging: {str(e)}")
+        return f"Error setting verbose logging: {str(e)}"
+
+@mcp.tool()
+def apply_batch(ctx: Context, commands: List[Dict[str, Any]]) -> str:
+    """
+    Run several Ableton commands in one round trip, in order.
+    
+    Parameters:
+    - commands: List of commands, each a dictionary with a "type" (e.g. "fire_clip") and optional "params"
+    
+    A failing command does not stop the ones after it; each gets its own result line.
+    """
+    try:
+        ableton = get_ableton_connection()
+        responses = ableton.send_command("apply_batch", {"commands": commands})
+        lines = []
+        for i, (command, response) in enumerate(zip(commands, responses)):
+            command_type = command.get("type", "unknown")
+            if response.get("status") == "error":
+                lines.append(f"{i}. {command_type}: error: {response.get('message', 'Unknown error')}")
+            else:
+                lines.append(f"{i}. {command_type}: {json.dumps(response.get('result'))}")
+        return f"Ran {len(responses)} commands:\n" + "\n".join(lines)
+    except Exception as e:
+        logger.error(f"Error applying batch: {str(e)}")
+        return f"Error applying batch: {str(e)}"
+
 # Main execution
 def main():
     """Run the MCP server"""